@@ -33,7 +33,8 @@ if __name__ == "__main__":
     main()
 메인에서 처리 
 '''
-from datetime import datetime
+from log_timestamp import timestamp_to_epoch
+from log_records import LogRecordStore
 def read_log(path: str = "mission_computer_main.log")->str:
     try :
         with open(path, 'r', encoding='utf-8') as f:
@@ -62,11 +63,13 @@ def main():
 
             try:
                 if len(parts) == 3:
-                    if datetime.strptime(parts[0].strip(), '%Y-%m-%d %H:%M:%S'):
-                        try:
-                            log_list.append((parts[0], parts[2]))
-                        except RuntimeError:
-                            raise RuntimeError
+                    # strptime 대신 저장할 때 쓰는 timestamp_to_epoch 로 확인 (변환할 수 없으면 예전처럼 ValueError)
+                    if timestamp_to_epoch(parts[0].strip()) is None:
+                        raise ValueError
+                    try:
+                        log_list.append((parts[0], parts[2]))
+                    except RuntimeError:
+                        raise RuntimeError
                 else:
                     raise ValueError
             except RuntimeError:
@@ -79,8 +82,10 @@ def main():
                 reverse=True
             )
             print(sorted_list)
-            dict_list = dict(sorted_list)
-            print(dict_list)
+            # dict(sorted_list) 는 같은 초의 로그를 하나만 남기므로 모든 로그를 보존하는 저장소 사용
+            log_store = LogRecordStore(
+                (timestamp_to_epoch(timestamp.strip()), timestamp, message) for timestamp, message in sorted_list)
+            print(log_store)
         except RuntimeError:
             raise RuntimeError
     except ValueError:
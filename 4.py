@@ -28,15 +28,13 @@ if __name__ == "__main__":
 메인에서 처리
 '''
 import math
+from material_registry import MARS_GRAVITY_RATIO, load_registry
 
-dem = {
-    "유리": 2.4,
-    "알루미늄": 2.7,
-    "탄소강": 7.85
-}
+MATERIAL_REGISTRY = load_registry()     # materials.csv (이름/별칭 → 밀도, 단위 변환 포함)
+dem = MATERIAL_REGISTRY.density_map()   # 대표 이름 → 밀도(g/cm³), 예전 dem 딕셔너리와 같은 모양
 
 def sphere_area(diameter: float, material: str, thickness: float=1) -> tuple[float, float]:
-    if material not in dem:
+    if material not in MATERIAL_REGISTRY:
         raise ValueError
     if diameter <= 0:
         raise ValueError
@@ -55,9 +53,9 @@ def sphere_area(diameter: float, material: str, thickness: float=1) -> tuple[flo
         area_m2 = math.pi * (diameter ** 2)
         area_cm2 = area_m2 * 10000
         volume_cm3 = area_cm2 * thickness
-        density = dem[material]
+        density = MATERIAL_REGISTRY.density(material)
         mass_kg = density * volume_cm3 / 1000
-        mass_weight_kg = mass_kg * 0.38
+        mass_weight_kg = mass_kg * MARS_GRAVITY_RATIO
         return area_m2, mass_weight_kg      
     except Exception:
         Exception
@@ -73,8 +71,8 @@ def main():
         except ValueError:
             raise ValueError
         
-        material_input = input("재질을 입력하세요 (유리, 알루미늄, 탄소강): ").strip()
-        if material_input not in dem:
+        material_input = input("재질을 입력하세요 (유리, 알루미늄, 탄소강, glass ... materials.csv 의 이름/별칭): ").strip()
+        if material_input not in MATERIAL_REGISTRY:
             raise ValueError
         
         try:
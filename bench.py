@@ -0,0 +1,393 @@
+import os
+import sys
+import json
+import time
+import glob
+import pstats
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+from log_timestamp import timestamp_to_epoch, epoch_to_timestamp
+from log_stream import parse_log_line
+'''
+로그 처리 벤치마크
+
+1. generate_log: 재현 가능한(seed 고정) 합성 mission_computer_main.log 생성
+    - 줄 수: 1e3 ~ 1e8 (한 줄씩 바로 파일에 쓰므로 메모리 사용량 일정)
+    - 비율 조절: 형식 오류 줄, 같은 timestamp 반복, 시간 순서가 뒤바뀐 줄, 위험 키워드 포함 메시지
+2. run_benchmarks: 대상 스크립트를 각각 새 프로세스로 실행해서
+    - 전체 실행 시간(wall), 최대 메모리(ru_maxrss), 초당 처리 줄 수
+    - 결과 확인: 결과 파일이 만들어졌고 레코드 수가 합성 로그의 올바른 줄 수와 같은지 검사
+      (main_v02 기본 모드는 MAX_MB 를 넘는 로그를 처리하지 않고 종료 코드 0 으로 끝나므로
+       종료 코드만으로는 성공을 알 수 없음 → valid=false 와 오류 내용을 기록)
+    - main_v01, main_v02 는 --profile-json 으로 한 번 더 실행해서 단계별 측정 결과도 수집
+      (tracemalloc 이 처리를 느리게 하므로 전체 실행 시간은 측정 없이 실행한 값을 기록)
+    - main.file_read, 3.py 는 단계 측정 기능이 없으므로 cProfile 로 한 번 더 실행해서
+      진입 함수가 직접 부른 함수별 누적 시간을 단계로 기록 (cProfile 때문에 느려지므로 상대 비교용)
+3. 결과는 bench_output.txt 에 JSON Lines 로 한 줄씩 추가 (git 커밋, 시간 포함 → 버전별 비교)
+
+사용 예
+    python bench.py --lines 1000 100000 --repeat 3
+    python bench.py --generate-only big.log --lines 10000000
+'''
+
+BENCH_OUTPUT_FILE = 'bench_output.txt'
+LOG_FILE = 'mission_computer_main.log'
+DEFAULT_SEED = 20230827
+START_TIMESTAMP = '2023-08-27 10:00:00'
+EVENTS = ['INFO', 'INFO', 'INFO', 'WARN', 'ERROR']    # INFO 가 가장 많도록
+NORMAL_MESSAGES = [
+    'Rocket initialization process started',
+    'Telemetry link established',
+    'Navigation system check passed',
+    'Cabin pressure nominal',
+    '연료 공급 정상',
+    '통신 상태 양호',
+]
+DANGER_MESSAGES = [
+    'Oxygen tank unstable',
+    '산소 누출 감지',
+    '엔진 고온 경고',
+    '폭발 위험 감지',
+]
+MALFORMED_LINES = [
+    '',                                     # 빈 줄
+    'garbage line without separator',       # 쉼표 없음
+    '2023-13-40 99:99:99,INFO,bad time',    # 날짜 형식 오류
+    'not a time,WARN,bad time',
+    '2023-08-27 10:00:00,INFO',             # 필드 부족
+]
+
+# 대상 스크립트: 이름 → (실행 인자, 표준 입력)
+# main_v02 는 검색어 입력을 기다리므로 표준 입력으로 검색어를 넘김
+TARGETS = {
+    'main_v01': ([sys.executable, 'main_v01.py'], ''),
+    'main_v02': ([sys.executable, 'main_v02.py'], 'Oxygen\n'),
+    'main_v02_stream': ([sys.executable, 'main_v02.py', '--stream'], 'Oxygen\n'),
+    'main_v02_workers': ([sys.executable, 'main_v02.py', '--workers', str(os.cpu_count() or 2)], 'Oxygen\n'),
+    'main.file_read': ([sys.executable, '-c', 'import main; r = main.file_read("mission_computer_main.log"); '
+                                              'print(len(r["timestamp"]) if isinstance(r, dict) else r)'], ''),
+    '3.py': ([sys.executable, '3.py'], ''),
+}
+PROFILED_TARGETS = {'main_v01', 'main_v02', 'main_v02_stream', 'main_v02_workers'}   # --profile-json 지원
+
+# --profile-json 이 없는 대상: (진입 함수가 있는 파일, 진입 함수, {직접 부른 함수: 단계}, 나머지 단계)
+# 진입 함수 자신의 시간(반복문 등)과 표에 없는 함수의 시간은 나머지 단계에 합산
+CPROFILE_STAGES = {
+    'main.file_read': ('main.py', 'file_read',
+                       {'load_log_frame': 'read+parse', 'sort_values': 'sort', 'reset_index': 'sort',
+                        'to_dict': 'to_dict'}, 'other'),
+    '3.py': ('3.py', 'main', {'read_log': 'read', 'sorted': 'sort', '__init__': 'store', 'print': 'print'}, 'parse'),
+}
+_CPROFILE_RUNNER = '''
+import sys, cProfile
+out, args = sys.argv[1], sys.argv[2:]
+if args[0] == '-c':
+    name, source = '<string>', args[1]
+else:
+    name = args[0]
+    with open(name, encoding='utf-8') as f:
+        source = f.read()
+sys.argv = [name]
+cProfile.runctx(compile(source, name, 'exec'), {'__name__': '__main__', '__file__': name}, None, out)
+'''
+
+# 대상별 결과 확인: (있어야 할 결과 파일, 레코드 수를 셀 곳, 기대 레코드 수)
+#   레코드 수를 셀 곳: JSONL 파일(줄 수), 'stdout'(마지막 줄의 숫자), None(세지 않고 오류 출력만 확인)
+#   기대 레코드 수: 'valid' timestamp 가 올바른 줄 수, 'fields' 필드가 3개인 줄 수
+#   (pandas 로 읽는 main.file_read 는 timestamp 가 잘못된 줄도 NaT 로 남김)
+_V02_OUTPUTS = (['mission_computer_main.json', 'mission_computer_main.stats.json', 'log_analysis.md'],
+                'mission_computer_main.jsonl', 'valid')
+OUTPUT_CHECKS = {
+    'main_v01': (['mission_computer_main.json'], 'mission_computer_main.jsonl', 'valid'),
+    'main_v02': _V02_OUTPUTS,
+    'main_v02_stream': _V02_OUTPUTS,
+    'main_v02_workers': _V02_OUTPUTS,
+    'main.file_read': ([], 'stdout', 'fields'),
+    '3.py': ([], None, None),
+}
+FAILURE_LINES = {'File Error', 'File Error.', 'Decoding Error.', 'Invalid log format.', 'Processing error.',
+                 'processing error.', 'Error'}   # 3.py / test_exam1 이 실패할 때 출력하는 마지막 줄
+STDOUT_TAIL = 4096      # 결과 확인에 쓰는 표준 출력 끝부분 크기
+
+
+def generate_log(path, lines, seed=DEFAULT_SEED, malformed_rate=0.01, duplicate_rate=0.05,
+                 out_of_order_rate=0.02, danger_rate=0.05):
+    '''
+    합성 로그 파일을 만듭니다. 같은 seed 와 비율이면 항상 같은 파일이 만들어짐
+
+    Args:
+        path (str): 저장할 파일 경로
+        lines (int): 레코드 줄 수 (헤더 제외, 형식 오류 줄 포함)
+        seed (int): 난수 seed
+        malformed_rate (float): 형식 오류 줄 비율 (빈 줄, 쉼표 없음, 날짜 오류, 필드 부족)
+        duplicate_rate (float): 바로 앞 줄과 같은 timestamp 를 쓰는 비율
+        out_of_order_rate (float): 최대 1시간 앞의 timestamp 를 쓰는 비율 (시간 순서가 뒤바뀜)
+        danger_rate (float): 위험 키워드가 들어간 메시지 비율
+
+    Returns:
+        int: 파일 크기 (바이트)
+    '''
+    rng = random.Random(seed)
+    epoch = timestamp_to_epoch(START_TIMESTAMP)
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write('timestamp,event,message\n')
+        buffer = []
+        for _ in range(lines):
+            r = rng.random()
+            if r < malformed_rate:
+                buffer.append(rng.choice(MALFORMED_LINES))
+            else:
+                if rng.random() >= duplicate_rate:
+                    epoch += rng.randint(1, 3)
+                line_epoch = epoch
+                if rng.random() < out_of_order_rate:
+                    line_epoch -= rng.randint(1, 3600)
+                if rng.random() < danger_rate:
+                    message = rng.choice(DANGER_MESSAGES)
+                else:
+                    message = rng.choice(NORMAL_MESSAGES)
+                buffer.append(f'{epoch_to_timestamp(line_epoch)},{rng.choice(EVENTS)},{message}')
+            if len(buffer) >= 10000:
+                f.write('\n'.join(buffer))
+                f.write('\n')
+                buffer.clear()
+        if buffer:
+            f.write('\n'.join(buffer))
+            f.write('\n')
+    return os.path.getsize(path)
+
+
+def count_expected_records(path):
+    '''
+    로그에서 결과에 들어가야 할 레코드 수를 셉니다. (헤더 제외)
+
+    Returns:
+        dict: {'valid': timestamp 가 올바른 줄 수, 'fields': 필드가 3개인 줄 수}
+    '''
+    counts = {'valid': 0, 'fields': 0}
+    with open(path, 'r', encoding='utf-8') as f:
+        next(f, None)
+        for line in f:
+            if line.strip().count(',') == 2:
+                counts['fields'] += 1
+            if parse_log_line(line) is not None:
+                counts['valid'] += 1
+    return counts
+
+
+def _count_lines(path):
+    count = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            count += block.count(b'\n')
+    return count
+
+
+def _clear_outputs(work_dir):
+    # 앞 대상이 남긴 결과를 이번 대상의 결과로 잘못 세지 않도록 로그 파일만 남기고 지움
+    for path in glob.glob(os.path.join(work_dir, '*')) + glob.glob(os.path.join(work_dir, '.*')):
+        if os.path.basename(path) == LOG_FILE:
+            continue
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            os.remove(path)
+
+
+def _check_outputs(name, work_dir, stdout_tail, expected):
+    '''대상의 결과를 확인해서 (찾은 레코드 수, 오류 내용 또는 None) 을 돌려줍니다.'''
+    required, count_from, expected_kind = OUTPUT_CHECKS[name]
+    last_line = stdout_tail.rstrip('\n').rsplit('\n', 1)[-1].strip()
+    failures = [line.strip() for line in stdout_tail.splitlines() if '❌' in line]
+    if failures:
+        return None, failures[-1]
+    if last_line in FAILURE_LINES:
+        return None, last_line
+    missing = [path for path in required if not os.path.exists(os.path.join(work_dir, path))]
+    if missing:
+        return None, f"결과 파일 없음: {', '.join(missing)}"
+    if count_from is None:
+        return None, None
+    if count_from == 'stdout':
+        try:
+            records = int(last_line)
+        except ValueError:
+            return None, f"레코드 수 대신 출력: {last_line[:200]}"
+    elif os.path.exists(os.path.join(work_dir, count_from)):
+        records = _count_lines(os.path.join(work_dir, count_from))
+    else:
+        return None, f"결과 파일 없음: {count_from}"
+    if records != expected[expected_kind]:
+        return records, f"레코드 수 {records} != 기대값 {expected[expected_kind]}"
+    return records, None
+
+
+def _function_name(name):
+    # cProfile 의 내장 함수 이름 ('<built-in method builtins.sorted>', "<method 'split' of 'str' objects>") 을 짧게
+    if name.startswith('<built-in'):
+        return name.rstrip('>').rsplit('.', 1)[-1]
+    if name.startswith("<method '"):
+        return name.split("'")[1]
+    return name
+
+
+def _cprofile_stages(profile_path, name):
+    # 진입 함수가 직접 부른 함수의 누적 시간을 단계별로 합산 (--profile-json 결과와 같은 모양)
+    file_name, root_name, stage_of, rest = CPROFILE_STAGES[name]
+    stats = pstats.Stats(profile_path).stats
+    root = next((key for key in stats if os.path.basename(key[0]) == file_name and key[2] == root_name), None)
+    if root is None:
+        return None
+    totals = dict.fromkeys([*stage_of.values(), rest], 0.0)
+    totals[rest] += stats[root][2]      # 진입 함수 자신의 시간
+    for key, (_, _, _, _, callers) in stats.items():
+        if root in callers:
+            totals[stage_of.get(_function_name(key[2]), rest)] += callers[root][3]
+    return [{'name': stage, 'wall': round(wall, 4), 'cpu': None, 'records_in': None, 'records_out': None,
+             'peak_kb': None} for stage, wall in totals.items()]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _run_target(name, work_dir, repo_dir, profile=False):
+    # 대상 하나를 새 프로세스로 실행하고 (wall, 최대 메모리 KB, 종료 코드, 단계별 결과, 표준 출력 끝부분) 을 돌려줌
+    command, stdin_text = TARGETS[name]
+    command = list(command)
+    env = dict(os.environ, PYTHONPATH=repo_dir + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    if command[1].endswith('.py'):
+        command[1] = os.path.join(repo_dir, command[1])
+    profile_path = None
+    if profile and name in CPROFILE_STAGES:
+        profile_path = os.path.join(work_dir, 'profile.prof')
+        command = [command[0], '-c', _CPROFILE_RUNNER, profile_path] + command[1:]
+    elif profile:
+        profile_path = os.path.join(work_dir, 'profile.json')
+        command += ['--profile-json', profile_path]
+    _clear_outputs(work_dir)
+
+    stdout_path = os.path.join(work_dir, 'stdout.txt')
+    start = time.perf_counter()
+    with open(stdout_path, 'wb') as stdout:
+        proc = subprocess.Popen(command, cwd=work_dir, env=env, stdin=subprocess.PIPE,
+                                stdout=stdout, stderr=subprocess.STDOUT)
+    proc.stdin.write(stdin_text.encode('utf-8'))
+    proc.stdin.close()
+    max_rss_kb = None
+    if hasattr(os, 'wait4'):
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        max_rss_kb = usage.ru_maxrss     # Linux 는 KB 단위
+    else:
+        proc.wait()
+    wall = time.perf_counter() - start
+
+    with open(stdout_path, 'rb') as f:
+        f.seek(max(0, os.path.getsize(stdout_path) - STDOUT_TAIL))
+        stdout_tail = f.read().decode('utf-8', errors='replace')
+    os.remove(stdout_path)
+
+    stages = None
+    if profile_path and os.path.exists(profile_path):
+        if name in CPROFILE_STAGES:
+            stages = _cprofile_stages(profile_path, name)
+        else:
+            with open(profile_path, 'r', encoding='utf-8') as f:
+                stages = json.load(f)
+        os.remove(profile_path)
+    return wall, max_rss_kb, proc.returncode, stages, stdout_tail
+
+
+def run_benchmarks(line_counts, targets, repeat=1, seed=DEFAULT_SEED, output_path=BENCH_OUTPUT_FILE, **rates):
+    '''
+    줄 수마다 합성 로그를 만들고 대상 스크립트를 실행해서 결과를 output_path 에 JSON Lines 로 추가합니다.
+
+    Returns:
+        list: 결과 dict 목록 (repeat 번 중 가장 빠른 실행 기준)
+    '''
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    commit = _git_commit()
+    results = []
+    for lines in line_counts:
+        work_dir = tempfile.mkdtemp(prefix='mars_bench_')
+        try:
+            log_path = os.path.join(work_dir, LOG_FILE)
+            size = generate_log(log_path, lines, seed=seed, **rates)
+            expected = count_expected_records(log_path)
+            for name in targets:
+                runs = []
+                for _ in range(repeat):
+                    wall, max_rss_kb, returncode, _, stdout_tail = _run_target(name, work_dir, repo_dir)
+                    runs.append((wall, max_rss_kb, returncode, *_check_outputs(name, work_dir, stdout_tail, expected)))
+                # 결과가 올바른 실행 중 가장 빠른 것 (모두 실패했으면 실패한 실행 중 가장 빠른 것)
+                wall, max_rss_kb, returncode, records, error = min(
+                    runs, key=lambda run: (run[2] != 0 or run[4] is not None, run[0]))
+                stages = None
+                if name in PROFILED_TARGETS or name in CPROFILE_STAGES:
+                    stages = _run_target(name, work_dir, repo_dir, profile=True)[3]
+                result = {
+                    'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+                    'commit': commit,
+                    'target': name,
+                    'lines': lines,
+                    'bytes': size,
+                    'seed': seed,
+                    'repeat': repeat,
+                    'wall': round(wall, 4),
+                    'lines_per_sec': round(lines / wall) if wall else None,
+                    'max_rss_kb': max_rss_kb,
+                    'returncode': returncode,
+                    'valid': returncode == 0 and error is None,
+                    'records': records,
+                    'error': error,
+                    'stages': stages,
+                }
+                results.append(result)
+                with open(output_path, 'a', encoding='utf-8') as out:
+                    out.write(json.dumps(result, ensure_ascii=False) + '\n')
+                if returncode != 0:
+                    status = f'❌ (종료 코드 {returncode})'
+                else:
+                    status = '✅' if error is None else '❌'
+                print(f'{status} {name:<18} {lines:>10}줄  {wall:8.3f}s  '
+                      f'{result["lines_per_sec"] or 0:>10}줄/s  {max_rss_kb or "-"} KB'
+                      + (f'  ({error})' if error else ''))
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="로그 처리 벤치마크 (합성 로그 생성 + 실행 시간/메모리 측정)")
+    parser.add_argument('--lines', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="합성 로그 줄 수 목록 (기본값: 1000 10000 100000)")
+    parser.add_argument('--targets', nargs='+', choices=list(TARGETS), default=list(TARGETS),
+                        help="측정할 대상 (기본값: 전체)")
+    parser.add_argument('--repeat', type=int, default=1, help="대상마다 반복 실행 횟수 (가장 빠른 실행 기록)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--malformed-rate', type=float, default=0.01)
+    parser.add_argument('--duplicate-rate', type=float, default=0.05)
+    parser.add_argument('--out-of-order-rate', type=float, default=0.02)
+    parser.add_argument('--danger-rate', type=float, default=0.05)
+    parser.add_argument('--output', default=BENCH_OUTPUT_FILE, help=f"결과 파일 (기본값: {BENCH_OUTPUT_FILE})")
+    parser.add_argument('--generate-only', metavar='PATH',
+                        help="벤치마크는 실행하지 않고 PATH 에 합성 로그만 생성 (--lines 의 첫 번째 값 사용)")
+    args = parser.parse_args()
+
+    rates = dict(malformed_rate=args.malformed_rate, duplicate_rate=args.duplicate_rate,
+                 out_of_order_rate=args.out_of_order_rate, danger_rate=args.danger_rate)
+    if args.generate_only:
+        size = generate_log(args.generate_only, args.lines[0], seed=args.seed, **rates)
+        print(f"✅ 합성 로그 생성 완료: {args.generate_only} ({args.lines[0]}줄, {size} 바이트)")
+    else:
+        run_benchmarks(args.lines, args.targets, repeat=args.repeat, seed=args.seed,
+                       output_path=args.output, **rates)
+        print(f"✅ 결과 저장 완료: {args.output}")
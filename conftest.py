@@ -0,0 +1,8 @@
+import os
+import sys
+
+# 루트의 모듈(log_*.py, dome_*.py ...)을 tests/ 에서 바로 import 할 수 있도록
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# 루트의 test_exam*.py 는 시험 문제 풀이 스크립트 (input() 을 부름) 라서 테스트로 모으지 않음
+collect_ignore_glob = ['test_exam*.py']
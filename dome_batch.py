@@ -0,0 +1,86 @@
+import numpy as np
+from material_registry import INVALID_MATERIAL, MARS_GRAVITY_RATIO, load_registry
+'''
+반구체 돔 면적/화성 무게를 NumPy 배열로 한 번에 계산하는 batch API
+
+sphere_area(test_exam2, 4.py)는 돔 하나를 계산하므로 지름 × 두께 × 재질 조합이 수백만 개면
+파이썬 함수 호출도 수백만 번입니다. sphere_area_batch 는 배열을 받아 broadcasting 으로 한 번에 계산합니다.
+
+- 재질은 문자열('유리', 별칭 'glass' 도 가능) 또는 재질 번호(materials.csv 의 code)로 받고,
+  밀도는 DENSITIES 배열에서 번호로 한 번에 찾음 (sphere_area 와 같은 MATERIAL_REGISTRY 사용)
+- 지름, 두께, 재질은 서로 broadcasting 되는 모양이면 됨
+  (예: 지름 (N, 1) × 두께 (1, M) × 재질 하나 → (N, M) 결과)
+- 잘못된 값(없는 재질, 0 이하/숫자가 아닌 지름·두께)이 있어도 ValueError 를 내지 않고
+  valid 마스크에 False 로 표시하고 그 칸의 결과는 nan
+- 계산식은 sphere_area 와 같은 순서 (area_m2 = π × (d ** 2), 무게 = 밀도 × 면적(cm²) × 두께 / 1000 × MARS_GRAVITY_RATIO)
+  (NumPy 의 d ** 2 는 d*d 로, 파이썬 float 의 ** 는 pow 로 제곱하므로 드물게 마지막 자리(1 ulp) 차이가 날 수 있음)
+'''
+
+MATERIAL_REGISTRY = load_registry()
+MATERIALS = MATERIAL_REGISTRY.names     # 재질 번호 → 대표 이름
+DENSITIES = np.array(MATERIAL_REGISTRY.densities, dtype=np.float64)    # 재질 번호 → 밀도(g/cm³)
+
+
+def material_codes(material):
+    '''
+    재질 이름/별칭(또는 그 배열)을 재질 번호 배열로 바꿉니다. 없는 재질은 INVALID_MATERIAL(-1)
+    정수 배열이 들어오면 범위를 벗어난 번호만 -1 로 바꿔서 그대로 사용
+
+    Returns:
+        numpy.ndarray: int64 재질 번호 (입력과 같은 모양)
+    '''
+    values = np.asarray(material)
+    if values.dtype.kind in 'iu':
+        codes = values.astype(np.int64)
+        return np.where((codes >= 0) & (codes < len(MATERIALS)), codes, INVALID_MATERIAL)
+    # 재질 종류는 적으므로 고유값만 사전에서 찾고 결과를 원래 위치로 펼침
+    unique, inverse = np.unique(values.astype(str), return_inverse=True)
+    lookup = np.array([MATERIAL_REGISTRY.code(name) for name in unique], dtype=np.int64)
+    return lookup[inverse].reshape(values.shape)
+
+
+def _as_float_array(values):
+    # 숫자 배열로 바꾸고, 숫자로 바꿀 수 없는 칸은 nan (유효하지 않은 값으로 처리)
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        raw = np.asarray(values, dtype=object)
+        return np.array([_to_float(v) for v in raw.ravel()], dtype=np.float64).reshape(raw.shape)
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def sphere_area_batch(diameter, material, thickness=1.0):
+    '''
+    여러 돔의 표면적(m²)과 화성에서의 무게(kg)를 한 번에 계산합니다.
+
+    Args:
+        diameter (array_like): 돔의 지름 (m 단위)
+        material (array_like | str | int): 재질 이름 또는 재질 번호 (MATERIALS 순서)
+        thickness (array_like, optional): 돔의 두께 (cm 단위). 기본값은 1cm.
+
+    Returns:
+        tuple: (표면적, 화성에서의 무게, valid) - 모두 broadcasting 된 같은 모양의 배열
+            valid 가 False 인 칸의 표면적과 무게는 nan
+    '''
+    d = _as_float_array(diameter)
+    t = _as_float_array(1.0 if thickness is None else thickness)
+    codes = material_codes(material)
+    d, t, codes = np.broadcast_arrays(d, t, codes)
+
+    valid = (codes != INVALID_MATERIAL) & np.isfinite(d) & (d > 0) & np.isfinite(t) & (t > 0)
+    density = np.where(valid, DENSITIES[np.where(valid, codes, 0)], np.nan)
+
+    with np.errstate(invalid='ignore', over='ignore'):
+        area_m2 = np.pi * (d ** 2)
+        area_cm2 = area_m2 * 10000
+        volume_cm3 = area_cm2 * t
+        mass_kg = density * volume_cm3 / 1000
+        mass_weight_kg = mass_kg * MARS_GRAVITY_RATIO
+    area_m2 = np.where(valid, area_m2, np.nan)
+    return area_m2, mass_weight_kg, valid
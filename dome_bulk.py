@@ -0,0 +1,201 @@
+import sys
+import csv
+import argparse
+from collections import Counter
+from itertools import islice
+import numpy as np
+from dome_batch import INVALID_MATERIAL, material_codes, sphere_area_batch
+'''
+돔 계산기 일괄 처리 (CSV 입력 → CSV 출력)
+
+4.main / test_exam2.main 은 돔 하나마다 input() 을 세 번 부르므로 설계 수천 개를 계산하려면
+터미널에 값을 하나씩 넣어야 합니다. 여기서는 설계 목록을 CSV 파일이나 표준 입력으로 받아
+dome_batch.sphere_area_batch 로 청크 단위로 한 번에 계산하고 결과를 청크마다 바로 씁니다.
+
+입력 (헤더가 있으면 열 이름으로 찾고, thickness 열은 없어도 됨)
+    diameter,material,thickness
+    10,유리,1
+    5,알루미늄,          ← 두께가 비어 있으면 기본값 1cm (대화형과 같음)
+출력
+    row,diameter,material,thickness,area_m2,weight_kg,error
+    - row: 입력 데이터 행 번호 (헤더 제외, 1부터)
+    - error: 잘못된 행도 건너뛰거나 멈추지 않고 행마다 오류 코드를 기록 ("Invalid input." 대신)
+        ok                 정상
+        bad_row            열 수가 맞지 않음 (빈 줄 포함)
+        invalid_diameter   지름이 숫자가 아니거나 0 이하
+        unknown_material   materials.csv 에 없는 재질 (이름/별칭 모두 아님)
+        invalid_thickness  두께가 숫자가 아니거나 0 이하
+
+읽기는 csv 모듈로 하므로 따옴표로 감싼 값("3",glass,2 / "탄소강, 압연",...)도 대화형과 같은 값으로 읽고,
+청크마다 열 목록을 모아 숫자 변환/계산은 배열로 한 번에 한 뒤 csv.writer.writerows 로 한 번에 씀
+→ 행마다 sphere_area 를 부르는 반복문보다 빠르고 메모리는 청크 크기만큼만 사용
+
+사용 예
+    python dome_bulk.py designs.csv -o results.csv
+    cat designs.csv | python dome_bulk.py - > results.csv
+'''
+
+CHUNK_ROWS = 5000       # 한 번에 읽고 계산하는 행 수 (행 리스트가 많이 살아 있으면 GC 비용이 커지므로 작게)
+COLUMNS = ('diameter', 'material', 'thickness')
+OUTPUT_FIELDS = ('row', 'diameter', 'material', 'thickness', 'area_m2', 'weight_kg', 'error')
+DEFAULT_THICKNESS = '1'
+
+OK = 'ok'
+BAD_ROW = 'bad_row'
+INVALID_DIAMETER = 'invalid_diameter'
+UNKNOWN_MATERIAL = 'unknown_material'
+INVALID_THICKNESS = 'invalid_thickness'
+
+
+def _column_layout(header_row):
+    '''헤더 행에서 (열 수, 지름/재질/두께 열 번호) 를 찾습니다. 두께 열이 없으면 None'''
+    names = [name.strip().lower() for name in header_row]
+    missing = [name for name in COLUMNS[:2] if name not in names]
+    if missing:
+        raise ValueError(f"헤더에 {', '.join(missing)} 열이 없습니다. (필요한 열: {', '.join(COLUMNS)})")
+    thickness = names.index('thickness') if 'thickness' in names else None
+    return len(names), names.index('diameter'), names.index('material'), thickness
+
+
+def _parse_float(value):
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
+
+
+def _to_float(values):
+    # 대화형(float(input()))과 같은 규칙으로 숫자로 바꾸고, 바꿀 수 없는 값('', 'x' ...)은 nan
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        # 잘못된 값이 섞인 열은 값마다 변환 (두께처럼 값 종류가 적은 열이 많으므로 같은 문자열은 한 번만)
+        parsed = {value: _parse_float(value) for value in dict.fromkeys(values)}
+        return np.fromiter(map(parsed.__getitem__, values), dtype=np.float64, count=len(values))
+
+
+def evaluate_rows(rows, layout=None):
+    '''
+    csv.reader 로 나눈 데이터 행들을 계산해서 출력 열들을 돌려줍니다. (행 번호 열 제외)
+
+    Args:
+        rows (list): 데이터 행 (문자열 리스트, 빈 줄은 [])
+        layout (tuple, optional): _column_layout 결과, 없으면 헤더 없는 '지름,재질[,두께]'
+
+    Returns:
+        tuple: (diameter, material, thickness, area_m2, weight_kg, error) 열 리스트
+            잘못된 행의 area_m2, weight_kg 는 None (CSV 에는 빈 칸)
+    '''
+    lengths = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+    if layout is None:
+        n_columns, d_col, m_col, t_col = 3, 0, 1, 2
+        shape_ok = (lengths == 2) | (lengths == 3)      # 두께 열은 생략 가능
+    else:
+        n_columns, d_col, m_col, t_col = layout
+        shape_ok = lengths == n_columns
+    if not (lengths == n_columns).all():
+        # 열 수가 맞지 않는 행은 빈 값, 두께를 생략한 행은 두께 '' 로 맞춘 뒤 열 단위로 나눔
+        blank = ('',) * n_columns
+        rows = [row if size == n_columns else (row + [''] if ok else blank)
+                for row, size, ok in zip(rows, lengths.tolist(), shape_ok.tolist())]
+    columns = list(zip(*rows)) if rows else [()] * n_columns
+
+    diameter = list(map(str.strip, columns[d_col]))
+    material = list(map(str.strip, columns[m_col]))
+    if t_col is None:
+        thickness = [DEFAULT_THICKNESS] * len(rows)
+    else:
+        thickness = [value.strip() or DEFAULT_THICKNESS for value in columns[t_col]]
+    if not shape_ok.all():
+        thickness = np.where(shape_ok, thickness, '').tolist()
+
+    d = _to_float(diameter)
+    t = _to_float(thickness)
+    codes = material_codes(np.array(material, dtype=str))
+    area, weight, valid = sphere_area_batch(d, codes, t)
+
+    error = np.select(
+        [~shape_ok, ~(np.isfinite(d) & (d > 0)), codes == INVALID_MATERIAL, ~(np.isfinite(t) & (t > 0))],
+        [BAD_ROW, INVALID_DIAMETER, UNKNOWN_MATERIAL, INVALID_THICKNESS],
+        default=OK,
+    )
+    area = np.where(valid, area, None).tolist()
+    weight = np.where(valid, weight, None).tolist()
+    return diameter, material, thickness, area, weight, error.tolist()
+
+
+def run_batch(source, output, header=True, chunk_rows=CHUNK_ROWS):
+    '''
+    source 의 설계 행들을 청크 단위로 계산해서 output 에 CSV 로 바로 씁니다.
+
+    Args:
+        source (str | file): 입력 CSV 경로 또는 파일 객체 (표준 입력 등)
+        output (file): 결과를 쓸 텍스트 파일 객체
+        header (bool): 첫 줄이 헤더인지 여부
+        chunk_rows (int): 한 번에 계산할 행 수
+
+    Returns:
+        collections.Counter: 오류 코드별 행 수
+
+    Raises:
+        ValueError: 입력이 비어 있거나 헤더에 필요한 열이 없음
+    '''
+    if isinstance(source, str):
+        with open(source, 'r', encoding='utf-8', newline='') as f:
+            return run_batch(f, output, header, chunk_rows)
+
+    reader = csv.reader(source)
+    writer = csv.writer(output, lineterminator='\n')
+    layout = None
+    if header:
+        first = next(reader, None)
+        if first is None:
+            raise ValueError("입력이 비어 있습니다.")
+        layout = _column_layout(first)
+
+    counts = Counter()
+    row = 0
+    writer.writerow(OUTPUT_FIELDS)
+    while True:
+        rows = list(islice(reader, chunk_rows))
+        if not rows:
+            break
+        columns = evaluate_rows(rows, layout)
+        counts.update(columns[-1])
+        writer.writerows(zip(range(row + 1, row + len(rows) + 1), *columns))
+        row += len(rows)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="돔 면적/화성 무게 일괄 계산 (CSV 입력 → CSV 출력)")
+    parser.add_argument('input', help="입력 CSV 경로 ('-' 이면 표준 입력)")
+    parser.add_argument('-o', '--output', help="결과 CSV 경로 (없으면 표준 출력)")
+    parser.add_argument('--no-header', action='store_true', help="첫 줄도 데이터 (열 순서: 지름,재질[,두께])")
+    parser.add_argument('--chunk', type=int, default=CHUNK_ROWS, metavar='N', help="한 번에 계산할 행 수")
+    args = parser.parse_args()
+    if args.chunk < 1:
+        parser.error("--chunk 는 1 이상이어야 합니다.")
+
+    source = sys.stdin if args.input == '-' else args.input
+    try:
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8', newline='') as out:
+                counts = run_batch(source, out, header=not args.no_header, chunk_rows=args.chunk)
+        else:
+            counts = run_batch(source, sys.stdout, header=not args.no_header, chunk_rows=args.chunk)
+    except FileNotFoundError:
+        print(f"❌ 오류: '{args.input}' 파일이 존재하지 않습니다.", file=sys.stderr)
+        sys.exit(1)
+    except ValueError as ve:
+        print(f"❌ {ve}", file=sys.stderr)
+        sys.exit(1)
+
+    # 결과 CSV 가 표준 출력으로 나갈 수 있으므로 요약은 표준 오류로
+    summary = ', '.join(f'{code} {count}' for code, count in counts.most_common() if code != OK)
+    print(f"✅ {sum(counts.values())}행 계산 (정상 {counts[OK]}{', ' + summary if summary else ''})"
+          + (f" → {args.output}" if args.output else ''), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+import os
+import csv
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from dome_batch import MATERIALS, material_codes, sphere_area_batch
+'''
+돔 설계 공간 탐색(sweep) + 재질/두께 최적화
+
+test_exam2.main 은 "이 돔 하나의 무게" 만 계산하므로
+"필요한 면적을 덮으면서 화성 무게 예산 안에서 가장 가벼운 재질/두께" 를 찾기 위해
+지름 × 두께 × 재질 격자(Cartesian product) 전체를 계산합니다.
+
+1. 격자의 칸 번호 [0, 전체 칸 수) 를 CHUNK_SIZE 개씩 나누어 ProcessPoolExecutor 워커들이 계산
+   (칸 번호 → np.unravel_index 로 지름/두께/재질 번호, 계산은 dome_batch.sphere_area_batch)
+   동시에 처리 중인 청크 수를 workers × 2 로 제한하므로 격자가 아무리 커도 메모리 사용량은 일정
+2. 조건(min_area 이상, max_weight 이하)을 만족하는 칸은 CSV 또는 Parquet 파일에 청크마다 바로 저장
+3. 메모리에는 파레토 프런트(면적은 클수록, 무게는 작을수록 좋음)만 유지
+   - 청크마다 프런트를 구하고 지금까지의 프런트와 합쳐서 다시 프런트만 남김
+   - 조건을 만족하는 가장 가벼운 설계(best)는 프런트에서 무게가 가장 작은 점
+
+사용 예
+    python dome_sweep.py --diameter 1 50 500 --thickness 0.5 10 200 --min-area 100 --max-weight 50000 \\
+        --output sweep.csv --workers 4
+'''
+
+CHUNK_SIZE = 1_000_000      # 워커 하나가 한 번에 계산하는 격자 칸 수
+FIELDS = ('diameter_m', 'thickness_cm', 'material', 'area_m2', 'weight_kg')
+
+_grid = None    # 워커 프로세스마다 한 번만 받아 두는 격자 (diameters, thicknesses, material_codes)
+
+
+def _init_worker(grid):
+    global _grid
+    _grid = grid
+
+
+def _evaluate_chunk(start, stop, min_area, max_weight):
+    '''
+    격자 칸 [start, stop) 을 계산해서 (조건을 만족하는 칸의 열 배열들, 평가한 칸 수) 를 돌려줍니다. (워커에서 실행)
+
+    Returns:
+        tuple: ((diameter, thickness, code, area, weight), 평가한 칸 수, 유효한 칸 수)
+    '''
+    diameters, thicknesses, codes = _grid
+    d_idx, t_idx, m_idx = np.unravel_index(np.arange(start, stop), (len(diameters), len(thicknesses), len(codes)))
+    d, t, c = diameters[d_idx], thicknesses[t_idx], codes[m_idx]
+    area, weight, valid = sphere_area_batch(d, c, t)
+    keep = valid
+    if min_area is not None:
+        keep = keep & (area >= min_area)
+    if max_weight is not None:
+        keep = keep & (weight <= max_weight)
+    rows = (d[keep], t[keep], c[keep], area[keep], weight[keep])
+    return rows, stop - start, int(valid.sum())
+
+
+def pareto_front(rows):
+    '''
+    (diameter, thickness, code, area, weight) 열 배열에서 파레토 프런트만 남깁니다.
+    다른 점보다 면적이 작거나 같으면서 무게가 크거나 같은 점(지배당한 점)을 버림
+    결과는 면적이 큰 순서 (같은 점이 여러 개면 처음 것 하나만)
+    '''
+    area, weight = rows[3], rows[4]
+    if len(area) == 0:
+        return rows
+    order = np.lexsort((weight, -area))     # 면적 내림차순, 같은 면적이면 무게 오름차순
+    sorted_weight = weight[order]
+    # 앞(면적이 더 큰) 점들의 최소 무게보다 가벼워야 프런트에 남음
+    previous_min = np.minimum.accumulate(np.concatenate(([np.inf], sorted_weight[:-1])))
+    keep = order[sorted_weight < previous_min]
+    return tuple(column[keep] for column in rows)
+
+
+class _CsvSink:
+    def __init__(self, path):
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(FIELDS)
+
+    def write(self, rows):
+        d, t, c, area, weight = rows
+        names = np.asarray(MATERIALS)[c]
+        self._writer.writerows(zip(d.tolist(), t.tolist(), names.tolist(), area.tolist(), weight.tolist()))
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetSink:
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Parquet 로 저장하려면 pyarrow 가 필요합니다. (pip install pyarrow)")
+        self._pa = pa
+        self._schema = pa.schema([('diameter_m', pa.float64()), ('thickness_cm', pa.float64()),
+                                  ('material', pa.string()), ('area_m2', pa.float64()), ('weight_kg', pa.float64())])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows):
+        d, t, c, area, weight = rows
+        names = np.asarray(MATERIALS)[c]
+        self._writer.write_table(self._pa.Table.from_arrays([d, t, names, area, weight], schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+def open_sink(path):
+    '''확장자에 맞는 결과 writer (.parquet 는 pyarrow 필요, 그 외에는 CSV)'''
+    if path.endswith('.parquet'):
+        return _ParquetSink(path)
+    return _CsvSink(path)
+
+
+def sweep(diameters, thicknesses, materials=MATERIALS, min_area=None, max_weight=None, output=None,
+          workers=None, chunk_size=CHUNK_SIZE):
+    '''
+    지름 × 두께 × 재질 격자 전체를 계산하고 파레토 프런트와 가장 가벼운 설계를 돌려줍니다.
+
+    Args:
+        diameters (array_like): 지름 목록 (m)
+        thicknesses (array_like): 두께 목록 (cm)
+        materials (list): 재질 이름/별칭 목록 (기본값: 전체 재질)
+        min_area (float, optional): 필요한 최소 면적 (m²)
+        max_weight (float, optional): 화성 무게 예산 (kg)
+        output (str, optional): 조건을 만족하는 칸을 저장할 CSV/Parquet 경로
+        workers (int, optional): 프로세스 수 (없거나 1 이면 현재 프로세스에서 계산)
+        chunk_size (int): 한 번에 계산할 격자 칸 수
+
+    Returns:
+        dict: {'evaluated', 'valid', 'feasible', 'front': [행 dict, ...], 'best': 행 dict | None}
+
+    Raises:
+        ValueError: 없는 재질이 들어옴
+    '''
+    codes = material_codes(list(materials))
+    if (codes < 0).any():
+        unknown = [name for name, code in zip(materials, codes) if code < 0]
+        raise ValueError(f"지원하지 않는 재질입니다: {', '.join(map(str, unknown))} (materials.csv 참고)")
+    grid = (np.asarray(diameters, dtype=np.float64), np.asarray(thicknesses, dtype=np.float64), codes)
+    total = len(grid[0]) * len(grid[1]) * len(grid[2])
+    bounds = [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+
+    front = tuple(np.empty(0, dtype=dtype) for dtype in (np.float64, np.float64, np.int64, np.float64, np.float64))
+    evaluated = valid = feasible = 0
+    sink = open_sink(output) if output else None
+    try:
+        for rows, chunk_evaluated, chunk_valid in _run_chunks(grid, bounds, min_area, max_weight, workers):
+            evaluated += chunk_evaluated
+            valid += chunk_valid
+            feasible += len(rows[0])
+            if sink is not None and len(rows[0]):
+                sink.write(rows)
+            # 지금까지의 프런트 + 이 청크의 프런트 → 다시 프런트만 남김 (메모리에는 프런트만 유지)
+            chunk_front = pareto_front(rows)
+            front = pareto_front(tuple(np.concatenate(pair) for pair in zip(front, chunk_front)))
+    finally:
+        if sink is not None:
+            sink.close()
+
+    front_rows = _to_dicts(front)
+    best = min(front_rows, key=lambda row: row['weight_kg']) if front_rows else None
+    return {'evaluated': evaluated, 'valid': valid, 'feasible': feasible, 'front': front_rows, 'best': best}
+
+
+def _run_chunks(grid, bounds, min_area, max_weight, workers):
+    # 청크 결과를 청크 순서대로 돌려줌 (프로세스 풀이면 동시에 처리 중인 청크 수를 제한)
+    if not workers or workers < 2 or len(bounds) < 2:
+        _init_worker(grid)
+        for start, stop in bounds:
+            yield _evaluate_chunk(start, stop, min_area, max_weight)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(grid,)) as pool:
+        pending = deque()
+        for start, stop in bounds:
+            pending.append(pool.submit(_evaluate_chunk, start, stop, min_area, max_weight))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _to_dicts(rows):
+    d, t, c, area, weight = rows
+    return [{'diameter_m': float(d[i]), 'thickness_cm': float(t[i]), 'material': MATERIALS[c[i]],
+             'area_m2': float(area[i]), 'weight_kg': float(weight[i])} for i in range(len(d))]
+
+
+def _axis(values):
+    # --diameter 1 50 500 → np.linspace(1, 50, 500), 값이 하나면 그 값 하나
+    if len(values) == 1:
+        return np.array(values, dtype=np.float64)
+    if len(values) == 3:
+        return np.linspace(values[0], values[1], int(values[2]))
+    raise ValueError("범위는 '값' 또는 '시작 끝 개수' 로 입력하세요.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="돔 지름 × 두께 × 재질 격자 탐색 (파레토 프런트, 가장 가벼운 설계)")
+    parser.add_argument('--diameter', type=float, nargs='+', required=True, metavar='M',
+                        help="지름(m): 값 하나 또는 '시작 끝 개수' (np.linspace)")
+    parser.add_argument('--thickness', type=float, nargs='+', default=[1.0], metavar='CM',
+                        help="두께(cm): 값 하나 또는 '시작 끝 개수' (기본값: 1)")
+    parser.add_argument('--materials', nargs='+', default=list(MATERIALS),
+                        help=f"재질 이름/별칭 목록 (기본값: materials.csv 의 전체 재질 {len(MATERIALS)}개)")
+    parser.add_argument('--min-area', type=float, help="필요한 최소 면적(m²)")
+    parser.add_argument('--max-weight', type=float, help="화성 무게 예산(kg)")
+    parser.add_argument('--output', metavar='PATH', help="조건을 만족하는 설계를 저장할 .csv / .parquet 파일")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), metavar='N',
+                        help="프로세스 수 (기본값: CPU 수)")
+    parser.add_argument('--chunk', type=int, default=CHUNK_SIZE, metavar='N', help="청크 하나의 격자 칸 수")
+    parser.add_argument('--show', type=int, default=10, metavar='N', help="출력할 파레토 프런트 점 수")
+    args = parser.parse_args()
+    if args.chunk < 1:
+        parser.error("--chunk 는 1 이상이어야 합니다.")
+
+    try:
+        result = sweep(_axis(args.diameter), _axis(args.thickness), args.materials, args.min_area,
+                       args.max_weight, args.output, args.workers, args.chunk)
+    except ValueError as ve:
+        print(f"❌ {ve}")
+        return
+
+    print(f"📊 격자 {result['evaluated']}칸 | 유효 {result['valid']} | 조건 만족 {result['feasible']}")
+    if args.output:
+        print(f"✅ 결과 저장 완료: {args.output}")
+    best = result['best']
+    if best is None:
+        print("❌ 조건을 만족하는 설계가 없습니다.")
+        return
+    print(f"\n[가장 가벼운 설계]\n재질 : {best['material']}, 지름 : {best['diameter_m']:g}, "
+          f"두께 : {best['thickness_cm']:g}, 면적 : {best['area_m2']:.3f}, 무게 : {best['weight_kg']:.3f} kg")
+
+    front = result['front']
+    print(f"\n[파레토 프런트] {len(front)}개 (면적 큰 순서, 처음 {min(args.show, len(front))}개)")
+    print("| 재질 | 지름(m) | 두께(cm) | 면적(m²) | 무게(kg) |")
+    print("|------|---------|----------|----------|----------|")
+    for row in front[:args.show]:
+        print(f"| {row['material']} | {row['diameter_m']:g} | {row['thickness_cm']:g} "
+              f"| {row['area_m2']:.3f} | {row['weight_kg']:.3f} |")
+
+
+if __name__ == "__main__":
+    main()
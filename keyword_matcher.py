@@ -0,0 +1,87 @@
+from collections import deque
+'''
+여러 키워드를 한 번에 찾는 Aho-Corasick 매처
+
+any(k.lower() in message.lower() for k in danger_keyword) 방식은
+키워드마다 message 를 다시 소문자로 바꾸고 다시 훑기 때문에
+비용이 (줄 수 × 키워드 수) 로 늘어납니다.
+
+KeywordMatcher 는 키워드 목록으로 상태 기계(트라이 + 실패 링크)를 한 번만 만들고
+message 를 한 번만 소문자로 바꿔서 한 번만 훑으면서 모든 키워드를 찾습니다.
+- 한글은 대소문자가 없으므로 그대로, 영어는 lower() 로 대소문자 구분 없이 비교
+- 어떤 키워드가 맞았는지(키워드 목록 순서대로) 돌려줌
+
+사용 예
+    matcher = KeywordMatcher(['폭발', '누출', '고온', 'Oxygen'])
+    matcher.find_all('oxygen 누출 감지')   # ['누출', 'Oxygen']
+    matcher.search('정상')                 # False
+'''
+
+
+class KeywordMatcher:
+    def __init__(self, keywords):
+        '''
+        Args:
+            keywords (list): 찾을 키워드 목록 (빈 문자열은 무시)
+        '''
+        self.keywords = list(keywords)
+        self._goto = [{}]       # 상태별 다음 문자 → 다음 상태
+        self._fail = [0]        # 상태별 실패 링크
+        self._out = [()]        # 상태에서 끝나는 키워드 번호들
+
+        for index, keyword in enumerate(self.keywords):
+            pattern = keyword.lower()
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[node][ch] = nxt
+                node = nxt
+            self._out[node] += (index,)
+
+        # 너비 우선 탐색으로 실패 링크 연결 (루트의 자식은 루트로 돌아감)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                # 실패 링크 쪽에서 끝나는 키워드도 이 상태에서 함께 찾은 것으로 처리
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def _scan(self, text):
+        # text 를 한 번 훑으면서 키워드가 끝나는 위치마다 키워드 번호 묶음을 돌려줌
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for ch in text.lower():
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                yield out[node]
+
+    def find_indices(self, text):
+        '''text 에 포함된 키워드 번호 목록을 키워드 목록 순서대로 돌려줍니다.'''
+        found = set()
+        for indices in self._scan(text):
+            found.update(indices)
+        return sorted(found)
+
+    def find_all(self, text):
+        '''text 에 포함된 키워드 목록을 키워드 목록 순서대로 돌려줍니다.'''
+        return [self.keywords[i] for i in self.find_indices(text)]
+
+    def search(self, text):
+        '''키워드가 하나라도 포함되어 있으면 True (처음 찾는 순간 멈춤)'''
+        for _ in self._scan(text):
+            return True
+        return False
@@ -0,0 +1,137 @@
+import re
+import json
+from keyword_matcher import KeywordMatcher
+from log_records import iter_ndjson_by_time
+from log_compress import is_log_path
+from log_stream import iter_log_records
+'''
+여러 검색어를 한 번에 처리하는 일괄 검색
+
+대화형 검색은 검색어 하나마다 input() 으로 받고 파일을 다시 읽어서 훑으므로
+검색어가 N개면 파일 읽기와 훑기도 N번입니다.
+BatchSearcher 는 모든 검색어를 한 번에 컴파일해 두고 레코드를 한 번만 훑으면서
+검색어마다 결과 목록과 건수를 모읍니다.
+
+- 일반 검색어: 대소문자 구분 없는 부분 문자열 → 모두 모아서 Aho-Corasick(KeywordMatcher) 하나로 검사
+- 정규식 검색어('re:' 로 시작): 하나의 정규식(r1|r2|...)으로 묶어서 먼저 검사하고
+  맞은 줄만 정규식별로 다시 확인 (대부분의 줄은 한 번의 검사로 끝남)
+  그룹이 있는 정규식(역참조 번호가 바뀔 수 있음)은 묶지 않고 따로 검사
+- 검색 대상: 처리된 JSONL(mission_computer_main.jsonl, 기본값) 또는 원본 로그 파일(.log, .log.gz ...)
+
+검색어 파일 형식 (한 줄에 검색어 하나, 빈 줄과 '#' 으로 시작하는 줄은 무시)
+    Oxygen
+    누출
+    re:tank\\s+unstable
+    re:(?i)^engine
+'''
+
+REGEX_PREFIX = 're:'
+
+
+def parse_queries(lines):
+    '''
+    검색어 파일의 줄 목록을 (검색어, 정규식 여부) 목록으로 바꿉니다.
+
+    Raises:
+        ValueError: 정규식이 잘못됨
+    '''
+    queries = []
+    for line in lines:
+        text = line.rstrip('\r\n')
+        if not text.strip() or text.lstrip().startswith('#'):
+            continue
+        if text.startswith(REGEX_PREFIX):
+            pattern = text[len(REGEX_PREFIX):]
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"잘못된 정규식입니다: {pattern!r} ({e})")
+            queries.append((pattern, True))
+        else:
+            queries.append((text.strip(), False))
+    return queries
+
+
+def load_queries(path):
+    '''검색어 파일을 읽어 parse_queries 결과를 돌려줍니다.'''
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_queries(f)
+
+
+class BatchSearcher:
+    def __init__(self, queries):
+        '''
+        Args:
+            queries (list): (검색어, 정규식 여부) 목록 (parse_queries 결과)
+        '''
+        self.queries = list(queries)
+        literal_ids = [i for i, (_, is_regex) in enumerate(self.queries) if not is_regex]
+        self._literal_ids = literal_ids
+        self._matcher = KeywordMatcher([self.queries[i][0] for i in literal_ids]) if literal_ids else None
+
+        self._regexes = [(i, re.compile(text)) for i, (text, is_regex) in enumerate(self.queries) if is_regex]
+        combinable = [(i, regex) for i, regex in self._regexes if regex.groups == 0]
+        self._combined = None
+        if len(combinable) > 1:
+            try:
+                self._combined = re.compile('|'.join(f'(?:{regex.pattern})' for _, regex in combinable))
+            except re.error:
+                combinable = []     # (?i) 같은 전체 플래그가 앞에 있으면 묶을 수 없으므로 따로 검사
+        else:
+            combinable = []
+        self._combinable = combinable
+        combined_ids = {i for i, _ in combinable}
+        self._single = [(i, regex) for i, regex in self._regexes if i not in combined_ids]
+
+    def match(self, message):
+        '''message 에 맞는 검색어 번호 목록을 돌려줍니다.'''
+        hits = []
+        if self._matcher is not None:
+            hits.extend(self._literal_ids[i] for i in self._matcher.find_indices(message))
+        if self._combined is not None and self._combined.search(message):
+            hits.extend(i for i, regex in self._combinable if regex.search(message))
+        hits.extend(i for i, regex in self._single if regex.search(message))
+        return hits
+
+    def run(self, records, limit=None):
+        '''
+        레코드를 한 번 훑으면서 모든 검색어의 결과를 모읍니다.
+
+        Args:
+            records (iterable): (epoch, timestamp, message, event, ...) 레코드
+            limit (int, optional): 검색어마다 저장할 최대 결과 수 (건수는 모두 셈)
+
+        Returns:
+            list: 검색어 순서대로 {'query', 'regex', 'count', 'hits': [(timestamp, event, message), ...]}
+        '''
+        counts = [0] * len(self.queries)
+        hits = [[] for _ in self.queries]
+        for record in records:
+            for i in self.match(record[2]):
+                counts[i] += 1
+                if limit is None or len(hits[i]) < limit:
+                    hits[i].append((record[1], record[3], record[2]))
+        return [{'query': text, 'regex': is_regex, 'count': counts[i], 'hits': hits[i]}
+                for i, (text, is_regex) in enumerate(self.queries)]
+
+
+def iter_search_records(path):
+    '''
+    검색 대상 파일의 레코드를 돌려줍니다. 로그 파일이면 파싱하고, 아니면 처리된 JSONL 로 읽음
+    (증분 처리로 이어 붙인 JSONL 도 세그먼트를 병합해서 시간 역순으로)
+    '''
+    if is_log_path(path):
+        return iter_log_records(path)
+    return (record for _, record in iter_ndjson_by_time(path))
+
+
+def batch_search(path, queries, limit=None):
+    '''path 를 한 번만 읽으면서 queries 전체를 검색합니다. (BatchSearcher.run 결과)'''
+    return BatchSearcher(queries).run(iter_search_records(path), limit)
+
+
+def save_results(results, path):
+    '''검색 결과를 검색어 하나당 한 줄씩 JSON Lines 로 저장합니다.'''
+    with open(path, 'w', encoding='utf-8') as f:
+        for result in results:
+            f.write(json.dumps(result, ensure_ascii=False) + '\n')
@@ -0,0 +1,208 @@
+import os
+import json
+import mmap
+import shutil
+import hashlib
+from array import array
+import numpy as np
+from log_records import LogRecordStore
+from log_timestamp import epoch_to_timestamp
+'''
+파싱된 로그의 열(column) 단위 바이너리 캐시
+
+로그 파일이 바뀌지 않았으면 다시 실행할 때 텍스트를 파싱하지 않고
+정렬까지 끝난 레코드를 바로 읽어옵니다.
+
+- 위치: 로그 파일 옆 .log_cache/<로그 파일 이름>/
+    meta.json         버전, 원본 경로/크기/수정 시간(ns)/inode/앞뒤 부분 해시(blake2b), 레코드 수, event 종류 목록
+    outputs.json      이 캐시로 저장한 결과 파일들의 크기/수정 시간과 출력 옵션 (결과가 최신이면 다시 쓰지 않음)
+    epochs.npy        int64   epoch 초 (시간 역순, 같은 초는 원래 줄 순서)
+    event_codes.npy   uint32  event 종류 번호
+    offsets.npy       int64   messages.bin 안에서 message 의 시작 위치 (레코드 수 + 1개)
+    messages.bin      message 를 UTF-8 로 이어 붙인 바이트
+- 읽을 때는 np.load(mmap_mode='r') / mmap 으로 열어서 필요한 부분만 디스크에서 읽음
+  (반복할 때도 ITER_BLOCK 개씩 잘라서 읽으므로 메모리는 캐시 크기와 관계없음)
+- 크기, 수정 시간, 장치/inode 번호가 다르면 무효, 같으면 앞뒤 HASH_BLOCK 바이트의 해시만 다시 비교
+  (전체 해시는 로그 크기만큼 읽어야 해서 캐시를 쓰는 이점이 줄어듦)
+- 캐시는 임시 디렉터리에 다 쓴 뒤 교체하므로 중간에 중단되어도 깨진 캐시가 남지 않음
+- 사용하는 곳: main_v02 --cache 만
+  캐시에는 유효한 레코드만 시간 역순으로 저장되므로 잘못된 줄도 결과에 반영하는 스크립트는 쓰지 않음
+    main.py     날짜 오류 줄을 NaT 로 남기고 시간 순서로 정렬 (10MB 이하만 읽어서 파싱도 짧음)
+    main_v01.py 헤더 줄도 JSON 항목으로 남고 'event,message' 를 값으로 저장
+    3.py        잘못된 줄이 하나라도 있으면 Invalid log format. 을 출력해야 함
+'''
+
+CACHE_VERSION = 2
+CACHE_DIR_NAME = '.log_cache'
+HASH_BLOCK = 1024 * 1024    # 내용 해시에 쓰는 앞부분 / 뒷부분 크기
+ITER_BLOCK = 65536          # 캐시를 반복할 때 한 번에 파이썬 객체로 바꾸는 레코드 수
+
+
+def cache_dir_for(log_path):
+    '''로그 파일 옆에 만들 캐시 디렉터리 (logs/a.log → logs/.log_cache/a.log)'''
+    log_path = os.path.abspath(log_path)
+    return os.path.join(os.path.dirname(log_path), CACHE_DIR_NAME, os.path.basename(log_path))
+
+
+def _content_hash(log_path, size):
+    # 앞부분과 뒷부분만 해시 (크기/수정 시간/inode 와 함께 비교하므로 전체를 읽지 않음)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(log_path, 'rb') as f:
+        digest.update(f.read(HASH_BLOCK))
+        if size > HASH_BLOCK:
+            f.seek(max(HASH_BLOCK, size - HASH_BLOCK))
+            digest.update(f.read(HASH_BLOCK))
+    return digest.hexdigest()
+
+
+def _source_key(log_path):
+    stat = os.stat(log_path)
+    return {
+        'path': os.path.abspath(log_path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'dev': stat.st_dev,
+        'inode': stat.st_ino,
+        'hash': _content_hash(log_path, stat.st_size),
+    }
+
+
+def _file_stamp(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+class LogCacheWriter:
+    '''
+    정렬된 레코드를 하나씩 받아서 캐시를 만드는 writer
+    message 는 바로 파일에 쓰고, 메모리에는 레코드마다 정수 3개만 남김
+    '''
+    def __init__(self, log_path):
+        self.cache_dir = cache_dir_for(log_path)
+        self.source = _source_key(log_path)     # 파싱 전에 계산 (파싱 중에 파일이 바뀌면 다음 실행에서 무효)
+        self._tmp_dir = self.cache_dir + '.tmp'
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+        os.makedirs(self._tmp_dir)
+        self._messages = open(os.path.join(self._tmp_dir, 'messages.bin'), 'wb')
+        self.epochs = array('q')
+        self.event_codes = array('I')
+        self.offsets = array('q', [0])
+        self.events = []
+        self._event_lookup = {}
+
+    def add_record(self, record):
+        '''record = (epoch, timestamp, message, event, ...)'''
+        event = record[3]
+        code = self._event_lookup.get(event)
+        if code is None:
+            code = self._event_lookup[event] = len(self.events)
+            self.events.append(event)
+        data = record[2].encode('utf-8')
+        self._messages.write(data)
+        self.epochs.append(record[0])
+        self.event_codes.append(code)
+        self.offsets.append(self.offsets[-1] + len(data))
+
+    def commit(self):
+        '''캐시 파일을 마무리하고 기존 캐시와 교체합니다.'''
+        self._messages.close()
+        np.save(os.path.join(self._tmp_dir, 'epochs.npy'), np.frombuffer(self.epochs, dtype=np.int64))
+        np.save(os.path.join(self._tmp_dir, 'event_codes.npy'), np.frombuffer(self.event_codes, dtype=np.uint32))
+        np.save(os.path.join(self._tmp_dir, 'offsets.npy'), np.frombuffer(self.offsets, dtype=np.int64))
+        meta = {'version': CACHE_VERSION, 'source': self.source,
+                'count': len(self.epochs), 'events': self.events}
+        with open(os.path.join(self._tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        os.replace(self._tmp_dir, self.cache_dir)
+        return self.cache_dir
+
+    def discard(self):
+        '''만들던 캐시를 버립니다. (처리 중 오류가 난 경우)'''
+        self._messages.close()
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+
+class LogCache:
+    '''메모리 맵으로 연 캐시. 반복하면 (epoch, timestamp, message, event) 레코드를 시간 역순으로 생성'''
+    def __init__(self, cache_dir, meta):
+        self.cache_dir = cache_dir
+        self.events = meta['events']
+        self.epochs = np.load(os.path.join(cache_dir, 'epochs.npy'), mmap_mode='r')
+        self.event_codes = np.load(os.path.join(cache_dir, 'event_codes.npy'), mmap_mode='r')
+        self.offsets = np.load(os.path.join(cache_dir, 'offsets.npy'), mmap_mode='r')
+        messages_path = os.path.join(cache_dir, 'messages.bin')
+        if os.path.getsize(messages_path):
+            with open(messages_path, 'rb') as f:
+                self.messages = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.messages = b''     # 빈 파일은 mmap 으로 열 수 없음
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def message(self, i):
+        return self.messages[int(self.offsets[i]):int(self.offsets[i + 1])].decode('utf-8')
+
+    def __iter__(self):
+        # ITER_BLOCK 개씩 tolist() 로 파이썬 정수로 바꿔서 레코드마다 numpy 스칼라를 만들지 않고,
+        # message 는 mmap 에서 그 부분만 잘라서 읽음 (캐시 전체를 메모리에 복사하지 않음)
+        events = self.events
+        messages = self.messages
+        for lo in range(0, len(self), ITER_BLOCK):
+            hi = min(lo + ITER_BLOCK, len(self))
+            offsets = self.offsets[lo:hi + 1].tolist()
+            codes = self.event_codes[lo:hi].tolist()
+            for i, epoch in enumerate(self.epochs[lo:hi].tolist()):
+                message = messages[offsets[i]:offsets[i + 1]].decode('utf-8')
+                yield epoch, epoch_to_timestamp(epoch), message, events[codes[i]]
+
+    def to_store(self):
+        '''LogRecordStore 로 변환합니다.'''
+        return LogRecordStore(self)
+
+
+def load_log_cache(log_path):
+    '''
+    로그 파일의 캐시를 읽어옵니다.
+
+    Returns:
+        LogCache | None: 캐시가 없거나 로그 파일이 캐시를 만든 뒤 바뀌었으면 None
+    '''
+    cache_dir = cache_dir_for(log_path)
+    try:
+        with open(os.path.join(cache_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        source = meta.get('source', {})
+        stat = os.stat(log_path)
+        if (meta.get('version') != CACHE_VERSION or source.get('path') != os.path.abspath(log_path)
+                or source.get('size') != stat.st_size or source.get('mtime_ns') != stat.st_mtime_ns
+                or source.get('dev') != stat.st_dev or source.get('inode') != stat.st_ino):
+            return None
+        if source.get('hash') != _content_hash(log_path, stat.st_size):
+            return None
+        return LogCache(cache_dir, meta)
+    except (FileNotFoundError, json.JSONDecodeError, ValueError):
+        return None
+
+
+def save_output_stamps(log_path, output_paths, options=None):
+    '''
+    캐시(를 만들면서 또는 캐시로) 저장한 결과 파일들의 크기/수정 시간을 캐시 디렉터리에 기록합니다.
+    캐시를 새로 만들면 디렉터리가 교체되므로 기록도 함께 없어짐
+    '''
+    path = os.path.join(cache_dir_for(log_path), 'outputs.json')
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'options': options, 'files': {p: _file_stamp(p) for p in output_paths}}, f, ensure_ascii=False)
+    os.replace(path + '.tmp', path)
+
+
+def outputs_up_to_date(log_path, output_paths, options=None):
+    '''save_output_stamps 로 기록한 뒤 결과 파일들과 출력 옵션이 그대로인지 확인합니다.'''
+    try:
+        with open(os.path.join(cache_dir_for(log_path), 'outputs.json'), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return (data.get('options') == options
+                and data.get('files') == {p: _file_stamp(p) for p in output_paths})
+    except (FileNotFoundError, json.JSONDecodeError):
+        return False
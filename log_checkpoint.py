@@ -0,0 +1,121 @@
+import os
+import json
+import hashlib
+from log_stream import parse_log_line
+'''
+증분(incremental) 처리를 위한 로그 파일 체크포인트
+
+매번 mission_computer_main.log 를 0바이트부터 다시 처리하지 않도록
+마지막으로 처리한 바이트 위치와 파일 정보를 저장해 둡니다.
+- offset: 처리한 마지막 "완전한 줄"의 끝 위치 (쓰는 중인 마지막 줄은 다음에 처리)
+- 파일 식별: 장치/inode 번호, 앞부분(HEAD_BYTES)의 sha256
+  로그가 교체(rotate)되었거나 잘렸거나 앞부분이 바뀌었으면 체크포인트를 버리고 처음부터 처리
+- 결과 JSON 의 크기/수정 시간: 다른 방법(전체 재처리 등)으로 JSON 이 바뀌었으면 역시 처음부터 처리
+  새 레코드를 기존 결과에 이어 쓰는 경우에는 함께 고치는 결과 파일들(related)과
+  출력 옵션(options: 형식, 압축)도 같이 기록해서 하나라도 다르면 처음부터 처리
+'''
+
+HEAD_BYTES = 4096
+READ_BLOCK = 1024 * 1024
+
+
+def checkpoint_path_for(json_path):
+    '''JSON 경로 옆에 저장할 체크포인트 경로 (mission_computer_main.json → mission_computer_main.checkpoint.json)'''
+    root, _ = os.path.splitext(json_path)
+    return root + '.checkpoint.json'
+
+
+def _head_hash(file_path, length):
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read(length)).hexdigest()
+
+
+def complete_lines_end(file_path):
+    '''파일에서 마지막 줄바꿈 바로 뒤의 위치 (아직 쓰는 중인 마지막 줄은 제외)'''
+    with open(file_path, 'rb') as f:
+        end = f.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - READ_BLOCK)
+            f.seek(start)
+            block = f.read(end - start)
+            newline = block.rfind(b'\n')
+            if newline >= 0:
+                return start + newline + 1
+            end = start
+    return 0
+
+
+def _output_stamp(output_path):
+    stat = os.stat(output_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def save_checkpoint(checkpoint_path, file_path, offset, output_path, related=(), options=None):
+    '''
+    file_path 를 offset 까지 처리해서 output_path 에 저장했다고 기록합니다.
+    related: output_path 와 함께 저장한 다른 결과 파일들, options: 결과를 만든 출력 옵션 (JSON 으로 저장 가능한 값)
+    '''
+    stat = os.stat(file_path)
+    head_size = min(offset, HEAD_BYTES)
+    data = {
+        'log_path': os.path.abspath(file_path),
+        'dev': stat.st_dev,
+        'inode': stat.st_ino,
+        'offset': offset,
+        'head_size': head_size,
+        'head_sha256': _head_hash(file_path, head_size),
+        'output': _output_stamp(output_path),
+        'related': {path: _output_stamp(path) for path in related},
+        'options': options,
+    }
+    tmp_path = checkpoint_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    os.replace(tmp_path, checkpoint_path)
+
+
+def load_checkpoint_offset(checkpoint_path, file_path, output_path, related=(), options=None):
+    '''
+    체크포인트가 같은 파일과 같은 결과 JSON 을 가리키면 이어서 처리할 위치를, 아니면 0 을 돌려줍니다.
+    related / options 는 save_checkpoint 에 준 것과 같아야 함
+    '''
+    try:
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('output') != _output_stamp(output_path):
+            return 0    # 결과 JSON 이 없거나 체크포인트 이후에 바뀜
+        if data.get('options') != options:
+            return 0    # 다른 출력 옵션으로 만든 결과
+        if data.get('related', {}) != {path: _output_stamp(path) for path in related}:
+            return 0    # 함께 저장한 결과 파일이 없거나 바뀜
+    except (FileNotFoundError, json.JSONDecodeError):
+        return 0
+
+    stat = os.stat(file_path)
+    if (data.get('log_path') != os.path.abspath(file_path)
+            or data.get('dev') != stat.st_dev or data.get('inode') != stat.st_ino):
+        return 0    # 다른 파일 (교체된 로그)
+    offset = data.get('offset', 0)
+    if stat.st_size < offset:
+        return 0    # 파일이 잘림
+    if _head_hash(file_path, data.get('head_size', 0)) != data.get('head_sha256'):
+        return 0    # 앞부분 내용이 바뀜
+    return offset
+
+
+def iter_records_between(file_path, start, end):
+    '''
+    파일의 [start, end) 구간을 한 줄씩 읽어 (epoch, timestamp, message) 레코드를 생성합니다.
+    start, end 는 줄의 시작 위치여야 합니다.
+    '''
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            raw = f.readline(remaining)
+            if not raw:
+                break
+            remaining -= len(raw)
+            record = parse_log_line(raw.decode('utf-8'))
+            if record is not None:
+                yield record
@@ -0,0 +1,164 @@
+import os
+import io
+import gzip
+import lzma
+try:
+    import zstandard    # .zst 는 선택 사항 (pip install zstandard)
+except ImportError:
+    zstandard = None
+'''
+압축된 로그 파일(.log.gz, .log.xz, .log.zst) 읽기/쓰기
+
+보관(rotate)된 로그를 수동으로 풀지 않고 바로 처리하기 위해
+- 입력: 확장자 또는 파일 앞부분의 magic bytes 로 압축 형식을 알아내고 스트리밍으로 풀면서 읽음
+- 출력: 경로가 .gz/.xz/.zst 로 끝나면 압축하면서 저장
+- 용량 제한(MAX_MB)은 디스크 위 압축 파일 크기가 아니라 풀린 내용 기준으로 검사
+  (read_log_lines 는 제한 + 1 바이트까지만 풀어 보고 넘으면 LogSizeError,
+   open_log(max_bytes=...) 는 읽는 중에 제한을 넘는 순간 LogSizeError)
+
+gzip, xz 는 표준 라이브러리, zst 는 zstandard 패키지가 있을 때만 지원
+'''
+
+LOG_SUFFIXES = ('.log', '.log.gz', '.log.xz', '.log.zst')
+COMPRESSIONS = ('gz', 'xz', 'zst')
+_MAGIC = {
+    b'\x1f\x8b': 'gz',
+    b'\xfd7zXZ\x00': 'xz',
+    b'\x28\xb5\x2f\xfd': 'zst',
+}
+
+
+class LogSizeError(ValueError):
+    '''풀린 로그 내용이 용량 제한을 넘음'''
+
+
+def is_log_path(path):
+    '''.log 또는 압축된 .log.gz / .log.xz / .log.zst 파일 이름인지 확인합니다.'''
+    return path.endswith(LOG_SUFFIXES)
+
+
+def compression_of(path, sniff=True):
+    '''
+    파일의 압축 형식을 알아냅니다.
+
+    Returns:
+        str | None: 'gz', 'xz', 'zst' 또는 None (압축 안 됨)
+    '''
+    for name in COMPRESSIONS:
+        if path.endswith('.' + name):
+            return name
+    if sniff and os.path.isfile(path):
+        with open(path, 'rb') as f:
+            head = f.read(6)
+        for magic, name in _MAGIC.items():
+            if head.startswith(magic):
+                return name
+    return None
+
+
+def _require_zstandard():
+    if zstandard is None:
+        raise ValueError(".zst 파일을 처리하려면 zstandard 패키지가 필요합니다. (pip install zstandard)")
+
+
+class _SizeLimitedReader(io.RawIOBase):
+    # 읽은 (풀린) 바이트 수가 max_bytes 를 넘으면 LogSizeError
+    def __init__(self, raw, path, max_bytes):
+        self._raw = raw
+        self._path = path
+        self._remaining = max_bytes
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = self._raw.readinto(buffer)
+        self._remaining -= size
+        if self._remaining < 0:
+            raise LogSizeError(self._path)
+        return size
+
+    def close(self):
+        self._raw.close()
+        super().close()
+
+
+def open_log(path, mode='rt', encoding='utf-8', max_bytes=None):
+    '''
+    로그 파일을 엽니다. 압축된 파일이면 읽으면서 풀어 줌 (mode: 'rt' 또는 'rb')
+    max_bytes 를 주면 풀린 내용을 max_bytes 보다 많이 읽는 순간 LogSizeError
+    (압축 안 된 파일은 열 때 크기로 바로 판단)
+    '''
+    if max_bytes is not None:
+        if compression_of(path) is None and os.path.getsize(path) > max_bytes:
+            raise LogSizeError(path)
+        raw = io.BufferedReader(_SizeLimitedReader(open_log(path, 'rb'), path, max_bytes))
+        return io.TextIOWrapper(raw, encoding=encoding) if 't' in mode else raw
+    compression = compression_of(path)
+    text = 't' in mode
+    kwargs = {'encoding': encoding} if text else {}
+    if compression == 'gz':
+        return gzip.open(path, 'rt' if text else 'rb', **kwargs)
+    if compression == 'xz':
+        return lzma.open(path, 'rt' if text else 'rb', **kwargs)
+    if compression == 'zst':
+        _require_zstandard()
+        # 이어 붙인 압축본(open_output 의 'a' 모드)은 프레임이 여러 개이므로 끝까지 읽음
+        raw = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True, read_across_frames=True)
+        return io.TextIOWrapper(raw, **kwargs) if text else raw
+    return open(path, 'r' if text else 'rb', **kwargs)
+
+
+def open_output(path, mode='w', encoding='utf-8'):
+    '''
+    출력 파일을 엽니다. 경로가 .gz/.xz/.zst 로 끝나면 압축하면서 저장 (mode: 'w', 'wb', 'a', 'ab')
+    'a' 모드의 압축 파일은 기존 내용 뒤에 압축 멤버(프레임)를 하나 더 붙임 → 풀면 기존 내용 + 새 내용
+    '''
+    compression = compression_of(path, sniff=False)
+    binary = 'b' in mode
+    write = 'a' if 'a' in mode else 'w'
+    kwargs = {} if binary else {'encoding': encoding}
+    if compression == 'gz':
+        return gzip.open(path, write + ('b' if binary else 't'), **kwargs)
+    if compression == 'xz':
+        return lzma.open(path, write + ('b' if binary else 't'), **kwargs)
+    if compression == 'zst':
+        _require_zstandard()
+        raw = zstandard.ZstdCompressor().stream_writer(open(path, write + 'b'), closefd=True)
+        return raw if binary else io.TextIOWrapper(raw, **kwargs)
+    return open(path, write + ('b' if binary else ''), **kwargs)
+
+
+def read_log_lines(path, max_bytes=None):
+    '''
+    로그 파일 전체를 줄 목록으로 읽습니다. (readlines 와 같은 결과, 압축 파일도 가능)
+
+    Args:
+        path (str): 로그 파일 경로
+        max_bytes (int, optional): 풀린 내용의 최대 바이트 수
+
+    Raises:
+        LogSizeError: 풀린 내용이 max_bytes 를 넘음
+    '''
+    compression = compression_of(path)
+    if max_bytes is not None and compression is None and os.path.getsize(path) > max_bytes:
+        raise LogSizeError(path)    # 압축 안 된 파일은 읽기 전에 크기로 바로 판단
+    with open_log(path, 'rb') as f:
+        data = f.read() if max_bytes is None else _read_up_to(f, max_bytes + 1)
+    if max_bytes is not None and len(data) > max_bytes:
+        raise LogSizeError(path)
+    # newline=None: 텍스트 모드 open 처럼 \r\n, \r 도 \n 으로 바꿔서 줄을 나눔
+    return io.StringIO(data.decode('utf-8'), newline=None).readlines()
+
+
+def _read_up_to(f, size):
+    # 스트림에 따라 read(n) 이 n 보다 적게 돌려줄 수 있으므로 size 또는 끝까지 반복
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = f.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
@@ -0,0 +1,79 @@
+import sys
+import logging
+from collections import Counter
+'''
+로그 처리 진단 출력 (기본값: 조용히)
+
+줄마다 print 하면 큰 로그에서는 처리보다 터미널 출력이 더 오래 걸리므로
+- 줄 단위 출력 대신 건수만 세고 마지막에 한 줄로 요약 (읽은 줄, 이유별 건너뜀, 통과)
+- verbose 단계
+    0: 요약만 (기본값)
+    1: 건너뛴 줄을 이유별로 처음 SKIP_SAMPLE_LIMIT 개까지만 출력 (나머지는 건수만)
+    2: 전체 줄/리스트/딕셔너리 같은 디버깅용 덤프까지 출력
+- 출력은 logging 모듈(stderr)로 보내고 "key=value" 형식으로 남김
+
+사용 예
+    diag = LineDiagnostics('main_v02', verbose=1)
+    diag.read()
+    diag.skip('빈 줄', i, line)
+    diag.accept()
+    print(diag.summary())
+'''
+
+SKIP_SAMPLE_LIMIT = 5   # verbose=1 에서 이유별로 출력할 건너뛴 줄 수
+DUMP_PREVIEW = 2000     # verbose=2 덤프 한 번에 출력할 최대 글자 수 (0 이면 제한 없음)
+
+
+def get_logger(name, verbose=0):
+    '''verbose 단계에 맞춰 레벨을 정한 logger (처음 한 번만 stderr 핸들러를 붙임)'''
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter('%(levelname)s %(name)s %(message)s'))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(logging.DEBUG if verbose >= 2 else logging.INFO if verbose == 1 else logging.WARNING)
+    return logger
+
+
+class LineDiagnostics:
+    def __init__(self, name, verbose=0, sample_limit=SKIP_SAMPLE_LIMIT):
+        self.verbose = verbose
+        self.sample_limit = sample_limit
+        self.logger = get_logger(name, verbose)
+        self.lines_read = 0
+        self.accepted = 0
+        self.skipped = Counter()    # 이유 → 건수
+
+    def read(self, count=1):
+        self.lines_read += count
+
+    def accept(self, count=1):
+        self.accepted += count
+
+    def skip(self, reason, line_no=None, line=''):
+        '''건너뛴 줄을 세고, verbose 이면 이유별로 처음 몇 개만 출력합니다.'''
+        self.skipped[reason] += 1
+        if not self.verbose:
+            return
+        seen = self.skipped[reason]
+        if seen <= self.sample_limit:
+            self.logger.info('skip reason=%s line=%s text=%r', reason, line_no, line[:200])
+        elif seen == self.sample_limit + 1:
+            self.logger.info('skip reason=%s 이후 같은 이유는 출력 생략 (요약에 건수 표시)', reason)
+
+    def dump(self, title, obj):
+        '''verbose=2 일 때만 큰 객체를 출력합니다. (문자열 변환도 그때만 함)'''
+        if self.verbose < 2:
+            return
+        text = str(obj)
+        if DUMP_PREVIEW and len(text) > DUMP_PREVIEW:
+            text = f'{text[:DUMP_PREVIEW]} ... ({len(text)}자 중 {DUMP_PREVIEW}자만 출력)'
+        self.logger.debug('dump %s\n%s', title, text)
+
+    def summary(self):
+        '''읽은 줄 / 통과 / 이유별 건너뜀 요약 한 줄'''
+        skipped = ', '.join(f'{reason} {count}' for reason, count in self.skipped.most_common())
+        total = sum(self.skipped.values())
+        text = f'📊 읽은 줄 {self.lines_read} | 통과 {self.accepted} | 건너뜀 {total}'
+        return f'{text} ({skipped})' if skipped else text
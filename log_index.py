@@ -0,0 +1,642 @@
+import os
+import re
+import json
+import glob
+import mmap
+import heapq
+import shutil
+import secrets
+import struct
+import bisect
+import tempfile
+from array import array
+from itertools import accumulate, groupby, islice
+from log_stream import iter_json_entries, read_json_entries
+from log_timestamp import timestamp_to_epoch
+'''
+처리된 로그(mission_computer_main.jsonl)용 역색인(inverted index)
+
+검색할 때마다 json.load 로 전체 JSON 을 읽고 모든 message 를 훑는 대신
+처리 단계에서 "토큰 → 항목 번호 목록(posting list)" 색인을 만들어 JSONL 옆에 저장해 두고
+검색할 때는 posting list 끼리 교집합/합집합만 계산합니다.
+
+- 토큰 만들기
+    - 영어/숫자: 소문자로 바꾼 단어 단위 (oxygen, tank, 42)
+    - 한글: 띄어쓰기로 단어가 잘 나뉘지 않으므로 2글자씩 겹쳐 자른 n-gram
+      ("산소누출" → 산소, 소누, 누출), 한 글자 단어는 그대로
+- 항목 번호는 JSONL 에 저장된 순서, 항목마다 (JSONL 바이트 위치, epoch) 를 기록해 두고
+  검색 결과는 시간 역순(같은 시간은 번호 순)으로 정렬한 뒤 그 줄만 읽어서 timestamp, message 를 가져옴
+- 질의: 공백으로 나눈 단어는 AND, 대문자 OR 로 묶음을 나눔
+    "산소 누출"            → 산소 AND 누출
+    "oxygen OR 폭발"       → oxygen OR 폭발
+    "oxygen AND tank OR 고온" → (oxygen AND tank) OR 고온
+- 검색어 하나는 예전 검색과 같이 대소문자 구분 없는 부분 문자열 (단어 중간도 맞음: "ygen" → oxygen)
+  색인은 후보 항목을 좁히는 데만 쓰고, 후보의 message 를 읽어서 검색어.lower() in message.lower() 로 다시 확인
+    - 검색어 맨 앞의 영어/숫자 조각: 단어 중간일 수 있으므로 그 조각이 들어간 토큰 전체 (어휘 표를 훑음)
+    - 그 뒤의 영어/숫자 조각: 앞이 구분자이므로 메시지에서도 단어의 시작 → 접두어 검색
+    - 한글: 2글자 n-gram 모두 (한 글자면 그 글자가 들어간 토큰 전체)
+    - 토큰이 하나도 없는 검색어('#', '-' 같은 기호만)는 색인으로 좁힐 수 없으므로 전체 항목을 확인
+
+색인 전체를 메모리에 올리지 않도록 디스크에 정렬된 세그먼트 파일로 저장합니다. (log_stream 의 외부 병합 정렬과 같은 방식)
+- 만들 때: (토큰, 항목 번호) 쌍을 RUN_POSTINGS 개까지만 메모리에 모으고, 넘으면 토큰 순서로 정렬한 run 을
+  디스크에 내보냄 → 마지막에 run 들을 heapq.merge 로 한 줄씩 병합해서 세그먼트 하나로 저장
+- 세그먼트 파일: [posting (항목 번호 uint32)] [토큰 (UTF-8)] [어휘 표 (토큰 위치/길이, posting 위치/개수)] [꼬리]
+  검색할 때는 mmap 으로 열고 어휘 표를 bisect 로 찾아서 필요한 posting 만 읽음
+  (UTF-8 바이트 순서는 문자 순서와 같으므로 접두어 검색도 bisect 로 처리)
+- 항목 표 (mission_computer_main.index.docs.bin): 항목마다 (JSONL 바이트 위치, epoch) int64 두 개
+- 목록 (mission_computer_main.index.json): 버전, JSONL 크기/수정 시간, 항목 수, 세그먼트 파일 목록
+- 증분 처리(append=True)는 새 항목만으로 세그먼트를 하나 더 만들어 목록에 추가하고,
+  새 세그먼트가 바로 앞 세그먼트의 절반 이상이 되면 둘을 병합해서 세그먼트 수를 O(log n) 으로 유지
+
+목록에 JSONL 파일의 크기와 수정 시간을 함께 저장하고,
+JSONL 이 바뀌었으면 load_log_index 가 None 을 돌려주어 오래된 색인을 쓰지 않습니다.
+'''
+
+INDEX_VERSION = 2
+HANGUL_NGRAM = 2
+RUN_POSTINGS = 1000000  # 메모리에 모아 두는 (토큰, 항목 번호) 쌍의 최대 수 → 넘으면 run 으로 내보냄
+RUN_TERMS = 100000      # 메모리에 모아 두는 서로 다른 토큰의 최대 수
+MERGE_FAN_IN = 64       # 한 번에 병합하는 run 수
+ID_TYPE = 'I'           # 항목 번호 (부호 없는 32비트)
+SCAN_RATIO = 4          # 확인할 후보가 전체의 1/4 이상이면 JSONL 을 처음부터 한 번에 읽음
+SCAN_BLOCK = 20000      # 처음부터 읽을 때 한 번에 디코딩하는 JSONL 줄 수
+
+_FOOTER = struct.Struct('=4q')  # 버전, 토큰 수, 토큰 영역 위치, 어휘 표 위치
+_TERM = struct.Struct('=4q')    # 토큰 위치(토큰 영역 기준), 토큰 길이, posting 위치(파일 기준), posting 개수
+_DOC = struct.Struct('=2q')     # JSONL 바이트 위치, epoch
+_PREFIX_END = b'\xff'           # UTF-8 에 나오지 않는 바이트 → 접두어 범위의 끝
+
+# 한글 덩어리와 그 외 문자/숫자 덩어리를 따로 잘라냄 (밑줄은 구분자로 취급)
+_TOKEN_RE = re.compile(r'[가-힣]+|[^\W_가-힣]+')
+
+
+def _is_hangul(word):
+    return '가' <= word[0] <= '힣'
+
+
+def tokenize(text):
+    '''message 를 색인용 토큰 집합으로 변환합니다.'''
+    tokens = set()
+    for match in _TOKEN_RE.finditer(text.lower()):
+        word = match.group()
+        if _is_hangul(word) and len(word) > HANGUL_NGRAM:
+            for i in range(len(word) - HANGUL_NGRAM + 1):
+                tokens.add(word[i:i + HANGUL_NGRAM])
+        else:
+            tokens.add(word)
+    return tokens
+
+
+def index_path_for(json_path):
+    '''JSONL 경로 옆에 저장할 색인 목록 경로 (mission_computer_main.jsonl → mission_computer_main.index.json)'''
+    root, _ = os.path.splitext(json_path)
+    return root + '.index.json'
+
+
+def docs_path_for(json_path):
+    '''항목 표 경로 (mission_computer_main.jsonl → mission_computer_main.index.docs.bin)'''
+    root, _ = os.path.splitext(json_path)
+    return root + '.index.docs.bin'
+
+
+def _source_stamp(json_path):
+    stat = os.stat(json_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _read_manifest(json_path):
+    # 목록이 없거나, 형식이 다르거나, JSONL 이 색인을 만든 뒤 바뀌었으면 None
+    try:
+        with open(index_path_for(json_path), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != INDEX_VERSION or manifest.get('source') != _source_stamp(json_path):
+            return None
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    directory = os.path.dirname(os.path.abspath(json_path))
+    if not all(os.path.exists(os.path.join(directory, segment['file'])) for segment in manifest['segments']):
+        return None
+    return manifest
+
+
+def _write_manifest(json_path, manifest):
+    index_path = index_path_for(json_path)
+    head, name = os.path.split(index_path)
+    tmp_path = os.path.join(head, '.tmp.' + name)
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, index_path)
+    return index_path
+
+
+def _write_segment(path, terms):
+    '''
+    토큰 순서로 정렬된 (토큰 bytes, 항목 번호 array) 를 받아 세그먼트 파일 하나로 저장합니다.
+    posting 은 바로 파일에 쓰고, 토큰과 어휘 표는 임시 파일에 모았다가 뒤에 이어 붙임 (메모리에 모으지 않음)
+    '''
+    directory = os.path.dirname(os.path.abspath(path))
+    n_terms = 0
+    token_pos = 0
+    with open(path, 'wb') as f, tempfile.TemporaryFile(dir=directory) as tokens, \
+            tempfile.TemporaryFile(dir=directory) as vocabulary:
+        for token, ids in terms:
+            vocabulary.write(_TERM.pack(token_pos, len(token), f.tell(), len(ids)))
+            tokens.write(token)
+            token_pos += len(token)
+            ids.tofile(f)
+            n_terms += 1
+        tokens_offset = f.tell()
+        tokens.seek(0)
+        shutil.copyfileobj(tokens, f)
+        vocabulary_offset = f.tell()
+        vocabulary.seek(0)
+        shutil.copyfileobj(vocabulary, f)
+        f.write(_FOOTER.pack(INDEX_VERSION, n_terms, tokens_offset, vocabulary_offset))
+    return n_terms
+
+
+class _Segment:
+    '''mmap 으로 연 세그먼트 파일 (어휘 표를 bisect 로 찾고 필요한 posting 만 읽음)'''
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        version, self.n_terms, self._tokens_offset, self._vocabulary_offset = \
+            _FOOTER.unpack_from(self._mm, len(self._mm) - _FOOTER.size)
+        if version != INDEX_VERSION:
+            self._mm.close()
+            raise ValueError(f"색인 세그먼트 형식이 다릅니다: {path}")
+
+    def close(self):
+        self._mm.close()
+
+    def token(self, i):
+        start, length, _, _ = _TERM.unpack_from(self._mm, self._vocabulary_offset + i * _TERM.size)
+        start += self._tokens_offset
+        return self._mm[start:start + length]
+
+    def postings(self, i):
+        _, _, start, count = _TERM.unpack_from(self._mm, self._vocabulary_offset + i * _TERM.size)
+        ids = array(ID_TYPE)
+        ids.frombytes(self._mm[start:start + count * ids.itemsize])
+        return ids
+
+    def lookup(self, token):
+        '''토큰의 항목 번호 array, 없으면 빈 array'''
+        i = bisect.bisect_left(range(self.n_terms), token, key=self.token)
+        if i < self.n_terms and self.token(i) == token:
+            return self.postings(i)
+        return array(ID_TYPE)
+
+    def prefix_tokens(self, prefix):
+        lo = bisect.bisect_left(range(self.n_terms), prefix, key=self.token)
+        hi = bisect.bisect_left(range(self.n_terms), prefix + _PREFIX_END, key=self.token)
+        return [self.token(i) for i in range(lo, hi)]
+
+    def tokens(self):
+        return (self.token(i) for i in range(self.n_terms))
+
+    def terms(self):
+        '''(토큰, 항목 번호 array) 를 토큰 순서대로 생성'''
+        return ((self.token(i), self.postings(i)) for i in range(self.n_terms))
+
+
+def _tagged_terms(segment, order):
+    # 같은 토큰이면 앞 세그먼트(작은 항목 번호)가 먼저 나오도록 순서 번호를 붙임
+    for token, ids in segment.terms():
+        yield token, order, ids
+
+
+def _merge_terms(segments):
+    '''여러 세그먼트의 토큰을 한 줄씩 병합하고, 같은 토큰의 posting 은 세그먼트 순서대로 이어 붙임'''
+    merged = heapq.merge(*[_tagged_terms(segment, order) for order, segment in enumerate(segments)])
+    for token, group in groupby(merged, key=lambda item: item[0]):
+        ids = array(ID_TYPE)
+        for _, _, part in group:
+            ids.extend(part)
+        yield token, ids
+
+
+def _merge_segment_files(paths, path):
+    segments = [_Segment(p) for p in paths]
+    try:
+        _write_segment(path, _merge_terms(segments))
+    finally:
+        for segment in segments:
+            segment.close()
+
+
+def _new_segment_path(json_path, directory=None):
+    # mission_computer_main.index.<임의 16진수>.seg (이전 세그먼트와 이름이 겹치지 않게)
+    root, _ = os.path.splitext(os.path.basename(json_path))
+    directory = directory or os.path.dirname(os.path.abspath(json_path))
+    while True:
+        path = os.path.join(directory, f'{root}.index.{secrets.token_hex(6)}.seg')
+        if not os.path.exists(path):
+            return path
+
+
+class LogIndexWriter:
+    def __init__(self, json_path, append=False):
+        '''
+        JSONL 을 쓰면서 항목을 하나씩 받아 디스크에 색인을 만듭니다.
+
+        Args:
+            json_path (str): 색인할 JSONL 경로 (commit 할 때 이 파일이 다 써져 있어야 함)
+            append (bool): True 면 기존 색인에 새 항목을 이어서 추가 (증분 처리)
+                JSONL 에 새 항목을 추가하기 전에 만들어야 함
+
+        Raises:
+            ValueError: append 인데 기존 색인이 없거나 JSONL 과 맞지 않음
+        '''
+        self.json_path = json_path
+        self._directory = os.path.dirname(os.path.abspath(json_path))
+        self._base = _read_manifest(json_path) if append else None
+        if append and self._base is None:
+            raise ValueError("이어서 추가할 색인이 없거나 JSONL 과 맞지 않습니다.")
+        self._first_doc = self._base['docs'] if append else 0
+        self._doc_count = self._first_doc
+        self._buffer = {}       # 토큰 → 항목 번호 array (RUN_POSTINGS 쌍까지만)
+        self._pairs = 0
+        self._runs = []
+        self._run_dir = None
+        self._docs_path = docs_path_for(json_path)
+        if append:
+            # 지난번에 commit 하지 못한 항목이 남아 있을 수 있으므로 목록의 항목 수에 맞춰 자름
+            self._docs = open(self._docs_path, 'r+b')
+            self._docs.truncate(self._first_doc * _DOC.size)
+            self._docs.seek(0, os.SEEK_END)
+            self._docs_tmp = None
+        else:
+            head, name = os.path.split(self._docs_path)
+            self._docs_tmp = os.path.join(head, '.tmp.' + name)
+            self._docs = open(self._docs_tmp, 'wb')
+
+    def __len__(self):
+        return self._doc_count
+
+    def add(self, offset, epoch, message):
+        '''JSONL 의 offset 위치에 저장된 항목을 색인에 추가합니다. (저장 순서대로 호출)'''
+        doc_id = self._doc_count
+        self._doc_count += 1
+        self._docs.write(_DOC.pack(offset, epoch))
+        for token in tokenize(message):
+            posting = self._buffer.get(token)
+            if posting is None:
+                posting = self._buffer[token] = array(ID_TYPE)
+            posting.append(doc_id)
+            self._pairs += 1
+        if self._pairs >= RUN_POSTINGS or len(self._buffer) >= RUN_TERMS:
+            self._spill()
+
+    def add_record(self, offset, record):
+        '''결과를 저장하면서 호출: record = (epoch, timestamp, message, ...)'''
+        self.add(offset, record[0], record[2])
+
+    def _sorted_buffer(self):
+        return sorted((token.encode('utf-8'), ids) for token, ids in self._buffer.items())
+
+    def _spill(self):
+        if not self._buffer:
+            return
+        if self._run_dir is None:
+            self._run_dir = tempfile.mkdtemp(prefix='.tmp.index.', dir=self._directory)
+        path = _new_segment_path(self.json_path, self._run_dir)
+        _write_segment(path, self._sorted_buffer())
+        self._runs.append(path)
+        self._buffer = {}
+        self._pairs = 0
+
+    def _build_segment(self):
+        # 메모리에 남은 항목과 내보낸 run 들을 세그먼트 파일 하나로 만듦
+        path = _new_segment_path(self.json_path)
+        if not self._runs:
+            _write_segment(path, self._sorted_buffer())
+            self._buffer = {}
+            return path
+        self._spill()
+        runs = self._runs
+        while len(runs) > MERGE_FAN_IN:
+            merged = []
+            for i in range(0, len(runs), MERGE_FAN_IN):
+                group = runs[i:i + MERGE_FAN_IN]
+                if len(group) == 1:
+                    merged.append(group[0])
+                    continue
+                out = _new_segment_path(self.json_path, self._run_dir)
+                _merge_segment_files(group, out)
+                for run in group:
+                    os.remove(run)
+                merged.append(out)
+            runs = self._runs = merged
+        _merge_segment_files(runs, path)
+        return path
+
+    def commit(self):
+        '''
+        색인을 저장합니다. JSONL 파일을 다 쓴(교체한) 뒤에 호출해야 합니다.
+
+        Returns:
+            str: 색인 목록 경로
+        '''
+        new_docs = self._doc_count - self._first_doc
+        segments = list(self._base['segments']) if self._base else []
+        obsolete = []
+        path = self._build_segment() if new_docs or not segments else None
+        if path is not None:
+            segments.append({'file': os.path.basename(path), 'docs': new_docs})
+        self._docs.close()
+        if self._docs_tmp is not None:
+            os.replace(self._docs_tmp, self._docs_path)
+            self._docs_tmp = None
+            # 전체를 다시 만들었으면 이전 세그먼트는 모두 필요 없음 (목록에서 빠진 파일 포함)
+            root, _ = os.path.splitext(os.path.basename(self.json_path))
+            pattern = os.path.join(glob.escape(self._directory), glob.escape(root) + '.index.*.seg')
+            obsolete.extend(os.path.basename(old) for old in glob.glob(pattern))
+
+        # 새 세그먼트가 앞 세그먼트의 절반 이상이면 병합 (세그먼트 수 O(log n))
+        while len(segments) >= 2 and segments[-1]['docs'] * 2 >= segments[-2]['docs']:
+            last, prev = segments.pop(), segments.pop()
+            merged = _new_segment_path(self.json_path)
+            _merge_segment_files([os.path.join(self._directory, prev['file']),
+                                  os.path.join(self._directory, last['file'])], merged)
+            obsolete.extend([prev['file'], last['file']])
+            segments.append({'file': os.path.basename(merged), 'docs': prev['docs'] + last['docs']})
+
+        index_path = _write_manifest(self.json_path, {
+            'version': INDEX_VERSION,
+            'source': _source_stamp(self.json_path),
+            'docs': self._doc_count,
+            'segments': segments,
+        })
+        live = {segment['file'] for segment in segments}
+        for name in obsolete:
+            if name not in live:
+                _remove(os.path.join(self._directory, name))
+        self._cleanup_runs()
+        return index_path
+
+    def discard(self):
+        '''만들던 색인을 버립니다. (처리 중 오류)'''
+        if self._docs_tmp is None and not self._docs.closed:
+            self._docs.truncate(self._first_doc * _DOC.size)     # 이어 쓴 항목을 지움
+        self._docs.close()
+        if self._docs_tmp is not None:
+            _remove(self._docs_tmp)
+        self._cleanup_runs()
+
+    def _cleanup_runs(self):
+        if self._run_dir is not None:
+            shutil.rmtree(self._run_dir, ignore_errors=True)
+            self._run_dir = None
+        self._runs = []
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class LogIndex:
+    def __init__(self, json_path, manifest):
+        '''load_log_index 로 여는 디스크 색인 (세그먼트와 항목 표를 mmap 으로 읽음)'''
+        directory = os.path.dirname(os.path.abspath(json_path))
+        self.json_path = json_path
+        self._count = manifest['docs']
+        self._tokens = None
+        self.segments = []
+        try:
+            for segment in manifest['segments']:
+                self.segments.append(_Segment(os.path.join(directory, segment['file'])))
+            self._docs = None
+            if self._count:
+                with open(docs_path_for(json_path), 'rb') as f:
+                    self._docs = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if len(self._docs) < self._count * _DOC.size:
+                    raise ValueError("색인 항목 표가 목록보다 짧습니다.")
+        except Exception:
+            self.close()
+            raise
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        for segment in self.segments:
+            segment.close()
+        if getattr(self, '_docs', None) is not None:
+            self._docs.close()
+            self._docs = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _doc(self, doc_id):
+        # (JSONL 바이트 위치, epoch)
+        return _DOC.unpack_from(self._docs, doc_id * _DOC.size)
+
+    def _vocabulary(self):
+        # 어휘 표 전체 (토큰 문자열 → bytes), 부분 문자열 검색에서 처음 쓸 때 한 번만 읽음
+        if self._tokens is None:
+            tokens = set()
+            for segment in self.segments:
+                tokens.update(segment.tokens())
+            self._tokens = [(token.decode('utf-8'), token) for token in tokens]
+        return self._tokens
+
+    def _tokens_containing(self, fragment):
+        hangul = _is_hangul(fragment)
+        return [token for text, token in self._vocabulary() if fragment in text and _is_hangul(text) == hangul]
+
+    def _term_tokens(self, term):
+        '''
+        검색어 하나를 색인 토큰(bytes) 묶음 목록으로 변환합니다. (묶음 안은 OR, 묶음끼리는 AND)
+        검색어가 들어간 message 는 모든 묶음의 토큰을 하나 이상 가지므로 결과는 후보의 상위 집합
+        토큰이 없는 검색어(기호만)는 None (색인으로 좁힐 수 없음)
+        '''
+        groups = []
+        for match in _TOKEN_RE.finditer(term.lower()):
+            word = match.group()
+            if _is_hangul(word):
+                if len(word) >= HANGUL_NGRAM:
+                    groups.extend([word[i:i + HANGUL_NGRAM].encode('utf-8')]
+                                  for i in range(len(word) - HANGUL_NGRAM + 1))
+                else:
+                    groups.append(self._tokens_containing(word))
+            elif match.start() > 0:
+                groups.append(self._prefix_tokens(word.encode('utf-8')))
+            else:
+                groups.append(self._tokens_containing(word))
+        return groups or None
+
+    def _prefix_tokens(self, prefix):
+        tokens = set()
+        for segment in self.segments:
+            tokens.update(token for token in segment.prefix_tokens(prefix)
+                          if not _is_hangul(token.decode('utf-8')))
+        return tokens
+
+    def _postings(self, token):
+        ids = set()
+        for segment in self.segments:
+            ids.update(segment.lookup(token))
+        return ids
+
+    def _term_ids(self, term):
+        # 검색어 하나의 후보 항목 번호, 색인으로 좁힐 수 없으면 None
+        groups = self._term_tokens(term)
+        if groups is None:
+            return None
+        result = None
+        # posting list 가 짧은 토큰부터 교집합을 구해서 중간 결과를 작게 유지
+        candidates = []
+        for tokens in groups:
+            ids = set()
+            for token in tokens:
+                ids.update(self._postings(token))
+            candidates.append(ids)
+        for ids in sorted(candidates, key=len):
+            result = ids if result is None else result & ids
+            if not result:
+                break
+        return result
+
+    def _entries(self, json_path, doc_ids=None):
+        # (항목 번호, (timestamp, message)) 를 파일 위치 순서로 생성 (doc_ids 가 None 이면 전체)
+        if doc_ids is None or len(doc_ids) * SCAN_RATIO >= self._count:
+            # 후보가 많으면 줄마다 찾아가지 않고 파일을 처음부터 한 번 읽음
+            table = array('q')
+            if self._count:
+                table.frombytes(self._docs[:self._count * _DOC.size])
+            by_offset = dict(zip(table[0::2], range(self._count)))
+            for pos, timestamp, message in _scan_entries(json_path):
+                doc_id = by_offset.get(pos)
+                if doc_id is not None and (doc_ids is None or doc_id in doc_ids):
+                    yield doc_id, (timestamp, message)
+            return
+        doc_ids = sorted(doc_ids, key=lambda doc_id: self._doc(doc_id)[0])
+        yield from zip(doc_ids, read_json_entries(json_path, [self._doc(doc_id)[0] for doc_id in doc_ids]))
+
+    def _matches(self, json_path, text):
+        # 질의에 맞는 {항목 번호: (timestamp, message)} (후보를 색인으로 좁힌 뒤 부분 문자열로 확인)
+        clauses = [[t.lower() for t in clause.split() if t != 'AND'] for clause in re.split(r'\s+OR\s+', text.strip())]
+        clauses = [terms for terms in clauses if terms]
+        if not clauses:
+            # 빈 검색어는 예전 검색('' in message)과 같이 전체
+            return dict(self._entries(json_path))
+
+        candidates = set()
+        for terms in clauses:
+            clause_ids = None
+            for term in terms:
+                ids = self._term_ids(term)
+                if ids is None:
+                    continue
+                clause_ids = ids if clause_ids is None else clause_ids & ids
+                if not clause_ids:
+                    break
+            if clause_ids is None:
+                candidates = None   # 색인으로 좁힐 수 없는 묶음 → 전체 항목을 확인
+                break
+            candidates |= clause_ids
+
+        if len(clauses) == 1 and len(clauses[0]) == 1:
+            term = clauses[0][0]
+            return {doc_id: entry for doc_id, entry in self._entries(json_path, candidates)
+                    if term in entry[1].lower()}
+        return {doc_id: entry for doc_id, entry in self._entries(json_path, candidates)
+                if any(all(term in entry[1].lower() for term in terms) for terms in clauses)}
+
+    def _time_order(self, doc_ids):
+        return sorted(doc_ids, key=lambda doc_id: (-self._doc(doc_id)[1], doc_id))
+
+    def query(self, text):
+        '''
+        질의를 처리하여 맞는 항목 번호를 시간 역순으로 돌려줍니다. (같은 시간은 로그 순서)
+
+        Args:
+            text (str): 검색어 (공백 = AND, 대문자 AND/OR 연산자 사용 가능, 검색어마다 부분 문자열)
+
+        Returns:
+            list: 항목 번호 목록
+        '''
+        return self._time_order(self._matches(self.json_path, text))
+
+    def fetch(self, json_path, doc_ids):
+        '''항목 번호에 해당하는 (timestamp, message) 를 JSONL 에서 그 줄만 읽어서 돌려줍니다.'''
+        return read_json_entries(json_path, [self._doc(doc_id)[0] for doc_id in doc_ids])
+
+    def search(self, json_path, text):
+        '''query + fetch: 검색어에 맞는 (timestamp, message) 목록 (확인할 때 읽은 줄을 그대로 사용)'''
+        matched = self._matches(json_path, text)
+        return [matched[doc_id] for doc_id in self._time_order(matched)]
+
+
+def _scan_entries(json_path):
+    '''
+    (바이트 위치, timestamp, message) 를 파일 순서대로 생성합니다.
+    JSON Lines 는 SCAN_BLOCK 줄씩 배열 하나로 묶어 json.loads 를 한 번만 부름 (줄마다 부르는 것보다 훨씬 빠름)
+    '''
+    with open(json_path, 'rb') as f:
+        first = f.readline()
+    try:
+        jsonl = isinstance(json.loads(first).get('message'), str)
+    except (ValueError, AttributeError):
+        jsonl = False
+    if not jsonl:
+        # json.dump(..., indent=4) / compact JSON
+        yield from iter_json_entries(json_path)
+        return
+
+    with open(json_path, 'rb') as f:
+        pos = 0
+        while True:
+            lines = list(islice(f, SCAN_BLOCK))
+            if not lines:
+                break
+            offsets = list(accumulate(map(len, lines), initial=pos))
+            pos = offsets.pop()
+            rows = [(offset, raw) for offset, raw in zip(offsets, lines) if raw.strip()]
+            records = json.loads(b'[' + b','.join(raw for _, raw in rows) + b']')
+            for (offset, _), record in zip(rows, records):
+                yield offset, record['timestamp'], record['message']
+
+
+def build_log_index(json_path):
+    '''
+    저장된 JSONL (또는 json.dump(..., indent=4) 형식의 JSON) 을 한 줄씩 읽어 색인을 만들고 저장한 뒤 열어서 돌려줍니다.
+    (항목이 한 줄에 하나씩 있는 형식이면 전체를 json.load 하지 않아도 됨)
+    '''
+    writer = LogIndexWriter(json_path)
+    try:
+        for offset, timestamp, message in iter_json_entries(json_path):
+            epoch = timestamp_to_epoch(timestamp)
+            if epoch is not None:
+                writer.add(offset, epoch, message)
+        writer.commit()
+    except BaseException:
+        writer.discard()
+        raise
+    return load_log_index(json_path)
+
+
+def load_log_index(json_path):
+    '''
+    저장된 색인을 엽니다.
+
+    Returns:
+        LogIndex | None: 색인이 없거나 JSONL 이 색인을 만든 뒤 바뀌었으면 None
+    '''
+    manifest = _read_manifest(json_path)
+    if manifest is None:
+        return None
+    try:
+        return LogIndex(json_path, manifest)
+    except (FileNotFoundError, ValueError):
+        return None
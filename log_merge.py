@@ -0,0 +1,79 @@
+import os
+import glob
+import json
+import heapq
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from log_stream import iter_log_records, sort_records_external
+from log_compress import LOG_SUFFIXES
+'''
+여러 로그 파일을 시간 순서 하나로 병합하는 모듈
+
+미션 컴퓨터마다 같은 timestamp,event,message 형식의 *.log 를 따로 쓰므로 (보관된 압축 로그도 함께)
+1. 디렉터리/glob 패턴으로 파일 목록을 만들고 (expand_log_sources)
+2. 파일마다 따로 외부 병합 정렬해서 정렬된 run 파일 하나로 저장
+   (workers 를 주면 ProcessPoolExecutor 로 파일들을 동시에 처리)
+3. 파일별 run 을 heapq.merge 로 k-way 병합 → 한 줄씩 읽으면서 내보냄
+파일들을 이어 붙여서 메모리에서 다시 정렬하지 않으므로 메모리에는 파일마다 한 줄씩만 올라감
+
+병합된 레코드: (epoch, timestamp, message, event, source)
+- source 는 원본 로그 파일 경로
+- 같은 시간이면 파일 목록 순서, 같은 파일 안에서는 원래 줄 순서를 유지
+'''
+
+
+def expand_log_sources(spec):
+    '''
+    디렉터리, glob 패턴 또는 파일 경로를 로그 파일 목록(정렬된 순서)으로 바꿉니다.
+
+    Args:
+        spec (str): 'logs/' (안의 *.log, *.log.gz, *.log.xz, *.log.zst 전체), 'logs/*.log', 'a.log'
+
+    Returns:
+        list: 로그 파일 경로 목록 (없으면 빈 리스트)
+    '''
+    if os.path.isdir(spec):
+        return sorted(path for suffix in LOG_SUFFIXES for path in glob.glob(os.path.join(spec, '*' + suffix)))
+    if glob.has_magic(spec):
+        return sorted(path for path in glob.glob(spec) if os.path.isfile(path))
+    return [spec] if os.path.isfile(spec) else []
+
+
+def _sort_file_to_run(file_path, run_dir):
+    # 파일 하나를 시간 역순으로 정렬해서 run 파일 하나로 저장 (워커 프로세스에서도 실행)
+    fd, run_path = tempfile.mkstemp(suffix='.run', dir=run_dir)
+    with os.fdopen(fd, 'w', encoding='utf-8') as run_file:
+        for record in sort_records_external(iter_log_records(file_path), tmp_dir=run_dir):
+            run_file.write(json.dumps(record, ensure_ascii=False))
+            run_file.write('\n')
+    return run_path
+
+
+def _read_tagged_run(run_path, source):
+    with open(run_path, 'r', encoding='utf-8') as run_file:
+        for line in run_file:
+            epoch, timestamp, message, event = json.loads(line)
+            yield epoch, timestamp, message, event, source
+
+
+def merged_sorted_records(file_paths, workers=None, tmp_dir=None):
+    '''
+    여러 로그 파일을 시간 역순으로 병합한 레코드를 하나씩 돌려줍니다.
+
+    Args:
+        file_paths (list): 로그 파일 경로 목록 (같은 시간이면 이 순서대로)
+        workers (int, optional): 파일별 정렬을 동시에 처리할 프로세스 수
+        tmp_dir (str, optional): run 파일을 저장할 임시 디렉터리의 상위 경로
+
+    Returns:
+        generator: (epoch, timestamp, message, event, source) 튜플
+    '''
+    with tempfile.TemporaryDirectory(prefix='log_merge_', dir=tmp_dir) as run_dir:
+        if workers and workers > 1 and len(file_paths) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(file_paths))) as pool:
+                run_paths = list(pool.map(_sort_file_to_run, file_paths, [run_dir] * len(file_paths)))
+        else:
+            run_paths = [_sort_file_to_run(path, run_dir) for path in file_paths]
+
+        streams = [_read_tagged_run(run_path, path) for run_path, path in zip(run_paths, file_paths)]
+        yield from heapq.merge(*streams, key=lambda record: record[0], reverse=True)
@@ -0,0 +1,88 @@
+import os
+import mmap
+from log_timestamp import TIMESTAMP_LENGTH, timestamp_bytes_to_epoch
+'''
+mmap 기반 로그 리더 (main_v01.read_log_file + parse_log_lines 대체용)
+
+open(..., encoding='utf-8') 로 읽으면 timestamp 가 유효한지 알기도 전에
+모든 줄을 str 로 디코딩하고 리스트에 담습니다.
+이 모듈은 파일을 mmap 으로 메모리에 매핑하고
+- 줄바꿈 위치에 맞춘 블록(BLOCK_SIZE) 단위로 잘라서 bytes.split(b'\n') 으로 줄을 나누고
+- 줄마다 bytes.strip / partition(b',') 으로 timestamp 와 나머지를 나눠 19바이트 timestamp 를 검사한 뒤
+- 검사를 통과한 줄의 message 부분만 디코딩합니다.
+줄 나누기와 공백 제거가 모두 bytes 메서드(C 구현)라서 바이트마다 파이썬 루프를 돌지 않고,
+한 번에 블록 하나만 복사하므로 큰 파일에서도 메모리 사용량이 블록 크기로 일정합니다.
+'''
+
+BLOCK_SIZE = 8 * 1024 * 1024    # 한 번에 잘라서 처리하는 바이트 수 (줄 중간에서 자르지 않음)
+
+
+def _iter_line_blocks(mm, size):
+    # 마지막 줄바꿈까지 끊은 블록을 차례로 돌려줌 (블록보다 긴 줄은 그 줄 끝까지 한 블록)
+    pos = 0
+    while pos < size:
+        block_end = pos + BLOCK_SIZE
+        if block_end < size:
+            newline = mm.rfind(b'\n', pos, block_end)
+            if newline < 0:
+                newline = mm.find(b'\n', block_end)
+            block_end = size if newline < 0 else newline + 1
+        else:
+            block_end = size
+        yield mm[pos:block_end]
+        pos = block_end
+
+
+def iter_mmap_records(filename, skip_event=False):
+    '''
+    로그 파일을 mmap 으로 읽어 timestamp 가 유효한 줄의 (epoch, timestamp, message) 를 생성합니다.
+
+    Args:
+        filename (str): 로그 파일 경로
+        skip_event (bool): True 면 message 에서 event 필드를 빼고 (split(',', 2)[2] 와 같음),
+            False 면 첫 번째 쉼표 뒤 전체를 message 로 사용 (split(',', 1)[1] 와 같음)
+    '''
+    with open(filename, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return      # 빈 파일은 mmap 할 수 없음
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for block in _iter_line_blocks(mm, size):
+                for line in block.split(b'\n'):
+                    # 줄 앞뒤 공백 제거 후 첫 쉼표 앞이 정확히 timestamp 19바이트(+ 공백)여야 함
+                    head, comma, message = line.strip().partition(b',')
+                    if not comma:
+                        continue
+                    head = head.rstrip()
+                    if len(head) != TIMESTAMP_LENGTH:
+                        continue
+                    epoch = timestamp_bytes_to_epoch(head)
+                    if epoch is None:
+                        continue
+                    if skip_event:
+                        _, comma, message = message.partition(b',')
+                        if not comma:
+                            continue
+                    # 유효한 줄만 디코딩 (timestamp 는 ASCII 19바이트)
+                    yield epoch, head.decode('ascii'), message.lstrip().decode('utf-8')
+
+
+def read_log_file_mmap(filename):
+    '''
+    main_v01.read_log_file + parse_log_lines 를 한 번에 처리하는 mmap 버전입니다.
+
+    Returns:
+        list: [timestamp, message] 리스트 (parse_log_lines 와 같은 모양)
+              timestamp 형식이 맞지 않는 줄(헤더 포함)은 제외됩니다.
+    '''
+    try:
+        parsed_list = [[timestamp, message] for _, timestamp, message in iter_mmap_records(filename)]
+        print(f"✅ '{filename}' 파일을 성공적으로 읽었습니다.")
+        return parsed_list
+    except FileNotFoundError:
+        print(f"❌ 오류: '{filename}' 파일이 존재하지 않습니다.")
+    except UnicodeDecodeError:
+        print(f"❌ 오류: 파일 디코딩 중 문제가 발생했습니다 (UTF-8 인코딩 문제).")
+    except Exception as e:
+        print(f"❌ 알 수 없는 오류 발생: {e}")
+    return []
@@ -0,0 +1,109 @@
+import os
+import json
+import heapq
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from log_stream import sort_records_external
+from log_checkpoint import iter_records_between
+from keyword_matcher import KeywordMatcher
+'''
+로그 파일을 여러 프로세스로 나누어 파싱하는 모듈
+
+1. 파일을 줄바꿈 위치에 맞춘 바이트 구간(start, end)으로 나눔
+   - 구간 경계가 항상 줄의 시작이므로 한 줄이 두 구간에 걸치지 않음
+2. 구간마다 ProcessPoolExecutor 워커가
+   - 구간을 한 줄씩 읽으면서 (구간 전체를 한 번에 읽지 않음) strip, split(',', 2), timestamp 검사를 하고
+   - 외부 병합 정렬(log_stream.sort_records_external)로 시간 역순으로 정렬하면서
+     위험 키워드 검사 결과와 함께 정렬된 run 파일 하나로 저장한 뒤 경로만 돌려줌
+3. 부모 프로세스는 run 파일들을 heapq.merge 로 한 줄씩 읽으면서 병합
+   - run 을 파일 순서대로 넘기므로 같은 시간 안에서는 원래 줄 순서가 유지됨
+워커는 run 하나 크기(RUN_SIZE), 부모는 run 마다 한 줄만 메모리에 올리므로
+파일 크기와 관계없이 메모리 사용량이 일정함
+
+파싱은 CPU 작업이라 스레드가 아닌 프로세스를 사용 (GIL 영향을 받지 않음)
+'''
+
+CHUNKS_PER_WORKER = 4   # 워커마다 여러 구간을 맡겨서 구간별 처리 시간 차이를 줄임
+
+
+def split_byte_ranges(file_path, n_ranges):
+    '''
+    파일을 줄바꿈 위치에 맞춘 바이트 구간 목록으로 나눕니다.
+
+    Args:
+        file_path (str): 로그 파일 경로
+        n_ranges (int): 나눌 구간 수 (파일이 작으면 더 적게 나뉠 수 있음)
+
+    Returns:
+        list: (start, end) 튜플 리스트, end 는 포함하지 않음
+    '''
+    size = os.path.getsize(file_path)
+    n_ranges = max(1, n_ranges)
+    bounds = [0]
+    with open(file_path, 'rb') as f:
+        for i in range(1, n_ranges):
+            pos = size * i // n_ranges
+            if pos <= bounds[-1]:
+                continue
+            f.seek(pos - 1)
+            f.readline()    # pos 가 줄 중간이면 그 줄 끝까지 건너뜀
+            boundary = f.tell()
+            if bounds[-1] < boundary < size:
+                bounds.append(boundary)
+    bounds.append(size)
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1) if bounds[i] < bounds[i + 1]]
+
+
+def sort_byte_range_to_run(file_path, start, end, run_dir, danger_keyword=()):
+    '''
+    파일의 [start, end) 구간을 파싱하고 시간 역순으로 정렬해서 run 파일로 저장합니다. (워커에서 실행)
+
+    Returns:
+        str: run 파일 경로 (한 줄에 [epoch, timestamp, message, event, 위험 키워드 번호 목록] JSON 하나)
+    '''
+    matcher = KeywordMatcher(danger_keyword)    # 구간마다 한 번만 만듦
+    fd, run_path = tempfile.mkstemp(suffix='.run', dir=run_dir)
+    with os.fdopen(fd, 'w', encoding='utf-8') as run_file:
+        # sort_records_external 은 안정 정렬이므로 같은 시간 안에서는 줄 순서가 유지됨
+        records = sort_records_external(iter_records_between(file_path, start, end), tmp_dir=run_dir)
+        for epoch, timestamp, message, event in records:
+            row = [epoch, timestamp, message, event, matcher.find_indices(message)]
+            run_file.write(json.dumps(row, ensure_ascii=False))
+            run_file.write('\n')
+    return run_path
+
+
+def _read_hits_run(run_path):
+    with open(run_path, 'r', encoding='utf-8') as run_file:
+        for line in run_file:
+            epoch, timestamp, message, event, hits = json.loads(line)
+            yield epoch, timestamp, message, event, None, tuple(hits)
+
+
+def parallel_sorted_records(file_path, workers, danger_keyword=(), tmp_dir=None):
+    '''
+    로그 파일을 워커 프로세스들로 나누어 파싱하고 시간 역순으로 병합한 레코드를 돌려줍니다.
+
+    같은 timestamp 의 레코드도 모두 남기고 원래 줄 순서를 유지합니다.
+
+    Args:
+        file_path (str): 로그 파일 경로
+        workers (int): 워커 프로세스 수
+        danger_keyword (list): 워커에서 함께 검사할 위험 키워드
+        tmp_dir (str, optional): run 파일을 저장할 임시 디렉터리의 상위 경로
+
+    Returns:
+        generator: (epoch, timestamp, message, event, None, 위험 키워드 번호 튜플) 튜플
+            다섯 번째 칸은 레코드 공통 형식의 source 자리 (파일 하나를 처리하므로 None)
+    '''
+    ranges = split_byte_ranges(file_path, workers * CHUNKS_PER_WORKER)
+    keywords = list(danger_keyword)
+
+    with tempfile.TemporaryDirectory(prefix='log_parallel_', dir=tmp_dir) as run_dir:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(sort_byte_range_to_run, file_path, start, end, run_dir, keywords)
+                       for start, end in ranges]
+            run_paths = [future.result() for future in futures]     # 파일 순서대로 run 경로만 모음
+
+        yield from heapq.merge(*[_read_hits_run(path) for path in run_paths],
+                               key=lambda record: record[0], reverse=True)
@@ -0,0 +1,172 @@
+import io
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from log_compress import open_log
+from log_stream import parse_log_line, sort_records_external
+'''
+읽기 / 파싱 / 쓰기를 겹쳐서 실행하는 파이프라인
+
+순서대로 처리하면 CPU 가 파싱하는 동안 디스크가 놀고, 디스크를 읽는 동안 CPU 가 놀기 때문에
+단계마다 스레드를 따로 두고 크기가 정해진 큐로 이어 붙입니다.
+
+    [읽기 스레드]  파일(압축이면 풀면서)을 BLOCK_SIZE 바이트 블록으로 읽음 (줄 경계에서 자름)
+         │  queue(QUEUE_DEPTH)
+    [정렬 스레드]  블록을 파싱 (workers 를 주면 프로세스들이 동시에 파싱) → 외부 병합 정렬 → 병합
+         │  queue(QUEUE_DEPTH)
+    [호출한 스레드] 정렬된 레코드를 받아 JSON / JSONL / 보고서 / 색인을 저장
+
+- 큐가 가득 차면 앞 단계가 기다리므로(backpressure) 메모리 사용량은 큐 크기로 제한됨
+- 파일 읽기, 압축 풀기, 파일 쓰기는 GIL 을 놓으므로 파싱과 실제로 겹쳐서 실행됨
+- 정렬은 모든 입력을 받아야 끝나므로 "읽기 ↔ 파싱" 과 "병합 ↔ 쓰기" 가 각각 겹침
+- 뒤 단계에서 오류가 나거나 중간에 멈추면 앞 단계 스레드도 멈추고, 앞 단계의 오류는 뒤 단계에서 다시 발생
+'''
+
+BLOCK_SIZE = 1 << 20    # 읽기 스레드가 한 번에 읽는 바이트 수
+QUEUE_DEPTH = 8         # 단계 사이 큐에 쌓아 둘 수 있는 블록/묶음 수
+RECORD_BATCH = 10000    # 정렬 스레드 → 쓰기 단계로 한 번에 넘기는 레코드 수
+_PUT_TIMEOUT = 0.1      # 뒤 단계가 멈췄는지 확인하는 간격(초)
+_DONE = object()
+
+
+class _Failure:
+    __slots__ = ('error',)
+
+    def __init__(self, error):
+        self.error = error
+
+
+def threaded_batches(iterable, depth=QUEUE_DEPTH, batch_size=1, name='pipeline'):
+    '''
+    iterable 을 별도 스레드에서 훑으면서 batch_size 개씩 묶어 크기 depth 의 큐로 넘기고,
+    받는 쪽에서는 묶음(list)을 하나씩 돌려줍니다.
+
+    Args:
+        iterable (iterable): 앞 단계 (이 스레드만 훑음)
+        depth (int): 큐에 쌓아 둘 수 있는 묶음 수 (가득 차면 앞 단계가 기다림)
+        batch_size (int): 한 묶음의 항목 수 (항목마다 큐를 거치지 않도록)
+        name (str): 스레드 이름
+
+    Returns:
+        generator: 항목 리스트
+    '''
+    pipe = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item):
+        # 받는 쪽이 멈췄으면 False (큐가 가득 찬 채로 영원히 기다리지 않음)
+        while not stop.is_set():
+            try:
+                pipe.put(item, timeout=_PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            batch = []
+            for item in iterable:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    if not put(batch):
+                        return
+                    batch = []
+            if batch and not put(batch):
+                return
+            put(_DONE)
+        except BaseException as e:
+            put(_Failure(e))
+        finally:
+            close = getattr(iterable, 'close', None)
+            if close is not None:
+                close()     # 제너레이터가 만든 임시 파일 정리
+
+    thread = threading.Thread(target=produce, name=name, daemon=True)
+    thread.start()
+    try:
+        while True:
+            batch = pipe.get()
+            if batch is _DONE:
+                return
+            if isinstance(batch, _Failure):
+                raise batch.error
+            yield batch
+    finally:
+        stop.set()
+        thread.join()
+
+
+def threaded_iter(iterable, depth=QUEUE_DEPTH, batch_size=RECORD_BATCH, name='pipeline'):
+    '''threaded_batches 와 같지만 묶음을 풀어서 항목을 하나씩 돌려줍니다.'''
+    for batch in threaded_batches(iterable, depth, batch_size, name):
+        yield from batch
+
+
+def iter_line_blocks(file_path, block_size=BLOCK_SIZE):
+    '''
+    로그 파일을 block_size 바이트 정도의 블록으로 읽습니다. 블록은 항상 줄 끝(\\n)에서 끝나므로
+    한 줄이 두 블록에 걸치지 않음 (UTF-8 의 여러 바이트 문자에는 \\n 바이트가 없으므로 안전)
+    '''
+    with open_log(file_path, 'rb') as f:
+        rest = b''
+        while True:
+            data = f.read(block_size)
+            if not data:
+                break
+            data = rest + data
+            cut = data.rfind(b'\n') + 1
+            if cut == 0:
+                rest = data     # 아주 긴 줄: 줄 끝이 나올 때까지 이어 붙임
+                continue
+            rest = data[cut:]
+            yield data[:cut]
+        if rest:
+            yield rest
+
+
+def parse_block(block):
+    '''
+    블록 하나를 (epoch, timestamp, message, event) 레코드 리스트로 변환합니다. (워커 프로세스에서도 실행)
+    텍스트 모드로 파일을 읽을 때처럼 \\r\\n, \\r 도 줄바꿈으로 처리
+    '''
+    records = []
+    for line in io.StringIO(block.decode('utf-8'), newline=None):
+        record = parse_log_line(line)
+        if record is not None:
+            records.append(record)
+    return records
+
+
+def pipelined_records(file_path, workers=None):
+    '''
+    읽기 스레드가 읽은 블록을 파싱해서 레코드를 파일 순서대로 생성합니다.
+    workers 가 2 이상이면 블록을 프로세스들에 나누어 파싱 (동시에 처리 중인 블록 수도 제한)
+    '''
+    blocks = (batch[0] for batch in threaded_batches(iter_line_blocks(file_path), name='log-reader'))
+    if not workers or workers < 2:
+        for block in blocks:
+            yield from parse_block(block)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for block in blocks:
+            pending.append(pool.submit(parse_block, block))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()   # 블록 순서대로 꺼내므로 줄 순서 유지
+        while pending:
+            yield from pending.popleft().result()
+
+
+def pipelined_sorted_records(file_path, workers=None, tmp_dir=None):
+    '''
+    파이프라인으로 읽고 파싱한 레코드를 외부 병합 정렬해서 시간 역순으로 하나씩 돌려줍니다.
+    정렬/병합은 별도 스레드에서 실행되므로 호출한 쪽은 받은 레코드를 저장하는 일만 하면 됨
+
+    Returns:
+        generator: (epoch, timestamp, message, event) 튜플 (log_stream.sort_records_external 과 같은 순서)
+    '''
+    records = sort_records_external(pipelined_records(file_path, workers), tmp_dir=tmp_dir)
+    return threaded_iter(records, name='log-sorter')
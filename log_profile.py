@@ -0,0 +1,126 @@
+import json
+import time
+import cProfile
+import tracemalloc
+from contextlib import contextmanager
+'''
+로그 처리 단계별 시간/메모리 측정
+
+읽기, 파싱, 정렬, JSON 저장, 보고서, 검색 중 어디서 시간이 걸리는지 보기 위해
+단계마다 다음을 기록합니다.
+- wall: 실제 경과 시간 (time.perf_counter)
+- cpu: 이 프로세스가 CPU 를 쓴 시간 (time.process_time) - wall 보다 훨씬 작으면 I/O 나 입력 대기
+- records_in / records_out: 단계에 들어간/나온 레코드 수 (알 수 있는 경우만)
+- peak_kb: 단계 중 tracemalloc 으로 잰 최대 메모리 사용량
+
+enabled=False 이면 stage() 는 아무것도 재지 않으므로 평소 실행에는 비용이 거의 없음
+tracemalloc 은 켜 두면 메모리 할당마다 기록하므로 처리 자체가 느려짐 (시간은 상대 비교용)
+
+사용 예
+    profiler = StageProfiler(enabled=True)
+    with profiler.stage('parse', records_in=len(lines)) as stage:
+        ...
+        stage.records_out = len(log_list)
+    profiler.begin('sort', records_in=len(log_list))     # with 블록으로 감싸기 어려운 코드
+    ...
+    profiler.end(records_out=len(sorted_list))
+    print(profiler.format_table())
+'''
+
+
+class StageStats:
+    __slots__ = ('name', 'wall', 'cpu', 'records_in', 'records_out', 'peak_kb')
+
+    def __init__(self, name, records_in=None):
+        self.name = name
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.records_in = records_in
+        self.records_out = None
+        self.peak_kb = None
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class StageProfiler:
+    def __init__(self, enabled=False, trace_memory=True):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.stages = []
+        self._current = None
+        self._wall_start = self._cpu_start = 0.0
+        self._started_tracemalloc = False
+
+    def begin(self, name, records_in=None):
+        '''단계 측정을 시작합니다. end() 를 부를 때까지가 한 단계 (단계는 겹치지 않게 순서대로 사용)'''
+        stats = StageStats(name, records_in)
+        self._current = stats
+        if not self.enabled:
+            return stats
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            tracemalloc.reset_peak()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        return stats
+
+    def end(self, records_out=None):
+        '''begin() 으로 시작한 단계를 끝내고 결과를 기록합니다.'''
+        stats, self._current = self._current, None
+        if stats is None or not self.enabled:
+            return stats
+        stats.wall = time.perf_counter() - self._wall_start
+        stats.cpu = time.process_time() - self._cpu_start
+        if records_out is not None:
+            stats.records_out = records_out
+        if self.trace_memory:
+            stats.peak_kb = tracemalloc.get_traced_memory()[1] // 1024
+        self.stages.append(stats)
+        return stats
+
+    @contextmanager
+    def stage(self, name, records_in=None):
+        '''with 블록 하나를 단계 하나로 측정합니다.'''
+        stats = self.begin(name, records_in)
+        try:
+            yield stats
+        finally:
+            self.end()
+
+    def stop(self):
+        '''이 profiler 가 시작한 tracemalloc 을 끕니다.'''
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def format_table(self):
+        '''단계별 결과를 Markdown 표 문자열로 돌려줍니다.'''
+        lines = ['| Stage | Wall (s) | CPU (s) | In | Out | Peak (KB) |',
+                 '|-------|----------|---------|----|-----|-----------|']
+        for s in self.stages:
+            lines.append(f'| {s.name} | {s.wall:.4f} | {s.cpu:.4f} | {_blank(s.records_in)} '
+                         f'| {_blank(s.records_out)} | {_blank(s.peak_kb)} |')
+        total_wall = sum(s.wall for s in self.stages)
+        total_cpu = sum(s.cpu for s in self.stages)
+        lines.append(f'| 합계 | {total_wall:.4f} | {total_cpu:.4f} |  |  |  |')
+        return '\n'.join(lines)
+
+    def save_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump([s.to_dict() for s in self.stages], f, ensure_ascii=False, indent=4)
+
+
+def _blank(value):
+    return '' if value is None else value
+
+
+def run_with_cprofile(func, dump_path, *args, **kwargs):
+    '''func(*args, **kwargs) 를 cProfile 로 실행하고 결과를 dump_path 에 저장합니다. (python -m pstats 로 확인)'''
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(func, *args, **kwargs)
+    finally:
+        profile.dump_stats(dump_path)
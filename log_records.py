@@ -0,0 +1,270 @@
+import os
+import json
+import heapq
+from array import array
+from log_timestamp import epoch_to_timestamp, timestamp_to_epoch
+from log_compress import open_output
+from log_topk import IN_ORDER, OPPOSITE, latest_records, presorted_direction, restore_runs
+'''
+로그 레코드를 열(column)별로 저장하는 저장소
+
+dict(sorted_list) 는 timestamp 를 키로 쓰기 때문에 같은 초에 이벤트가 여러 개 있으면
+마지막 하나만 남고 나머지는 조용히 사라집니다.
+LogRecordStore 는 레코드를 키 없이 순서대로 쌓아서 모든 이벤트를 보존합니다.
+
+- epochs:      array('q')  epoch 초 (timestamp 문자열은 epoch 에서 다시 만들 수 있으므로 저장하지 않음)
+- event_codes: array('I')  event 종류 번호 (INFO, WARN 처럼 종류가 적으므로 문자열은 events 에 한 번만 저장)
+- messages:    list        message 문자열
+레코드 하나에 dict 항목 + 튜플 대신 정수 2개(12바이트) + 리스트 칸 하나만 더 쓰므로 메모리가 훨씬 적음
+
+정렬은 안정 정렬이라 같은 초 안에서는 원래 줄 순서가 유지되고,
+JSON Lines(한 줄에 레코드 하나) 또는 열 단위 JSON 으로 저장할 수 있습니다.
+'''
+
+
+class LogRecordStore:
+    __slots__ = ('epochs', 'event_codes', 'events', 'messages', '_event_lookup')
+
+    def __init__(self, records=()):
+        self.epochs = array('q')
+        self.event_codes = array('I')
+        self.events = []            # event 번호 → event 문자열
+        self.messages = []
+        self._event_lookup = {}     # event 문자열 → event 번호
+        for record in records:
+            self.append(record[0], record[2], record[3] if len(record) > 3 else '')
+
+    def append(self, epoch, message, event=''):
+        '''레코드 하나를 추가합니다. (epoch 는 log_timestamp.timestamp_to_epoch 로 검사한 값)'''
+        code = self._event_lookup.get(event)
+        if code is None:
+            code = self._event_lookup[event] = len(self.events)
+            self.events.append(event)
+        self.epochs.append(epoch)
+        self.event_codes.append(code)
+        self.messages.append(message)
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def __iter__(self):
+        '''(epoch, timestamp, message, event) 레코드를 저장 순서대로 생성합니다.'''
+        events = self.events
+        for epoch, code, message in zip(self.epochs, self.event_codes, self.messages):
+            yield epoch, epoch_to_timestamp(epoch), message, events[code]
+
+    def __repr__(self):
+        # print() 로 출력하면 리스트처럼 (timestamp, event, message) 목록이 보이도록 함
+        return repr(self.to_list())
+
+    def sorted_by_time(self, reverse=True):
+        '''
+        시간 순서로 정렬한 새 저장소를 돌려줍니다. (기본값: 최신 로그가 먼저)
+        sorted 는 안정 정렬이므로 reverse=True 여도 같은 초 안에서는 원래 순서가 유지됨
+
+        로그가 이미 시간 순서대로 쌓여 있으면 정렬하지 않고 열을 그대로 복사하거나 뒤집기만 함
+        (뒤집을 때 같은 초의 묶음은 원래 순서로 되돌리므로 정렬한 결과와 같음)
+        '''
+        result = LogRecordStore()
+        result.events = list(self.events)
+        result._event_lookup = dict(self._event_lookup)
+        direction = presorted_direction(self.epochs, reverse)
+        if direction == IN_ORDER:
+            result.epochs = array('q', self.epochs)
+            result.event_codes = array('I', self.event_codes)
+            result.messages = list(self.messages)
+        elif direction == OPPOSITE:
+            result.epochs = array('q', reversed(self.epochs))
+            result.event_codes = array('I', reversed(self.event_codes))
+            result.messages = self.messages[::-1]
+            restore_runs(result.epochs, result.event_codes, result.messages)
+        else:
+            order = sorted(range(len(self.epochs)), key=self.epochs.__getitem__, reverse=reverse)
+            result.epochs = array('q', (self.epochs[i] for i in order))
+            result.event_codes = array('I', (self.event_codes[i] for i in order))
+            result.messages = [self.messages[i] for i in order]
+        return result
+
+    def latest(self, n):
+        '''
+        가장 최근 레코드 n 건만 최신 순서로 담은 새 저장소를 돌려줍니다.
+        전체를 정렬하지 않고 크기 n 의 힙만 유지 (sorted_by_time()[:n] 과 같은 결과)
+        '''
+        # 레코드 튜플(timestamp 문자열 변환)을 만들지 않도록 index 만 힙에 넣음
+        order = latest_records(range(len(self.epochs)), n, key=self.epochs.__getitem__)
+        result = LogRecordStore()
+        result.epochs = array('q', (self.epochs[i] for i in order))
+        result.event_codes = array('I', (self.event_codes[i] for i in order))
+        result.messages = [self.messages[i] for i in order]
+        result.events = list(self.events)
+        result._event_lookup = dict(self._event_lookup)
+        return result
+
+    def to_list(self):
+        '''(timestamp, event, message) 튜플 리스트'''
+        return [(timestamp, event, message) for _, timestamp, message, event in self]
+
+    def to_dict(self):
+        '''
+        예전 출력 형식 {timestamp: message} 로 변환합니다.
+        JSON 객체는 키가 하나뿐이라 같은 초의 이벤트는 dict(sorted_list) 와 같이 마지막 것만 남음
+        '''
+        return {timestamp: message for _, timestamp, message, _ in self}
+
+    def write_ndjson(self, path):
+        '''한 줄에 레코드 하나씩 JSON Lines 로 저장합니다. (path 가 .gz/.xz/.zst 로 끝나면 압축)'''
+        with open_output(path, 'w') as f:
+            for record in self:
+                f.write(ndjson_line(record))
+
+    def write_columnar(self, path):
+        '''열 단위 JSON 으로 저장합니다. event 는 종류 목록과 번호로 나누어 저장'''
+        data = {
+            'epoch': self.epochs.tolist(),
+            'events': self.events,
+            'event_code': self.event_codes.tolist(),
+            'message': self.messages,
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def read_columnar(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        store = cls()
+        store.epochs = array('q', data['epoch'])
+        store.events = data['events']
+        store.event_codes = array('I', data['event_code'])
+        store.messages = data['message']
+        store._event_lookup = {event: code for code, event in enumerate(store.events)}
+        return store
+
+
+class NdjsonWriter:
+    '''
+    레코드를 JSON Lines 로 한 줄씩 쓰면서 각 줄의 바이트 위치를 돌려주는 writer
+    (검색 색인이 그 위치만 읽어서 결과를 보여줄 수 있도록)
+    path 가 .gz/.xz/.zst 로 끝나면 압축하면서 저장 (이때 바이트 위치는 풀린 내용 기준이라 seek 에는 쓸 수 없음)
+    '''
+    def __init__(self, path, append=False):
+        # append=True 면 기존 파일 끝에 이어서 씀 (바이트 위치도 기존 크기부터)
+        self._file = open_output(path, 'ab' if append else 'wb')
+        self.pos = os.path.getsize(path) if append else 0
+        self.count = 0
+
+    def write(self, record):
+        data = ndjson_line(record).encode('utf-8')
+        offset = self.pos
+        self._file.write(data)
+        self.pos += len(data)
+        self.count += 1
+        return offset
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def iter_ndjson_records(path, start=0, end=None):
+    '''
+    JSON Lines 파일을 한 줄씩 읽어 (바이트 위치, (epoch, timestamp, message, event)) 를 생성합니다.
+    start / end 를 주면 그 바이트 구간의 줄만 읽음 (줄 시작 위치여야 함)
+    '''
+    with open(path, 'rb') as f:
+        f.seek(start)
+        pos = start
+        for raw in f:
+            if end is not None and pos >= end:
+                break
+            if raw.strip():
+                yield pos, parse_ndjson_line(raw)
+            pos += len(raw)
+
+
+def segments_path_for(path):
+    '''JSONL 세그먼트 위치 기록 파일 경로 (mission_computer_main.jsonl → mission_computer_main.segments.json)'''
+    return os.path.splitext(path)[0] + '.segments.json'
+
+
+def _file_stamp(path):
+    st = os.stat(path)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def ndjson_segment_starts(path):
+    '''
+    시간 역순 JSONL 의 세그먼트 시작 위치 목록을 돌려줍니다.
+
+    증분 처리는 새 레코드를 파일 끝에 이어 붙이므로 JSONL 은 시간 역순 구간(세그먼트) 여러 개가 됨
+    - 기록 파일이 없으면 세그먼트 하나 ([0])
+    - 기록 파일이 JSONL 과 맞지 않으면 (다른 프로그램이 다시 씀) 파일을 훑어서 시간이 늘어나는 곳을 경계로 봄
+    '''
+    try:
+        with open(segments_path_for(path), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return [0]
+    if data.get('source') == _file_stamp(path):
+        return data['starts']
+    starts = [0]
+    prev = None
+    for pos, record in iter_ndjson_records(path):
+        if prev is not None and record[0] > prev:
+            starts.append(pos)
+        prev = record[0]
+    return starts
+
+
+def save_ndjson_segments(path, starts):
+    '''
+    JSONL 을 다 쓴 뒤 세그먼트 시작 위치를 기록합니다.
+    세그먼트가 하나면 (전체를 다시 쓴 경우) 기록 파일을 지움
+    '''
+    segments_path = segments_path_for(path)
+    if len(starts) <= 1:
+        if os.path.exists(segments_path):
+            os.remove(segments_path)
+        return
+    tmp_path = segments_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'source': _file_stamp(path), 'starts': list(starts)}, f)
+    os.replace(tmp_path, segments_path)
+
+
+def iter_ndjson_by_time(path):
+    '''
+    시간 역순 JSONL 을 (바이트 위치, 레코드) 로 시간 역순으로 읽습니다.
+    세그먼트가 여러 개면 heapq.merge 로 병합 (같은 시간은 앞 세그먼트 = 먼저 처리한 로그가 먼저)
+    '''
+    starts = ndjson_segment_starts(path)
+    if len(starts) == 1:
+        yield from iter_ndjson_records(path)
+        return
+    segments = [iter_ndjson_records(path, start, end) for start, end in zip(starts, starts[1:] + [None])]
+    yield from heapq.merge(*segments, key=lambda item: item[1][0], reverse=True)
+
+
+def ndjson_line(record):
+    '''
+    (epoch, timestamp, message, event[, source]) 레코드를 JSON Lines 한 줄로 변환합니다.
+    source(여러 로그 파일을 병합할 때 원본 파일)가 None 이 아니면 함께 저장
+    '''
+    data = {'timestamp': record[1], 'event': record[3], 'message': record[2]}
+    if len(record) > 4 and record[4] is not None:
+        data['source'] = record[4]
+    return json.dumps(data, ensure_ascii=False) + '\n'
+
+
+def parse_ndjson_line(line):
+    '''ndjson_line 의 역변환: (epoch, timestamp, message, event) 레코드 (source 가 있으면 5번째 칸)'''
+    data = json.loads(line)
+    record = timestamp_to_epoch(data['timestamp']), data['timestamp'], data['message'], data.get('event', '')
+    if 'source' in data:
+        record += (data['source'],)
+    return record
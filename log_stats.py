@@ -0,0 +1,200 @@
+import json
+from collections import Counter, defaultdict
+from log_timestamp import epoch_to_timestamp, timestamp_to_epoch
+'''
+로그 집계: 분/시간 단위 건수, 처음/마지막 발생 시각, 공백 구간
+
+처리된 JSON 을 다시 읽어서 훑지 않도록 결과를 저장하는 한 번의 훑기에서 함께 집계합니다.
+- 분 단위 버킷마다 event 별, 위험 키워드별 건수 (시간 단위는 분 버킷을 합쳐서 계산)
+- event / 위험 키워드마다 건수, 처음/마지막 발생 시각
+- 공백 구간: 이어진 두 레코드 사이가 gap_seconds 초보다 길면 기록
+  (레코드는 시간 순서 또는 시간 역순으로 넣어야 함 - 저장 단계는 항상 정렬된 순서)
+메모리는 레코드 수가 아니라 버킷 수(분 수 × event 종류)와 공백 구간 수에만 비례
+
+결과
+- mission_computer_main.stats.json: 전체 집계를 공백 없는 JSON 으로 저장 (save)
+- log_analysis.md: 이벤트/키워드 요약, 시간별 건수, 공백 구간 표 추가 (write_markdown)
+'''
+
+GAP_SECONDS = 60        # 이 시간(초)보다 로그가 없으면 공백 구간으로 기록
+MINUTE = 60
+HOUR = 3600
+
+
+class _Occurrence:
+    __slots__ = ('count', 'first', 'last')
+
+    def __init__(self, epoch):
+        self.count = 0
+        self.first = self.last = epoch
+
+    def add(self, epoch):
+        self.count += 1
+        if epoch < self.first:
+            self.first = epoch
+        elif epoch > self.last:
+            self.last = epoch
+
+    @classmethod
+    def from_dict(cls, data):
+        occurrence = cls(timestamp_to_epoch(data['first']))
+        occurrence.count = data['count']
+        occurrence.last = timestamp_to_epoch(data['last'])
+        return occurrence
+
+    def to_dict(self):
+        return {'count': self.count, 'first': epoch_to_timestamp(self.first), 'last': epoch_to_timestamp(self.last)}
+
+
+class LogStats:
+    def __init__(self, gap_seconds=GAP_SECONDS):
+        self.gap_seconds = gap_seconds
+        self.total = 0
+        self.events = {}            # event → _Occurrence
+        self.keywords = {}          # 위험 키워드 → _Occurrence
+        self.minute_events = defaultdict(Counter)     # 분 버킷 시작 epoch → event 별 건수
+        self.minute_keywords = defaultdict(Counter)   # 분 버킷 시작 epoch → 위험 키워드별 건수
+        self.gaps = []              # (시작 epoch, 끝 epoch)
+        self._prev_epoch = None
+
+    @classmethod
+    def from_dict(cls, data):
+        '''
+        to_dict 결과(stats.json)로 집계를 되살립니다. 증분 처리에서 새 레코드만 더 집계할 때 사용
+        공백 구간 검사는 가장 늦은 레코드부터 이어서 하므로 새 레코드는 시간 순서로 넣어야 함
+        '''
+        stats = cls(data['gap_seconds'])
+        stats.total = data['records']
+        stats.events = {event: _Occurrence.from_dict(o) for event, o in data['events'].items()}
+        stats.keywords = {keyword: _Occurrence.from_dict(o) for keyword, o in data['keywords'].items()}
+        for row in data['per_minute']:
+            bucket = timestamp_to_epoch(row['minute'] + ':00')
+            stats.minute_events[bucket] = Counter(row['events'])
+            if 'keywords' in row:
+                stats.minute_keywords[bucket] = Counter(row['keywords'])
+        stats.gaps = [(timestamp_to_epoch(gap['start']), timestamp_to_epoch(gap['end'])) for gap in data['gaps']]
+        stats._prev_epoch = stats.last_epoch()
+        return stats
+
+    @classmethod
+    def load(cls, path):
+        '''save 로 저장한 stats.json 을 읽습니다.'''
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def last_epoch(self):
+        '''가장 늦은 레코드의 epoch (레코드가 없으면 None)'''
+        return max((o.last for o in self.events.values()), default=None)
+
+    def add_record(self, record, hits=()):
+        '''
+        레코드 하나를 집계합니다. 결과를 저장하면서 호출
+
+        Args:
+            record (tuple): (epoch, timestamp, message, event, ...)
+            hits (list): 메시지에서 찾은 위험 키워드
+        '''
+        epoch, event = record[0], record[3]
+        self.total += 1
+        _occurrence(self.events, event, epoch).add(epoch)
+        bucket = epoch - epoch % MINUTE
+        self.minute_events[bucket][event] += 1
+        if hits:
+            self.minute_keywords[bucket].update(hits)
+            for keyword in hits:
+                _occurrence(self.keywords, keyword, epoch).add(epoch)
+
+        prev = self._prev_epoch
+        if prev is not None and abs(epoch - prev) > self.gap_seconds:
+            self.gaps.append((min(prev, epoch), max(prev, epoch)))
+        self._prev_epoch = epoch
+
+    def per_hour(self):
+        '''분 버킷을 합쳐서 {시간 버킷 시작 epoch: (event 별 건수, 위험 키워드별 건수)} 를 돌려줍니다.'''
+        hours = defaultdict(lambda: (Counter(), Counter()))
+        for bucket, counts in self.minute_events.items():
+            hours[bucket - bucket % HOUR][0].update(counts)
+        for bucket, counts in self.minute_keywords.items():
+            hours[bucket - bucket % HOUR][1].update(counts)
+        return dict(hours)
+
+    def to_dict(self):
+        first = min((o.first for o in self.events.values()), default=None)
+        last = self.last_epoch()
+        return {
+            'records': self.total,
+            'first': epoch_to_timestamp(first) if first is not None else None,
+            'last': epoch_to_timestamp(last) if last is not None else None,
+            'events': {event: o.to_dict() for event, o in sorted(self.events.items())},
+            'keywords': {keyword: o.to_dict() for keyword, o in self.keywords.items()},
+            'per_minute': [_bucket_row('minute', bucket, self.minute_events[bucket],
+                                       self.minute_keywords.get(bucket), 16)
+                           for bucket in sorted(self.minute_events)],
+            'per_hour': [_bucket_row('hour', bucket, events, keywords, 13)
+                         for bucket, (events, keywords) in sorted(self.per_hour().items())],
+            'gap_seconds': self.gap_seconds,
+            'gaps': [{'start': epoch_to_timestamp(start), 'end': epoch_to_timestamp(end), 'seconds': end - start}
+                     for start, end in sorted(self.gaps)],
+        }
+
+    def save(self, path):
+        '''전체 집계를 공백 없는 JSON 으로 저장합니다.'''
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(',', ':'))
+        return path
+
+    def write_markdown(self, d, keywords=()):
+        '''
+        log_analysis.md 에 집계 표를 추가합니다. (분 단위 건수는 표가 너무 길어서 stats.json 에만 저장)
+
+        Args:
+            d (file): 열려 있는 Markdown 파일
+            keywords (list): 표에 표시할 위험 키워드 순서 (없으면 발생한 키워드만)
+        '''
+        d.write("\n## 이벤트별 건수\n\n")
+        d.write("| Event | Count | First | Last |\n")
+        d.write("|-------|-------|-------|------|\n")
+        for event, o in sorted(self.events.items()):
+            d.write(f'| {event} | {o.count} | {epoch_to_timestamp(o.first)} | {epoch_to_timestamp(o.last)} |\n')
+
+        d.write("\n## 위험 키워드 처음/마지막 발생\n\n")
+        d.write("| Keyword | Count | First | Last |\n")
+        d.write("|---------|-------|-------|------|\n")
+        for keyword in keywords or list(self.keywords):
+            o = self.keywords.get(keyword)
+            if o is None:
+                d.write(f'| {keyword} | 0 | - | - |\n')
+            else:
+                d.write(f'| {keyword} | {o.count} | {epoch_to_timestamp(o.first)} | {epoch_to_timestamp(o.last)} |\n')
+
+        events = sorted(self.events)
+        d.write("\n## 시간별 건수\n\n")
+        d.write(f"| Hour | Total | {' | '.join(events)} | Danger hits |\n")
+        d.write(f"|------|-------|{'|'.join('---' for _ in events)}|-------------|\n")
+        for bucket, (event_counts, keyword_counts) in sorted(self.per_hour().items()):
+            cells = ' | '.join(str(event_counts[event]) for event in events)
+            d.write(f'| {epoch_to_timestamp(bucket)[:13]}시 | {sum(event_counts.values())} | {cells} '
+                    f'| {sum(keyword_counts.values())} |\n')
+
+        d.write(f"\n## 로그 공백 구간 ({self.gap_seconds}초 초과)\n\n")
+        if not self.gaps:
+            d.write("공백 구간 없음\n")
+            return
+        d.write("| Start | End | Seconds |\n")
+        d.write("|-------|-----|---------|\n")
+        for start, end in sorted(self.gaps):
+            d.write(f'| {epoch_to_timestamp(start)} | {epoch_to_timestamp(end)} | {end - start} |\n')
+
+
+def _occurrence(table, key, epoch):
+    occurrence = table.get(key)
+    if occurrence is None:
+        occurrence = table[key] = _Occurrence(epoch)
+    return occurrence
+
+
+def _bucket_row(name, bucket, events, keywords, width):
+    row = {name: epoch_to_timestamp(bucket)[:width], 'total': sum(events.values()), 'events': dict(events)}
+    if keywords:
+        row['keywords'] = dict(keywords)
+    return row
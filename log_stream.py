@@ -0,0 +1,327 @@
+import os
+import json
+import heapq
+import shutil
+import tempfile
+from log_timestamp import timestamp_to_epoch
+from log_records import NdjsonWriter
+from log_compress import open_log, open_output
+'''
+대용량 mission_computer_main.log 를 스트리밍으로 처리하는 모듈
+
+- 파일 전체를 readlines()로 메모리에 올리지 않고 제너레이터로 한 줄씩 읽어서
+  (epoch, timestamp, message) 레코드를 만든다
+  (epoch 는 log_timestamp 로 한 번만 변환해서 레코드에 저장한 정렬 키)
+- 정렬은 외부 병합 정렬(external merge sort)로 처리
+    1. RUN_SIZE 개씩 잘라서 메모리에서 정렬한 뒤 임시 파일(run)로 내보냄(spill)
+    2. heapq.merge 로 run 파일들을 한 줄씩 읽으면서 병합
+  메모리에는 run 하나 크기 + run 마다 한 줄만 올라가므로
+  입력 파일이 몇 GB가 되더라도 최대 메모리 사용량이 일정하게 유지됨
+- 최종 JSON 도 json.dump 로 한 번에 쓰지 않고 한 항목씩 써서 내용은 같게 유지
+- 레코드는 (epoch, timestamp, message, event) 튜플이고 같은 초의 이벤트도 모두 유지
+- 출력 형식(open_record_writer)
+    json:    json.dump(..., indent=4) 와 같은 {timestamp: message} (기본값, 예전 형식)
+    compact: 들여쓰기/공백 없는 {timestamp: message} (파일이 작고 쓰기/읽기가 빠름)
+    ndjson:  한 줄에 레코드 하나 (같은 초의 이벤트도 모두 저장, 한 줄씩 다시 읽을 수 있음)
+'''
+
+RUN_SIZE = 100000       # run 하나에 담는 레코드 수 (메모리 사용량 상한을 결정)
+MERGE_FAN_IN = 64       # 한 번에 병합하는 run 파일 수 (동시에 열리는 파일 수 제한)
+OUTPUT_FORMATS = ('json', 'compact', 'ndjson')
+COPY_CHUNK = 1024 * 1024    # 기존 JSON 을 이어 붙일 때 한 번에 읽는 문자 수
+
+
+def parse_log_line(line):
+    '''
+    로그 한 줄을 (epoch, timestamp, message, event) 레코드로 변환합니다.
+
+    빈 줄, 쉼표가 없는 줄, 필드가 모자란 줄, 날짜 형식이 맞지 않는 줄(헤더 포함)은 None 을 반환합니다.
+    '''
+    line = line.strip()
+    if not line or ',' not in line:
+        return None
+    parts = line.split(',', 2)
+    if len(parts) < 3:
+        return None
+    timestamp = parts[0].strip()
+    epoch = timestamp_to_epoch(timestamp)
+    if epoch is None:
+        return None
+    return epoch, timestamp, parts[2].strip(), parts[1].strip()
+
+
+def iter_log_records(file_path):
+    '''
+    로그 파일을 한 줄씩 읽어 유효한 (epoch, timestamp, message, event) 레코드를 생성합니다.
+    .log.gz / .log.xz / .log.zst 는 읽으면서 풀어서 처리
+    '''
+    with open_log(file_path, 'rt') as f:
+        for line in f:      # 한 줄씩 읽으므로 파일 전체가 메모리에 올라가지 않음
+            record = parse_log_line(line)
+            if record is not None:
+                yield record
+
+
+def _run_key(row):
+    # row = [epoch, 입력 순번, timestamp, message, event]
+    # 시간은 내림차순, 같은 시간 안에서는 입력 순서를 유지하기 위해 순번에 -를 붙임
+    return row[0], -row[1]
+
+
+def _spill_run(rows, tmp_dir):
+    # 메모리에서 정렬한 run 하나를 JSON Lines 형식의 임시 파일로 저장
+    rows.sort(key=_run_key, reverse=True)
+    fd, run_path = tempfile.mkstemp(suffix='.run', dir=tmp_dir)
+    with os.fdopen(fd, 'w', encoding='utf-8') as run_file:
+        for row in rows:
+            run_file.write(json.dumps(row, ensure_ascii=False))
+            run_file.write('\n')
+    return run_path
+
+
+def _read_run(run_path):
+    with open(run_path, 'r', encoding='utf-8') as run_file:
+        for line in run_file:
+            yield json.loads(line)
+
+
+def _merge_run_files(run_paths, tmp_dir):
+    # run 파일이 MERGE_FAN_IN 보다 많으면 몇 개씩 묶어서 더 큰 run 으로 미리 병합
+    while len(run_paths) > MERGE_FAN_IN:
+        merged_paths = []
+        for i in range(0, len(run_paths), MERGE_FAN_IN):
+            group = run_paths[i:i + MERGE_FAN_IN]
+            fd, merged_path = tempfile.mkstemp(suffix='.run', dir=tmp_dir)
+            with os.fdopen(fd, 'w', encoding='utf-8') as merged_file:
+                for row in heapq.merge(*[_read_run(p) for p in group], key=_run_key, reverse=True):
+                    merged_file.write(json.dumps(row, ensure_ascii=False))
+                    merged_file.write('\n')
+            for p in group:
+                os.remove(p)
+            merged_paths.append(merged_path)
+        run_paths = merged_paths
+    return heapq.merge(*[_read_run(p) for p in run_paths], key=_run_key, reverse=True)
+
+
+def sort_records_external(records, run_size=RUN_SIZE, tmp_dir=None):
+    '''
+    (epoch, timestamp, message, event) 레코드를 시간 역순으로 정렬하여 하나씩 돌려줍니다.
+
+    같은 초의 레코드는 모두 남기고 원래 줄 순서를 유지합니다. (안정 정렬)
+
+    Args:
+        records: (epoch, timestamp, message, event) 튜플을 생성하는 iterable
+        run_size (int): 메모리에서 한 번에 정렬할 레코드 수
+        tmp_dir (str, optional): run 파일을 저장할 임시 디렉터리의 상위 경로
+    '''
+    with tempfile.TemporaryDirectory(prefix='log_runs_', dir=tmp_dir) as run_dir:
+        run_paths = []
+        rows = []
+        for seq, (epoch, timestamp, message, event) in enumerate(records):
+            rows.append([epoch, seq, timestamp, message, event])
+            if len(rows) >= run_size:
+                run_paths.append(_spill_run(rows, run_dir))
+                rows = []
+        if rows:
+            run_paths.append(_spill_run(rows, run_dir))
+        del rows
+
+        for epoch, _, timestamp, message, event in _merge_run_files(run_paths, run_dir):
+            yield epoch, timestamp, message, event
+
+
+class JsonDictWriter:
+    '''
+    시간 역순으로 정렬된 레코드를 json.dump(dict, ensure_ascii=False, indent=4) 와 같은 모양으로
+    한 항목씩 저장하는 writer (예전 {timestamp: message} 출력 형식)
+    indent=None 이면 json.dump(dict, ensure_ascii=False, separators=(',', ':')) 와 같은 compact 형식
+
+    JSON 객체는 키가 하나뿐이므로 같은 timestamp 가 연속으로 오면
+    dict(sorted_list) 와 같이 마지막 레코드만 저장합니다.
+    모든 이벤트는 log_records.NdjsonWriter 로 따로 저장
+    json_path 가 .gz/.xz/.zst 로 끝나면 압축하면서 저장
+    '''
+    def __init__(self, json_path, indent=4):
+        self._file = open_output(json_path, 'w')
+        self._file.write('{')
+        if indent is None:
+            self._first, self._sep, self._colon, self._end = '', ',', ':', '}'
+        else:
+            pad = '\n' + ' ' * indent
+            self._first, self._sep, self._colon, self._end = pad, ',' + pad, ': ', '\n}'
+        self._pending = None
+        self.count = 0
+
+    def write(self, record):
+        if self._pending is not None and self._pending[1] != record[1]:
+            self._emit(self._pending)
+        self._pending = record
+
+    def _emit(self, record):
+        self._file.write(self._sep if self.count else self._first)
+        self._file.write(json.dumps(record[1], ensure_ascii=False))
+        self._file.write(self._colon)
+        self._file.write(json.dumps(record[2], ensure_ascii=False))
+        self.count += 1
+
+    def close(self):
+        if self._pending is not None:
+            self._emit(self._pending)
+            self._pending = None
+        self._file.write(self._end if self.count else '}')
+        self._file.close()
+
+    def close_with(self, old):
+        '''
+        같은 형식으로 저장된 기존 JSON(텍스트로 열린 old)의 항목들을 지금까지 쓴 항목 뒤에 붙이고 닫습니다.
+        기존 항목은 다시 파싱하지 않고 문자열 그대로 복사 (증분 처리에서 더 늦은 레코드를 앞에 추가할 때)
+        기존 첫 항목의 timestamp 가 마지막으로 쓴 레코드와 같으면 기존 항목은 버림 (같은 초는 마지막 로그만 남김)
+
+        Raises:
+            ValueError: 기존 JSON 이 JsonDictWriter 형식이 아님
+        '''
+        text = ''
+        while True:
+            chunk = old.read(COPY_CHUNK)
+            text += chunk
+            try:
+                key, start, rest = _split_first_entry(text)
+                break
+            except (IndexError, ValueError):
+                if not chunk:
+                    raise ValueError("기존 JSON 형식이 올바르지 않습니다.")
+        if self._pending is not None:
+            if key == self._pending[1]:
+                start = rest
+            self._emit(self._pending)
+            self._pending = None
+        if text[_skip_space(text, start)] == '}':
+            self._file.write(self._end if self.count else '}')     # 붙일 기존 항목이 없음
+        else:
+            self._file.write(self._sep if self.count else self._first)
+            self._file.write(text[start:])
+            shutil.copyfileobj(old, self._file, COPY_CHUNK)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _skip_space(text, pos):
+    while text[pos] in ' \t\r\n':
+        pos += 1
+    return pos
+
+
+def _split_first_entry(text):
+    '''
+    JSON 객체 앞부분(text)에서 (첫 키, 첫 항목 시작 위치, 둘째 항목 또는 닫는 괄호 앞 공백 위치) 를 찾습니다.
+    빈 객체면 (None, 닫는 괄호 위치, 같은 위치)
+    text 가 모자라서 판단할 수 없으면 IndexError 또는 ValueError
+    '''
+    decoder = json.JSONDecoder()
+    pos = _skip_space(text, 0)
+    if text[pos] != '{':
+        raise ValueError(text[:pos + 1])
+    start = _skip_space(text, pos + 1)
+    if text[start] == '}':
+        return None, start, start
+    key, pos = decoder.raw_decode(text, start)
+    pos = _skip_space(text, pos)
+    if text[pos] != ':':
+        raise ValueError(text[:pos + 1])
+    _, end = decoder.raw_decode(text, _skip_space(text, pos + 1))
+    pos = _skip_space(text, end)
+    if text[pos] == ',':
+        return key, start, _skip_space(text, pos + 1)
+    if text[pos] != '}':
+        raise ValueError(text[:pos + 1])
+    return key, start, end
+
+
+def prepend_json_records(json_path, records, output_format='json', output_path=None):
+    '''
+    JsonDictWriter 로 저장된 시간 역순 JSON 앞에 더 늦은 레코드들을 추가합니다. (증분 처리)
+    새 파일은 임시 파일에 쓴 뒤 교체
+
+    Args:
+        json_path (str): 기존 JSON 경로 (.gz/.xz/.zst 도 가능)
+        records (iterable): 시간 역순 레코드, 모두 기존 첫 항목보다 늦거나 같은 시간
+        output_format (str): 기존 JSON 을 저장한 형식 ('json' 또는 'compact')
+        output_path (str): 주면 기존 JSON 은 그대로 두고 결과를 이 경로에 저장 (교체는 호출한 쪽에서)
+    '''
+    head, name = os.path.split(json_path)
+    tmp_path = output_path or os.path.join(head, '.tmp.' + name)
+    writer = open_record_writer(tmp_path, output_format)
+    try:
+        with open_log(json_path, 'rt') as old:
+            for record in records:
+                writer.write(record)
+            writer.close_with(old)
+    except BaseException:
+        writer._file.close()
+        os.remove(tmp_path)
+        raise
+    if output_path is None:
+        os.replace(tmp_path, json_path)
+
+
+def open_record_writer(path, output_format='json'):
+    '''
+    출력 형식에 맞는 writer 를 엽니다. writer.write(record) 로 레코드를 하나씩 쓰고 close() 로 마무리
+
+    Args:
+        path (str): 저장할 파일 경로
+        output_format (str): 'json', 'compact', 'ndjson' 중 하나
+
+    Returns:
+        JsonDictWriter | log_records.NdjsonWriter
+    '''
+    if output_format == 'json':
+        return JsonDictWriter(path)
+    if output_format == 'compact':
+        return JsonDictWriter(path, indent=None)
+    if output_format == 'ndjson':
+        return NdjsonWriter(path)
+    raise ValueError(f"지원하지 않는 출력 형식입니다: {output_format} ({', '.join(OUTPUT_FORMATS)})")
+
+
+def iter_json_entries(json_path):
+    '''
+    JsonDictWriter 나 json.dump(..., indent=4) 로 저장된 JSON, 또는 JSON Lines 파일을 한 줄씩 읽어
+    (바이트 위치, timestamp, message) 를 생성합니다. (전체를 json.load 하지 않음)
+    compact JSON 은 한 줄짜리라 그 줄 하나만 읽어서 처리 (모든 항목의 위치가 0)
+    '''
+    with open(json_path, 'rb') as f:
+        pos = 0
+        for raw in f:
+            for timestamp, message in _parse_entry_line(raw):
+                yield pos, timestamp, message
+            pos += len(raw)
+
+
+def read_json_entries(json_path, offsets):
+    '''저장해 둔 바이트 위치(offsets)의 줄만 읽어서 (timestamp, message) 목록을 돌려줍니다.'''
+    results = []
+    with open(json_path, 'rb') as f:
+        for offset in offsets:
+            f.seek(offset)
+            results.extend(_parse_entry_line(f.readline()))
+    return results
+
+
+def _parse_entry_line(raw):
+    # '    "timestamp": "message",' (JSON 객체의 한 항목) 또는 '{"timestamp": ..., "message": ...}' (JSON Lines)
+    line = raw.decode('utf-8').strip()
+    if line.startswith('{') and line.endswith('}'):
+        data = json.loads(line)
+        if 'timestamp' in data and 'message' in data and isinstance(data['message'], str):
+            return [(data['timestamp'], data['message'])]   # JSON Lines 레코드
+        return list(data.items())   # compact JSON (한 줄에 객체 전체)
+    line = line.rstrip(',')
+    if line.startswith('"'):
+        return list(json.loads('{' + line + '}').items())
+    return []
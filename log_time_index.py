@@ -0,0 +1,307 @@
+import os
+import mmap
+import heapq
+import struct
+import bisect
+from array import array
+from log_stream import iter_json_entries, read_json_entries
+from log_timestamp import timestamp_to_epoch, epoch_to_timestamp
+'''
+처리된 로그(mission_computer_main.jsonl)용 시간 구간 색인
+
+"10:02 ~ 10:07 사이에 무슨 일이 있었나" 같은 질문에 답하기 위해
+항목마다 epoch 초와 JSONL 파일 안의 바이트 위치를 epoch 오름차순으로 저장합니다.
+- query_range(start, end) 는 bisect 로 시작/끝 위치를 찾고 (O(log n))
+  그 사이 항목만 JSONL 에서 읽어옴 (O(k)) → 로그를 다시 파싱하지 않음
+- JSONL 옆에 mission_computer_main.times.bin 으로 저장
+  [버전, JSONL 크기, JSONL 수정시간(ns), 항목 수] + (epoch, 바이트 위치) 쌍 (모두 int64)
+  쌍을 나란히 저장하므로 증분 처리에서는 새 쌍을 파일 끝에 붙이고 머리만 고쳐 씀
+- 만들 때는 (epoch, 위치) 쌍을 CHUNK_PAIRS 개씩 오름차순 청크로 임시 파일에 내보내므로
+  항목 수와 관계없이 메모리에는 청크 하나만 올라감
+  JSONL 은 시간 역순으로 저장되므로 보통은 청크를 거꾸로 이어 붙이기만 하면 되고,
+  순서가 섞인 입력은 청크들을 heapq.merge 로 블록 단위로 병합
+- 검색할 때는 파일을 mmap 으로 열고 필요한 쌍만 읽음
+'''
+
+TIME_INDEX_VERSION = 2
+CHUNK_PAIRS = 65536     # 메모리에 모아 두는 (epoch, 위치) 쌍의 최대 수
+MERGE_BLOCK_PAIRS = 4096    # 순서가 섞인 입력을 병합할 때 청크마다 한 번에 읽는 쌍 수
+
+_HEADER = struct.Struct('=4q')  # 버전, JSONL 크기, JSONL 수정시간(ns), 항목 수
+_PAIR = struct.Struct('=2q')    # epoch, JSONL 바이트 위치
+
+
+def time_index_path_for(json_path):
+    '''JSONL 경로 옆에 저장할 시간 색인 경로 (mission_computer_main.jsonl → mission_computer_main.times.bin)'''
+    root, _ = os.path.splitext(json_path)
+    return root + '.times.bin'
+
+
+def _tmp_path(path):
+    head, name = os.path.split(path)
+    return os.path.join(head, '.tmp.' + name)
+
+
+def _to_epoch(value):
+    # "YYYY-MM-DD HH:MM:SS" 문자열 또는 epoch 정수를 받음
+    if isinstance(value, int):
+        return value
+    epoch = timestamp_to_epoch(value.strip())
+    if epoch is None:
+        raise ValueError(f"잘못된 시간 형식입니다: {value!r} (YYYY-MM-DD HH:MM:SS)")
+    return epoch
+
+
+def _read_header(f, json_path):
+    # 머리를 읽고 JSONL 과 맞으면 항목 수, 아니면 None
+    data = f.read(_HEADER.size)
+    if len(data) < _HEADER.size:
+        return None
+    version, size, mtime_ns, count = _HEADER.unpack(data)
+    stat = os.stat(json_path)
+    if [version, size, mtime_ns] != [TIME_INDEX_VERSION, stat.st_size, stat.st_mtime_ns]:
+        return None
+    return count
+
+
+def _iter_chunk_pairs(f, start, count):
+    # 청크 파일의 start 바이트부터 count 쌍을 블록 단위로 읽어 (epoch, 위치) 생성
+    while count > 0:
+        n = min(count, MERGE_BLOCK_PAIRS)
+        f.seek(start)
+        block = array('q')
+        block.fromfile(f, n * 2)
+        start += n * _PAIR.size
+        count -= n
+        yield from zip(block[0::2], block[1::2])
+
+
+class TimeIndexWriter:
+    def __init__(self, json_path, append=False):
+        '''
+        JSONL 을 쓰면서 (위치, epoch) 를 하나씩 받아 시간 색인 파일을 만듭니다.
+
+        Args:
+            json_path (str): 색인할 JSONL 경로 (commit 할 때 이 파일이 다 써져 있어야 함)
+            append (bool): True 면 기존 색인 끝에 이어서 추가 (증분 처리)
+                JSONL 에 새 항목을 추가하기 전에 만들어야 하고, 새 항목은 모두 기존 항목보다 늦어야 함
+
+        Raises:
+            ValueError: append 인데 기존 색인이 없거나 JSONL 과 맞지 않음
+        '''
+        self.json_path = json_path
+        self.index_path = time_index_path_for(json_path)
+        self._base_count = 0
+        self._base_last = None      # append: 기존 색인의 마지막(가장 늦은) epoch
+        if append:
+            try:
+                with open(self.index_path, 'rb') as f:
+                    count = _read_header(f, json_path)
+                    if count is not None and count:
+                        f.seek(_HEADER.size + (count - 1) * _PAIR.size)
+                        self._base_last = _PAIR.unpack(f.read(_PAIR.size))[0]
+            except FileNotFoundError:
+                count = None
+            if count is None:
+                raise ValueError("이어서 추가할 시간 색인이 없거나 JSONL 과 맞지 않습니다.")
+            self._base_count = count
+        self._append = append
+        self._epochs = array('q')
+        self._offsets = array('q')
+        self._chunks = []           # 임시 파일 안의 (시작 바이트, 쌍 수), 각 청크는 오름차순
+        self._count = 0
+        self._descending = True     # 지금까지 받은 epoch 가 모두 시간 역순인지
+        self._previous = None
+        self._chunk_path = _tmp_path(self.index_path) + '.chunks'
+        self._chunk_file = open(self._chunk_path, 'w+b')
+
+    def __len__(self):
+        return self._base_count + self._count
+
+    def add(self, offset, epoch):
+        if self._previous is not None and epoch > self._previous:
+            self._descending = False
+        self._previous = epoch
+        self._epochs.append(epoch)
+        self._offsets.append(offset)
+        self._count += 1
+        if len(self._epochs) >= CHUNK_PAIRS:
+            self._flush()
+
+    def add_record(self, offset, record):
+        '''결과를 저장하면서 호출: record = (epoch, timestamp, message, ...)'''
+        self.add(offset, record[0])
+
+    def _flush(self):
+        # 버퍼를 epoch 오름차순 청크 하나로 내보냄 (시간 역순이면 뒤집기만 함)
+        epochs, offsets = self._epochs, self._offsets
+        if not epochs:
+            return
+        if self._descending:
+            epochs.reverse()
+            offsets.reverse()
+        else:
+            order = sorted(range(len(epochs)), key=lambda i: (epochs[i], offsets[i]))
+            epochs = array('q', (epochs[i] for i in order))
+            offsets = array('q', (offsets[i] for i in order))
+        pairs = array('q', bytes(len(epochs) * _PAIR.size))
+        pairs[0::2] = epochs
+        pairs[1::2] = offsets
+        self._chunks.append((self._chunk_file.tell(), len(epochs)))
+        pairs.tofile(self._chunk_file)
+        self._epochs = array('q')
+        self._offsets = array('q')
+
+    def _write_pairs(self, out):
+        # 청크들을 epoch 오름차순으로 out 에 이어 씀
+        chunk_file = self._chunk_file
+        chunk_file.flush()
+        if self._descending:
+            # 뒤에 받은 청크일수록 이른 시간 → 청크 순서만 거꾸로
+            for start, count in reversed(self._chunks):
+                chunk_file.seek(start)
+                out.write(chunk_file.read(count * _PAIR.size))
+            return
+        streams = [_iter_chunk_pairs(chunk_file, start, count) for start, count in self._chunks]
+        block = array('q')
+        for epoch, offset in heapq.merge(*streams):
+            block.append(epoch)
+            block.append(offset)
+            if len(block) >= MERGE_BLOCK_PAIRS * 2:
+                block.tofile(out)
+                block = array('q')
+        block.tofile(out)
+
+    def commit(self):
+        '''
+        시간 색인을 저장합니다. JSONL 파일을 다 쓴(교체한) 뒤에 호출해야 합니다.
+
+        Returns:
+            str: 시간 색인 경로
+
+        Raises:
+            ValueError: append 인데 새 항목이 기존 마지막 항목보다 이름 (전체를 다시 만들어야 함)
+        '''
+        if self._append and self._count and not self._descending:
+            raise ValueError("증분 시간 색인은 시간 역순으로 추가해야 합니다.")
+        if self._append and self._count and self._base_last is not None and self._previous < self._base_last:
+            raise ValueError("새 항목이 기존 시간 색인의 마지막 항목보다 이릅니다.")
+        self._flush()
+        stat = os.stat(self.json_path)
+        header = _HEADER.pack(TIME_INDEX_VERSION, stat.st_size, stat.st_mtime_ns, len(self))
+        try:
+            if self._append:
+                with open(self.index_path, 'r+b') as out:
+                    out.truncate(_HEADER.size + self._base_count * _PAIR.size)
+                    out.seek(0, os.SEEK_END)
+                    self._write_pairs(out)
+                    out.seek(0)
+                    out.write(header)
+            else:
+                tmp_path = _tmp_path(self.index_path)
+                with open(tmp_path, 'wb') as out:
+                    out.write(header)
+                    self._write_pairs(out)
+                os.replace(tmp_path, self.index_path)
+        finally:
+            self.discard()
+        return self.index_path
+
+    def discard(self):
+        '''임시 청크 파일을 지웁니다. (commit 후 또는 처리 중 오류)'''
+        if not self._chunk_file.closed:
+            self._chunk_file.close()
+        for path in (self._chunk_path, _tmp_path(self.index_path)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+class TimeRangeIndex:
+    def __init__(self, json_path, index_path=None):
+        '''load_time_index 로 여는 시간 색인 (mmap 으로 필요한 쌍만 읽음)'''
+        self.json_path = json_path
+        self.index_path = index_path or time_index_path_for(json_path)
+        with open(self.index_path, 'rb') as f:
+            count = _read_header(f, json_path)
+            if count is None:
+                raise ValueError("시간 색인이 JSONL 과 맞지 않습니다.")
+            if os.fstat(f.fileno()).st_size < _HEADER.size + count * _PAIR.size:
+                raise ValueError("시간 색인 파일이 잘렸습니다.")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _epoch(self, i):
+        return _PAIR.unpack_from(self._mm, _HEADER.size + i * _PAIR.size)[0]
+
+    def range_slice(self, start, end):
+        '''start <= 시간 <= end 인 항목의 (시작, 끝) 위치 (항목 번호 기준 슬라이스)'''
+        positions = range(self._count)
+        lo = bisect.bisect_left(positions, _to_epoch(start), key=self._epoch)
+        hi = bisect.bisect_right(positions, _to_epoch(end), key=self._epoch)
+        return lo, max(lo, hi)
+
+    def query_range(self, start, end):
+        '''
+        start 부터 end 까지(양 끝 포함)의 로그를 시간 순서대로 돌려줍니다. (같은 시간은 로그 순서)
+
+        Args:
+            start (str | int): 시작 시간 ("YYYY-MM-DD HH:MM:SS" 또는 epoch 초)
+            end (str | int): 끝 시간
+
+        Returns:
+            list: (timestamp, message) 목록 (오래된 것부터)
+        '''
+        lo, hi = self.range_slice(start, end)
+        pairs = array('q')
+        pairs.frombytes(self._mm[_HEADER.size + lo * _PAIR.size:_HEADER.size + hi * _PAIR.size])
+        # 같은 시간 안에서는 JSONL 위치 순서 = 로그 순서
+        rows = sorted(zip(pairs[0::2], pairs[1::2]))
+        return read_json_entries(self.json_path, [offset for _, offset in rows])
+
+    def time_span(self):
+        '''색인된 로그의 (처음, 마지막) 시간 문자열'''
+        if not self._count:
+            return None
+        return epoch_to_timestamp(self._epoch(0)), epoch_to_timestamp(self._epoch(self._count - 1))
+
+
+def build_time_index(json_path):
+    '''저장된 JSONL 을 한 줄씩 읽어 시간 색인을 만들고 저장한 뒤 열어서 돌려줍니다.'''
+    writer = TimeIndexWriter(json_path)
+    try:
+        for offset, timestamp, _ in iter_json_entries(json_path):
+            epoch = timestamp_to_epoch(timestamp)
+            if epoch is not None:
+                writer.add(offset, epoch)
+        writer.commit()
+    except BaseException:
+        writer.discard()
+        raise
+    return load_time_index(json_path)
+
+
+def load_time_index(json_path, index_path=None):
+    '''
+    저장된 시간 색인을 엽니다.
+
+    Returns:
+        TimeRangeIndex | None: 색인 파일이 없거나 JSONL 이 색인을 만든 뒤 바뀌었으면 None
+    '''
+    try:
+        return TimeRangeIndex(json_path, index_path)
+    except (FileNotFoundError, ValueError):
+        return None
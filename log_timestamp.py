@@ -0,0 +1,144 @@
+from functools import lru_cache
+'''
+로그 timestamp 전용 변환기 ("%Y-%m-%d %H:%M:%S" 고정 형식)
+
+datetime.strptime 은 형식 문자열을 매번 해석하고 datetime 객체를 만들기 때문에
+줄 수가 많은 로그에서는 전체 처리 시간의 대부분을 차지합니다.
+로그의 시간 형식은 항상 "YYYY-MM-DD HH:MM:SS" (19글자) 이므로
+문자열 슬라이싱과 정수 연산만으로 검사하고 정수(epoch 초)로 변환합니다.
+
+- timestamp_to_epoch("2023-08-27 10:00:00") -> 1693130400
+- 형식이 맞지 않거나 없는 날짜(2월 30일 등)는 None 반환
+- 디코딩 전의 bytes 도 timestamp_bytes_to_epoch 로 같은 방식으로 검사 가능 (mmap 리더용)
+- 정렬할 때는 변환된 정수를 레코드와 함께 저장해 두고 그대로 키로 사용
+
+줄마다 int() 를 여섯 번 부르는 대신
+- 날짜 "YYYY-MM-DD" → 일 수는 lru_cache 로 기억 (로그 한 파일의 날짜 종류는 많지 않음)
+- 시각 "HH:MM" (1440가지) 과 초 "SS" (60가지) 는 미리 만든 표에서 찾음
+표에 있는 키는 모두 ASCII 숫자로만 이루어져 있으므로 표에 없으면 형식이 틀린 것
+'''
+
+TIMESTAMP_LENGTH = 19
+SECONDS_PER_DAY = 86400
+DATE_CACHE_SIZE = 4096  # 기억해 둘 날짜 수
+
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# "HH:MM" → 초, "SS" → 초 (str 키와 bytes 키 모두)
+_CLOCK = {f'{hour:02d}:{minute:02d}': hour * 3600 + minute * 60 for hour in range(24) for minute in range(60)}
+_SECONDS = {f'{second:02d}': second for second in range(60)}
+_CLOCK_BYTES = {key.encode('ascii'): value for key, value in _CLOCK.items()}
+_SECONDS_BYTES = {key.encode('ascii'): value for key, value in _SECONDS.items()}
+
+
+def _is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def _days_from_civil(year, month, day):
+    # 1970-01-01 로부터 지난 일 수 (그레고리력, 윤년 포함 정수 연산)
+    if month <= 2:
+        year -= 1
+    era = (year if year >= 0 else year - 399) // 400
+    yoe = year - era * 400
+    doy = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def _civil_from_days(days):
+    # _days_from_civil 의 역변환
+    days += 719468
+    era = (days if days >= 0 else days - 146096) // 146097
+    doe = days - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + (3 if mp < 10 else -9)
+    year = yoe + era * 400 + (1 if month <= 2 else 0)
+    return year, month, day
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _date_to_days(date):
+    # "YYYY-MM-DD" (str 또는 bytes) → 1970-01-01 로부터 지난 일 수, 유효하지 않으면 None
+    if isinstance(date, bytes):
+        try:
+            date = date.decode('ascii')
+        except UnicodeDecodeError:
+            return None
+    if date[4] != '-' or date[7] != '-':
+        return None
+    digits = date[0:4] + date[5:7] + date[8:10]
+    # isdigit()만 쓰면 '²' 같은 유니코드 숫자도 통과하므로 ASCII 여부도 확인
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+    year = int(digits[0:4])
+    month = int(digits[4:6])
+    day = int(digits[6:8])
+    if year < 1 or not 1 <= month <= 12:
+        return None
+    max_day = 29 if month == 2 and _is_leap(year) else _DAYS_IN_MONTH[month]
+    if not 1 <= day <= max_day:
+        return None
+    return _days_from_civil(year, month, day)
+
+
+def timestamp_to_epoch(timestamp):
+    '''
+    "YYYY-MM-DD HH:MM:SS" 문자열을 검사하고 epoch 초(int)로 변환합니다.
+
+    Args:
+        timestamp (str): 로그의 timestamp 필드 (앞뒤 공백은 미리 제거)
+
+    Returns:
+        int | None: epoch 초, 형식이나 날짜가 유효하지 않으면 None
+    '''
+    if len(timestamp) != TIMESTAMP_LENGTH or timestamp[10] != ' ' or timestamp[16] != ':':
+        return None
+    clock = _CLOCK.get(timestamp[11:16])
+    second = _SECONDS.get(timestamp[17:19])
+    if clock is None or second is None:
+        return None
+    days = _date_to_days(timestamp[0:10])
+    if days is None:
+        return None
+    return days * SECONDS_PER_DAY + clock + second
+
+
+def timestamp_bytes_to_epoch(raw):
+    '''
+    디코딩하지 않은 19바이트 timestamp(b"YYYY-MM-DD HH:MM:SS")를 검사하고 epoch 초(int)로 변환합니다.
+
+    Args:
+        raw (bytes | memoryview): timestamp 부분의 바이트열 (19바이트)
+
+    Returns:
+        int | None: epoch 초, 형식이나 날짜가 유효하지 않으면 None
+    '''
+    if len(raw) != TIMESTAMP_LENGTH:
+        return None
+    raw = bytes(raw)    # memoryview 는 사전 키로 쓸 수 없으므로 19바이트만 복사
+    # bytes 인덱싱은 정수를 돌려줌: 32 = ' ', 58 = ':'
+    if raw[10] != 32 or raw[16] != 58:
+        return None
+    clock = _CLOCK_BYTES.get(raw[11:16])
+    second = _SECONDS_BYTES.get(raw[17:19])
+    if clock is None or second is None:
+        return None
+    days = _date_to_days(raw[0:10])
+    if days is None:
+        return None
+    return days * SECONDS_PER_DAY + clock + second
+
+
+def epoch_to_timestamp(epoch):
+    '''
+    epoch 초(int)를 "YYYY-MM-DD HH:MM:SS" 문자열로 되돌립니다.
+    '''
+    days, rest = divmod(epoch, SECONDS_PER_DAY)
+    year, month, day = _civil_from_days(days)
+    hour, rest = divmod(rest, 3600)
+    minute, second = divmod(rest, 60)
+    return f"{year:04d}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}:{second:02d}"
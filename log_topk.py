@@ -0,0 +1,78 @@
+import heapq
+import operator
+from itertools import compress, islice
+'''
+전체 정렬 없이 최신 로그만 고르기 / 이미 정렬된 입력은 정렬 생략
+
+1. latest_records: 최신 N건만 필요하면 모든 레코드를 정렬하지 않고
+   크기 N 의 최소 힙(heapq.nlargest)만 유지하면서 한 번 훑음 → O(n log N) 시간, O(N) 메모리
+   결과는 sorted(records, key=..., reverse=True)[:N] 과 같음 (같은 시간이면 먼저 읽은 줄이 먼저)
+2. presorted_direction: 로그는 보통 시간 순서대로 쌓이므로 정렬하기 전에 한 번 훑어서
+   이미 원하는 순서인지(그대로 사용), 반대 순서인지(뒤집기만 하면 됨) 확인
+   뒤집을 때는 같은 시간의 묶음(equal_runs)만 원래 줄 순서로 되돌려서 안정 정렬과 같은 결과를 유지
+   (인덱스 목록을 만들어 열마다 다시 모으지 않으므로 정렬 + 재배열보다 빠름)
+'''
+
+IN_ORDER = 1        # 이미 원하는 순서
+OPPOSITE = -1       # 반대 순서 (뒤집으면 됨)
+
+
+def latest_records(records, n, key=operator.itemgetter(0)):
+    '''
+    가장 최근 레코드 n 건을 최신 순서로 돌려줍니다.
+
+    Args:
+        records (iterable): 레코드 (한 번만 훑으므로 제너레이터도 가능)
+        n (int): 남길 레코드 수
+        key (callable): 시간 비교 키 (기본값: 레코드의 epoch, record[0])
+
+    Returns:
+        list: 최신 n 건 (시간 역순)
+    '''
+    if n <= 0:
+        return []
+    return heapq.nlargest(n, records, key=key)
+
+
+def presorted_direction(keys, reverse=True):
+    '''
+    keys 가 이미 정렬되어 있는지 확인합니다.
+
+    Args:
+        keys (sequence): 정렬 키 (epoch 배열 등)
+        reverse (bool): 원하는 순서, True 면 큰 값(최신)이 먼저
+
+    Returns:
+        int | None: IN_ORDER, OPPOSITE, 정렬되어 있지 않으면 None (일반 정렬로 처리)
+    '''
+    wanted, opposite = (operator.ge, operator.le) if reverse else (operator.le, operator.ge)
+    if all(map(wanted, keys, islice(keys, 1, None))):
+        return IN_ORDER
+    if all(map(opposite, keys, islice(keys, 1, None))):
+        return OPPOSITE
+    return None
+
+
+def equal_runs(keys):
+    '''같은 키가 두 개 이상 이어지는 구간을 (start, stop) 으로 생성합니다.'''
+    start = stop = None
+    # keys[i] == keys[i + 1] 인 i 만 훑으므로 중복이 적으면 거의 바로 끝남
+    for i in compress(range(len(keys) - 1), map(operator.eq, keys, islice(keys, 1, None))):
+        if i + 1 == stop:
+            stop = i + 2
+            continue
+        if start is not None:
+            yield start, stop
+        start, stop = i, i + 2
+    if start is not None:
+        yield start, stop
+
+
+def restore_runs(reversed_keys, *columns):
+    '''
+    뒤집은 열들에서 같은 키 묶음만 다시 뒤집어 원래 순서로 되돌립니다. (열은 제자리에서 수정)
+    sorted(..., reverse=True) 처럼 같은 키 안에서는 입력 순서를 유지하기 위해 사용
+    '''
+    for start, stop in equal_runs(reversed_keys):
+        for column in columns:
+            column[start:stop] = column[start:stop][::-1]
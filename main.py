@@ -1,44 +1,100 @@
 import os
+import csv
 import json
 from datetime import datetime
 import pandas as pd
+from log_compress import LogSizeError, compression_of, is_log_path, open_log
 
 OUTPUT_JSON_FILE = 'mission_computer_main.json'
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+CHUNK_ROWS = 200000     # read_csv 한 번에 읽는 줄 수
+LINE_SEP = '\x1f'       # 로그에 나오지 않는 구분자 → 줄 전체를 열 하나로 읽음
+PANDAS_COMPRESSION = {'gz': 'gzip', 'xz': 'xz', 'zst': 'zstd'}   # log_compress 이름 → read_csv compression
 
 def Hello()->str:
     a = "Hello Mars"
 
     return a
 
+def _read_log_chunks(e):
+    # 줄 전체를 문자열 열 하나로 읽음 (C 엔진, 청크 단위)
+    # 필드 수 검사와 분리는 pandas 문자열 연산으로 청크 전체에 한 번에 처리
+    # 경로면 압축 형식을 확장자 또는 magic bytes 로 알아내서 넘김 (.log.gz 등은 읽으면서 풀림)
+    # 이미 열린 파일(open_log)이면 풀린 내용을 그대로 읽음
+    return pd.read_csv(
+        e, engine='c', sep=LINE_SEP, header=None, names=['line'], dtype={'line': 'string'},
+        quoting=csv.QUOTE_NONE, index_col=False, skip_blank_lines=True, chunksize=CHUNK_ROWS,
+        compression=PANDAS_COMPRESSION.get(compression_of(e)) if isinstance(e, str) else None,
+    )
+
+def load_log_frame(e):
+    '''
+    로그 파일을 DataFrame 으로 읽습니다.
+
+    Returns:
+        tuple: (DataFrame, 필드 수가 맞지 않는 줄 수)
+            timestamp 는 datetime64[ns], event 는 category, message 는 문자열
+    '''
+    frames = []
+    bad_rows = 0
+    header = None
+    for chunk in _read_log_chunks(e):
+        lines = chunk['line'].str.strip()
+        if header is None:
+            if lines.empty:     # 빈 파일도 줄 없는 청크 하나가 나옴
+                continue
+            header = lines.iloc[0].split(',')
+            lines = lines.iloc[1:]
+        lines = lines[lines != '']
+        # tt.split(',') 의 조각 수 == 쉼표 수 + 1
+        valid = lines.str.count(',') == len(header) - 1
+        bad_rows += int((~valid).sum())
+        parts = lines[valid].str.split(',', n=len(header) - 1, expand=True)
+        parts = parts.reindex(columns=range(len(header)))    # 유효한 줄이 없는 청크도 열 수를 맞춤
+        parts.columns = header
+        frames.append(parts)
+
+    if header is None:
+        return pd.DataFrame(), 0
+    text = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=header)
+    text["timestamp"] = pd.to_datetime(text["timestamp"], format=TIMESTAMP_FORMAT, errors='coerce').astype('datetime64[ns]')
+    if "event" in text:
+        text["event"] = text["event"].astype('category')    # 종류가 적은 열은 정수 코드로 저장
+    return text, bad_rows
+
+def export_frame(frame, path):
+    '''
+    DataFrame 을 확장자에 맞는 형식으로 저장합니다.
+    .parquet / .feather 는 pyarrow 가 필요하고, 그 외에는 JSON Lines(orient='records', lines=True) 로 저장
+    '''
+    if path.endswith('.parquet'):
+        frame.to_parquet(path, index=False)
+    elif path.endswith('.feather'):
+        frame.to_feather(path)
+    else:
+        frame.to_json(path, orient='records', lines=True, date_format='iso', force_ascii=False)
+
 def file_read(e):
     MAX_MB = 10
-    kk = []
     try:
-        if not e.endswith(".log"): # endswith 확장자를 체크하는 함수
+        if not is_log_path(e): # .log 와 압축된 .log.gz / .log.xz / .log.zst
             text = "지원하지 않는 파일 확장자입니다."
 
-        size_mb = os.path.getsize(e) / (1024 * 1024)
-
-        if size_mb > MAX_MB:
-            text = "파일 용량이 너무 큽니다."
-
-        with open(e, "r", encoding="utf-8") as f:
-            header = f.readline().strip().split(',')
-            for line in f:
-                tt = line.strip()
-                if not tt:
-                    continue
-
-                values = tt.split(',')
-                if len(values) == len(header):
-                    kk.append(values)
-                else:
-                    text = "필드 수가 맞지 않음"
+        # 용량 제한은 풀린 내용 기준 (read_log_lines(max_bytes=...) 와 같음)
+        # 압축 안 된 파일은 열 때 크기로 바로, 압축 파일은 풀면서 MAX_MB 를 넘는 순간 LogSizeError
+        # (read_csv 가 청크 단위로 풀면서 읽으므로 메모리에 압축을 다 푼 내용이 올라가지 않음)
+        # 한 줄씩 split 해서 리스트에 쌓는 대신 청크 단위로 한 번에 읽고 나눔
+        with open_log(e, 'rb', max_bytes=MAX_MB * 1024 * 1024) as source:
+            text, bad_rows = load_log_frame(source)
+        if bad_rows:
+            print(f"필드 수가 맞지 않음: {bad_rows}줄 제외")
+        if text.columns.empty:
+            # 헤더도 없는 빈 로그 → 필드 수가 맞지 않는 입력과 같은 오류
+            return "필드 수가 맞지 않음"
 
-        text = pd.DataFrame(kk, columns=header)
-        text["timestamp"] = pd.to_datetime(text["timestamp"], format='%Y-%m-%d %H:%M:%S', errors='coerce')
-        text = text.sort_values(by="timestamp").reset_index(drop=True)
-        text = text.to_dict()
+        text = text.sort_values(by="timestamp", kind='stable').reset_index(drop=True)
+        text = text.to_dict(orient='list')
+        # orient='list' 는 열마다 리스트 하나만 만들어서 기본값('dict')보다 빠름
         # to_dict 사전으로 처리
         # to_dict(orient="-") 
         '''
@@ -72,6 +128,8 @@ def file_read(e):
         '''
         #text.to_csv("mission_computer_main.json", orient-"records", force_ascii=False, indent=4)
 
+    except LogSizeError:
+        text = "파일 용량이 너무 큽니다."
     except FileNotFoundError:
         text = "파일이 존재하지 않습니다."
     except UnicodeDecodeError:
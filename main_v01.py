@@ -1,9 +1,16 @@
 import os
-import json
-from datetime import datetime
+import argparse
+from log_timestamp import timestamp_to_epoch
+from log_mmap import read_log_file_mmap
+from log_records import LogRecordStore
+from log_stream import open_record_writer, OUTPUT_FORMATS
+from log_diag import LineDiagnostics
+from log_profile import StageProfiler
+from log_topk import IN_ORDER, OPPOSITE, latest_records, presorted_direction, restore_runs
 
 LOG_FILE = 'mission_computer_main.log'
 OUTPUT_JSON_FILE = 'mission_computer_main.json'
+OUTPUT_JSONL_FILE = 'mission_computer_main.jsonl'
 
 def read_log_file(filename):
     try:
@@ -19,60 +26,159 @@ def read_log_file(filename):
         print(f"❌ 알 수 없는 오류 발생: {e}")
     return []
 
-def parse_log_lines(lines):
+def parse_log_lines(lines, diag=None):
     parsed_list = []
-    for line in lines:
+    for i, line in enumerate(lines, start=1):
+        if diag is not None:
+            diag.read()
         if ',' in line:
             parts = line.strip().split(',', 1)
             timestamp = parts[0].strip()
             message = parts[1].strip()
             parsed_list.append([timestamp, message])
+            if diag is not None:
+                diag.accept()
+        elif diag is not None:
+            diag.skip('쉼표 없음', i, line.strip())
     return parsed_list
 
+def _time_key(item):
+    epoch = timestamp_to_epoch(item[0])
+    if epoch is None:
+        raise ValueError(f"time data '{item[0]}' does not match format '%Y-%m-%d %H:%M:%S'")
+    return epoch
+
 def sort_logs_by_time(log_list):
     try:
         # 날짜/시간 형식이 ISO8601이라고 가정: "YYYY-MM-DD HH:MM:SS"
-        sorted_list = sorted(
-            log_list,
-            key=lambda x: datetime.strptime(x[0], "%Y-%m-%d %H:%M:%S"),
-            reverse=True
-        )
-        return sorted_list
+        # epoch 정수 키를 항목마다 한 번만 계산해 두고 비교함
+        keys = [_time_key(item) for item in log_list]
+        direction = presorted_direction(keys, reverse=True)
+        if direction == IN_ORDER:
+            return list(log_list)
+        if direction == OPPOSITE:
+            # 시간 순서대로 쌓인 로그는 뒤집기만 함 (같은 초의 로그는 원래 순서로 되돌림)
+            sorted_list = log_list[::-1]
+            restore_runs(keys[::-1], sorted_list)
+            return sorted_list
+        order = sorted(range(len(keys)), key=keys.__getitem__, reverse=True)
+        return [log_list[i] for i in order]
     except Exception as e:
         print(f"❌ 정렬 중 오류 발생: {e}")
         return log_list
 
+def latest_logs(log_list, n):
+    # 최신 n 건만 필요하면 전체를 정렬하지 않고 크기 n 의 힙만 유지 (sort_logs_by_time(log_list)[:n] 과 같음)
+    try:
+        return latest_records(log_list, n, key=_time_key)
+    except Exception as e:
+        print(f"❌ 정렬 중 오류 발생: {e}")
+        return log_list[:n]
+
 def convert_list_to_dict(log_list):
     log_dict = {}
     for timestamp, message in log_list:
         log_dict[timestamp] = message
     return log_dict
 
-def save_dict_to_json(data, filename):
+def convert_list_to_store(log_list):
+    # dict 는 같은 timestamp 의 로그를 마지막 하나만 남기므로 모든 로그를 순서대로 보존
+    log_store = LogRecordStore()
+    for timestamp, text in log_list:
+        epoch = timestamp_to_epoch(timestamp)
+        if epoch is None:
+            continue
+        event, _, message = text.partition(',')
+        log_store.append(epoch, message.strip(), event.strip())
+    return log_store
+
+def save_store_to_jsonl(log_store, filename):
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        log_store.write_ndjson(filename)
+        print(f"✅ '{filename}' 파일로 저장 완료. ({len(log_store)}건)")
+    except Exception as e:
+        print(f"❌ JSONL 저장 중 오류 발생: {e}")
+
+def save_dict_to_json(data, filename, output_format='json'):
+    try:
+        # json.dump(data, f, ensure_ascii=False, indent=4) 와 같은 내용을 한 항목씩 저장
+        # output_format='compact' 면 들여쓰기/공백 없이 저장
+        with open_record_writer(filename, output_format) as writer:
+            for timestamp, message in data.items():
+                writer.write((None, timestamp, message, ''))
         print(f"✅ '{filename}' 파일로 저장 완료.")
     except Exception as e:
         print(f"❌ JSON 저장 중 오류 발생: {e}")
 
-def main():
-    lines = read_log_file(LOG_FILE)
-    if not lines:
-        return
+def main(use_mmap=False, output_format='json', verbose=0, latest=None, profiler=None):
+    diag = LineDiagnostics('main_v01', verbose)
+    profiler = profiler or StageProfiler()  # 기본값은 측정하지 않음
+    if use_mmap:
+        # mmap 리더: 읽기 + 파싱을 한 번에 처리하고 유효한 timestamp 줄만 디코딩
+        profiler.begin('read+parse')
+        log_list = read_log_file_mmap(LOG_FILE)
+        profiler.end(records_out=len(log_list or ()))
+        if not log_list:
+            return
+        # mmap 리더는 유효한 줄만 돌려주므로 건너뛴 줄은 따로 세지 않음
+        diag.read(len(log_list))
+        diag.accept(len(log_list))
+    else:
+        profiler.begin('read')
+        lines = read_log_file(LOG_FILE)
+        profiler.end(records_out=len(lines or ()))
+        if not lines:
+            return
 
-    log_list = parse_log_lines(lines)
-    print("\n📄 원본 리스트 출력:")
-    for item in log_list:
-        print(item)
+        profiler.begin('parse', records_in=len(lines))
+        log_list = parse_log_lines(lines, diag)
+        profiler.end(records_out=len(log_list))
+    # 항목마다 print 하지 않고 요약만 출력 (-vv 면 전체 리스트 출력)
+    print(diag.summary())
+    diag.dump('원본 리스트', '\n'.join(map(str, log_list)))
 
-    sorted_list = sort_logs_by_time(log_list)
-    print("\n📄 시간 역순 정렬된 리스트 출력:")
-    for item in sorted_list:
-        print(item)
+    profiler.begin('sort', records_in=len(log_list))
+    if latest:
+        sorted_list = latest_logs(log_list, latest)    # 최신 latest 건만 저장
+    else:
+        sorted_list = sort_logs_by_time(log_list)
+    profiler.end(records_out=len(sorted_list))
+    diag.dump('시간 역순 정렬된 리스트', '\n'.join(map(str, sorted_list)))
 
+    profiler.begin('json', records_in=len(sorted_list))
     log_dict = convert_list_to_dict(sorted_list)
-    save_dict_to_json(log_dict, OUTPUT_JSON_FILE)
+    if output_format != 'ndjson':   # ndjson 이면 아래 JSONL 파일만 저장
+        save_dict_to_json(log_dict, OUTPUT_JSON_FILE, output_format)
+    profiler.end(records_out=len(log_dict))
+    profiler.begin('jsonl', records_in=len(sorted_list))
+    save_store_to_jsonl(convert_list_to_store(sorted_list), OUTPUT_JSONL_FILE)
+    profiler.end(records_out=len(sorted_list))
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description="mission_computer_main.log → JSON 변환")
+    parser.add_argument('--mmap', action='store_true', help="mmap 기반 리더로 읽기 (대용량 파일용)")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='json', dest='output_format',
+                        help="JSON 출력 형식: json(들여쓰기), compact(공백 없음), ndjson(JSONL 만 저장)")
+    parser.add_argument('-v', '--verbose', action='count', default=0,
+                        help="진단 출력: -v 건너뛴 줄 일부, -vv 전체 리스트까지 (기본값: 요약만)")
+    parser.add_argument('--latest', type=int, metavar='N',
+                        help="전체를 정렬하지 않고 최신 N건만 저장")
+    parser.add_argument('--profile', action='store_true',
+                        help="단계별 실행 시간/메모리 측정 결과를 표로 출력")
+    parser.add_argument('--profile-json', metavar='PATH',
+                        help="단계별 측정 결과를 JSON 파일로 저장 (--profile 포함)")
+    args = parser.parse_args()
+    if args.latest is not None and args.latest < 1:
+        parser.error("--latest 는 1 이상이어야 합니다.")
+    profiler = StageProfiler(enabled=args.profile or bool(args.profile_json))
+    try:
+        main(use_mmap=args.mmap, output_format=args.output_format, verbose=args.verbose, latest=args.latest,
+             profiler=profiler)
+    finally:
+        profiler.stop()
+    if profiler.enabled:
+        print("\n⏱ 단계별 측정 결과")
+        print(profiler.format_table())
+        if args.profile_json:
+            profiler.save_json(args.profile_json)
+            print(f"✅ 측정 결과 저장 완료: {args.profile_json}")
@@ -1,12 +1,39 @@
 import os                           # os 모듈은 운영체제와 상호 작용할 수 있는 기능 제공
+import io                           # 보고서 머리말을 문자열로 만들어 기존 보고서와 비교
+import mmap                         # 증분 처리에서 기존 보고서의 위험 로그 행 구간을 찾음
 import json                         # python 객체(딕셔너리, 리스트등)를 JSON 파일로 저장, 파일읽기에 사용
-from datetime import datetime       # datetime 클래스는 날짜와 시간 관련 작업처리 여기서는 문자열을 날짜형식으로 변경하는데 사용
+import time                         # --follow 모드에서 다음 확인까지 대기
+import heapq                        # 정렬된 기존 JSON 과 새 레코드 병합
+import glob                         # 여러 로그 파일 병합 시 glob 패턴 판별
+import argparse                     # 명령행 옵션(--stream 등) 처리
+from itertools import chain         # --latest 에서 여러 로그 파일을 이어서 읽음
+from collections import Counter     # 위험 키워드별 건수 집계
+from contextlib import nullcontext  # --format ndjson 일 때 JSON writer 자리를 비워 둠
 '''
 - 이 코드는 mission_computer_main.log 파일을 읽고:
 - 각 줄에서 타임스탬프와 메시지를 분리한 후,
 - 유효한 날짜 형식만 골라내고,
 - 시간 기준으로 역순 정렬한 뒤,
 - 그 결과를 JSON 파일(mission_computer_main.json)로 저장하는 프로그램입니다.
+- JSON 은 timestamp 가 키라서 같은 초의 이벤트는 마지막 것만 남으므로
+  모든 이벤트는 JSON Lines 파일(mission_computer_main.jsonl)에 따로 저장하고
+  검색/시간 구간 조회/증분 처리는 이 파일을 사용합니다.
+- --cache 를 주면 파싱/정렬 결과를 .log_cache/ 에 저장해 두고
+  로그 파일이 바뀌지 않았으면 다음 실행에서 파싱 없이 캐시에서 바로 읽음
+- --format 으로 JSON 출력 형식 선택: json(들여쓰기, 기본값), compact(공백 없음),
+  ndjson(mission_computer_main.json 은 만들지 않고 JSONL 만 저장)
+- 보관된 압축 로그(.log.gz, .log.xz, .log.zst)도 풀지 않고 바로 처리 (log_compress)
+  용량 제한(MAX_MB)은 풀린 내용 기준
+- --compress gz|xz|zst 를 주면 JSON 을 mission_computer_main.json.gz 처럼 압축해서 저장하고
+  JSONL 도 압축본(mission_computer_main.jsonl.gz)을 함께 저장
+  (검색/시간 구간 색인은 바이트 위치로 읽으므로 압축하지 않은 JSONL 은 그대로 유지)
+- 결과를 저장하는 같은 훑기에서 분/시간 단위 event·위험 키워드 건수, 처음/마지막 발생 시각,
+  로그 공백 구간도 집계해서 mission_computer_main.stats.json 과 log_analysis.md 에 저장 (log_stats)
+- --pipeline 은 읽기 스레드 → 파싱/정렬 스레드 → 저장(호출한 스레드)을 크기가 정해진 큐로 이어서
+  디스크 읽기/쓰기와 파싱을 겹쳐서 실행 (log_pipeline, --workers 를 함께 주면 파싱은 프로세스들이 처리)
+- --search-file 은 검색어 파일의 검색어/정규식을 한 번에 컴파일해서 JSONL 을 한 번만 훑고
+  검색어마다 건수와 결과를 출력 (log_batch_search, 대화형 검색 없이 실행)
+- --latest N 은 전체를 정렬하지 않고 한 줄씩 읽으면서 크기 N 의 힙만 유지해서 최신 N건만 출력
 
 1. 파일 확장자 검사
 2. 파일 용량 제한(10MB 이하)
@@ -20,35 +47,216 @@ json.dump(data, file, ensure_ascii=False, indent=4)  # 데이터를 JSON으로 
  - ensure_ascii=False: 한글 깨짐 방지
  - indent=4: 예쁘게 들여쓰기
 '''
+from log_stream import (iter_log_records, sort_records_external, open_record_writer, prepend_json_records,
+                        OUTPUT_FORMATS)
+from log_records import (LogRecordStore, NdjsonWriter, iter_ndjson_by_time, ndjson_segment_starts,
+                         save_ndjson_segments)   # 같은 초의 이벤트도 모두 보존
+from log_parallel import parallel_sorted_records
+from log_pipeline import pipelined_sorted_records   # 읽기/파싱/쓰기를 스레드로 겹쳐서 실행
+from log_merge import expand_log_sources, merged_sorted_records   # 여러 로그 파일 k-way 병합
+from keyword_matcher import KeywordMatcher   # 여러 위험 키워드를 한 번에 찾는 Aho-Corasick 매처
+from log_index import LogIndexWriter, build_log_index, load_log_index   # 검색용 역색인 (디스크 세그먼트)
+from log_time_index import TimeIndexWriter, build_time_index, load_time_index   # 시간 구간 색인
+from log_checkpoint import (checkpoint_path_for, load_checkpoint_offset, save_checkpoint,
+                            complete_lines_end, iter_records_between)   # 증분 처리 체크포인트
+from log_timestamp import timestamp_to_epoch   # 문자열 timestamp → epoch 초(int) 변환 (strptime 대체)
+from log_diag import LineDiagnostics   # 줄 단위 print 대신 건수 요약 (-v 로 상세 출력)
+from log_profile import StageProfiler, run_with_cprofile   # --profile 단계별 시간/메모리 측정
+from log_compress import (COMPRESSIONS, LogSizeError, compression_of, is_log_path,
+                          read_log_lines)   # .log.gz / .log.xz / .log.zst 입력, 압축 출력
+from log_topk import latest_records   # --latest: 크기 N 힙으로 최신 N건만 선택
+from log_batch_search import batch_search, load_queries, save_results   # 여러 검색어 일괄 검색
+from log_stats import LogStats   # 분/시간 단위 건수, 처음/마지막 발생, 공백 구간 집계
+try:
+    from log_cache import (LogCacheWriter, load_log_cache, outputs_up_to_date,
+                           save_output_stamps)   # 파싱 결과 캐시 (numpy 필요)
+except ImportError:
+    LogCacheWriter = load_log_cache = outputs_up_to_date = save_output_stamps = None
 
 LOG_FILE = 'mission_computer_main.log'
 OUTPUT_JSON_FILE = 'mission_computer_main.json'
+OUTPUT_JSONL_FILE = 'mission_computer_main.jsonl'   # 모든 이벤트 (한 줄에 레코드 하나)
 MAX_MB = 10
 LOG_MD_FILE = 'log_analysis.md'
+OUTPUT_STATS_FILE = 'mission_computer_main.stats.json'   # 집계 요약
+DANGER_KEYWORD = ['폭발', '누출', '고온', 'Oxygen']
+FOLLOW_INTERVAL = 1.0   # --follow 모드 확인 간격(초)
+MAX_JSONL_SEGMENTS = 32   # 증분 처리로 이어 붙인 JSONL 구간이 이만큼 쌓이면 전체를 다시 써서 하나로 합침
+COPY_BLOCK = 1024 * 1024   # 증분 처리에서 기존 보고서 행을 복사하는 단위(바이트)
 
 def Hello() -> str:
     return "Hello Mars"
 
-def read_and_process_log(file_path):
-    log_list = []
-    danger_keyword = ['폭발', '누출', '고온', 'Oxygen']
+# 위험 키워드 매처는 한 번만 만들어 두고 모든 메시지에 재사용
+# (키워드가 수백 개로 늘어나도 메시지당 한 번만 훑음)
+DANGER_MATCHER = KeywordMatcher(DANGER_KEYWORD)
+
+def is_danger(message):
+    # 위험 로그 키워드 검색 (대소문자 구분 없이)
+    return DANGER_MATCHER.search(message)
+
+def _write_danger_header(d):
+    d.write("# ⚠️ 위험 로그 보고서\n\n")
+    d.write("다음은 위험 키워드가 포함된 로그 목록입니다.\n\n")
+    d.write("| Timestamp | Message |\n")
+    d.write("|-----------|---------|\n")
+
+def _write_keyword_counts(d, keyword_counts):
+    # 키워드별 건수 표 (한 메시지에 여러 키워드가 있으면 키워드마다 1건씩)
+    d.write("\n## 키워드별 건수\n\n")
+    d.write("| Keyword | Count |\n")
+    d.write("|---------|-------|\n")
+    for keyword in DANGER_KEYWORD:
+        d.write(f'| {keyword} | {keyword_counts[keyword]} |\n')
+
+def _write_stats(d, stats, stats_path=OUTPUT_STATS_FILE):
+    # 보고서 끝에 집계 표를 붙이고 요약 파일 저장
+    stats.write_markdown(d, DANGER_KEYWORD)
+    stats.save(stats_path)
+
+def write_danger_report(records):
+    # 위험 키워드가 포함된 로그만 Markdown 표로 저장하고, 같은 훑기에서 시간대별 집계도 함께 계산
+    # records: 시간 역순으로 정렬된 (epoch, timestamp, message, event) 레코드
+    keyword_counts = Counter()
+    stats = LogStats()
+    with open(LOG_MD_FILE, 'w', encoding='utf-8') as d:
+        _write_danger_header(d)
+        for record in records:
+            hits = DANGER_MATCHER.find_all(record[2])
+            stats.add_record(record, hits)
+            if hits:
+                keyword_counts.update(hits)
+                d.write(f'| {record[1]} | {record[2]} |\n')
+        _write_keyword_counts(d, keyword_counts)
+        _write_stats(d, stats)
+
+def print_danger_report():
+    # 저장된 내용 출력
+    with open(LOG_MD_FILE, 'r', encoding='utf-8') as danger:
+        for line in danger:
+            print(line.strip())
+
+def search_log_json():
+    search_term = input("\n🔍 검색할 키워드를 입력하세요 (공백=AND, OR 사용 가능): ").strip()
+
+    try:
+        # 처리 단계에서 저장한 역색인이 있으면 posting list 교집합/합집합으로 검색
+        index = load_log_index(OUTPUT_JSONL_FILE)
+        if index is None:
+            # 색인이 없거나 JSONL 이 바뀌었으면 JSONL 을 한 줄씩 읽어서 다시 만듦
+            index = build_log_index(OUTPUT_JSONL_FILE)
+        with index:
+            rows = index.search(OUTPUT_JSONL_FILE, search_term)
+        print(f"\n🔎 '{search_term}'이(가) 포함된 로그:")
+        print("-" * 50)
+        for timestamp, message in rows:
+            print(f"{timestamp} | {message}")
+    except FileNotFoundError:
+        print("❌ 검색용 JSON 파일을 찾을 수 없습니다.")
+    except json.JSONDecodeError:
+        print("❌ JSON 파일 파싱 오류.")
+
+def query_time_range(start, end):
+    '''
+    처리된 JSON 에서 start ~ end (양 끝 포함) 사이의 로그를 출력합니다.
+    저장된 시간 색인을 bisect 로 찾으므로 로그 파일을 다시 파싱하지 않음
+    '''
+    try:
+        time_index = load_time_index(OUTPUT_JSONL_FILE)
+        if time_index is None:
+            time_index = build_time_index(OUTPUT_JSONL_FILE)
+        with time_index:
+            rows = time_index.query_range(start, end)
+    except FileNotFoundError:
+        return "❌ 처리된 JSON 파일이 없습니다. 먼저 로그를 처리하세요."
+    except ValueError as ve:
+        return f"❌ {ve}"
+
+    print(f"\n🕒 {start} ~ {end} 로그 ({len(rows)}건):")
+    print("-" * 50)
+    for timestamp, message in rows:
+        print(f"{timestamp} | {message}")
+
+def batch_search_log(query_file, source=OUTPUT_JSONL_FILE, limit=None, output=None):
+    '''
+    검색어 파일의 모든 검색어를 source 를 한 번만 훑어서 검색하고 검색어별 건수를 출력합니다.
+
+    Args:
+        query_file (str): 검색어 파일 (한 줄에 하나, 're:' 로 시작하면 정규식)
+        source (str): 처리된 JSONL (기본값) 또는 로그 파일
+        limit (int, optional): 검색어마다 출력/저장할 최대 결과 수
+        output (str, optional): 전체 결과를 JSON Lines 로 저장할 경로
+    '''
+    try:
+        queries = load_queries(query_file)
+        if not queries:
+            return f"❌ '{query_file}' 에 검색어가 없습니다."
+        results = batch_search(source, queries, limit)
+    except FileNotFoundError as e:
+        return f"❌ 오류: 파일이 존재하지 않습니다. ({e.filename})"
+    except ValueError as ve:
+        return f"❌ {ve}"
+    except Exception as e:
+        return f"❌ 알 수 없는 오류 발생: {e}"
+
+    print(f"\n🔎 검색어 {len(results)}개 일괄 검색: {source}")
+    print("-" * 50)
+    for result in results:
+        label = f"re:{result['query']}" if result['regex'] else result['query']
+        print(f"{label} | {result['count']}건")
+        if output is None:
+            for timestamp, event, message in result['hits']:
+                print(f"    {timestamp} | {event} | {message}")
+    if output is not None:
+        save_results(results, output)
+        print(f"✅ 검색 결과 저장 완료: {output}")
+
+def print_latest_logs(source, n):
+    '''
+    로그 파일(또는 디렉터리/glob 패턴의 여러 파일)에서 가장 최근 n 건을 최신 순서로 출력합니다.
+    한 줄씩 읽으면서 크기 n 의 힙만 유지하므로 O(전체 줄 수 × log n) 시간, O(n) 메모리
+    결과 파일(JSON, JSONL, 색인)은 만들지 않음
+    '''
+    try:
+        file_paths = expand_log_sources(source) if _is_multi_source(source) else [source]
+        if not file_paths:
+            return f"❌ 오류: '{source}' 에 해당하는 .log(.gz/.xz/.zst) 파일이 없습니다."
+        if not all(is_log_path(path) for path in file_paths):
+            return "❌ 지원하지 않는 파일 확장자입니다."
+        records = chain.from_iterable(iter_log_records(path) for path in file_paths)
+        rows = latest_records(records, n)
+    except FileNotFoundError:
+        return "❌ 오류: 파일이 존재하지 않습니다."
+    except UnicodeDecodeError:
+        return "❌ 오류: 디코딩 실패 (UTF-8 인코딩 확인)"
+    except Exception as e:
+        return f"❌ 알 수 없는 오류 발생: {e}"
+
+    print(f"\n🕒 최신 로그 {len(rows)}건:")
+    print("-" * 50)
+    for _, timestamp, message, event in rows:
+        print(f"{timestamp} | {event} | {message}")
+
+def read_and_process_log(file_path, output_format='json', verbose=0, profiler=None, compress=None):
+    log_store = LogRecordStore()
+    diag = LineDiagnostics('main_v02', verbose)
+    profiler = profiler or StageProfiler()  # 기본값은 측정하지 않음
 
     try:
-        # 확장자 체크
-        if not file_path.endswith('.log'): 
+        # 확장자 체크 (.log 와 압축된 .log.gz / .log.xz / .log.zst)
+        if not is_log_path(file_path):
             return "❌ 지원하지 않는 파일 확장자입니다."
         #endswith()은 끝나는 문자열을 검사
         #startswith()는 시작하는 문자열을 검사
 
-        # 파일 용량 체크
-        size_mb = os.path.getsize(file_path) / (1024 * 1024)
-        if size_mb > MAX_MB:
+        # 파일 읽기 + 용량 체크
+        # 압축 파일은 디스크 크기가 아니라 풀린 내용이 MAX_MB 를 넘는지 검사 (넘으면 읽기 중단)
+        profiler.begin('read')
+        try:
+            lines = read_log_lines(file_path, max_bytes=MAX_MB * 1024 * 1024)
+        except LogSizeError:
             return "❌ 파일 용량이 너무 큽니다."
-        # 파일 크기를 바이트 → MB로 변환하여 MAX_MB보다 크면 에러 반환
-
-        # 파일 읽기
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines() 
+        profiler.end(records_out=len(lines))
         # readlines 모든 줄을 리스트로 가져옵니다
         # read() 전체 내용을 문자열 하나로 변환
         # 아래 내용을 기반으로 간단한 파일이기 때문에 readlines를 사용
@@ -69,9 +277,8 @@ def read_and_process_log(file_path):
         대용량 파일에는 for line in file 방식이 가장 효율적
         '''
 
-        print("\n📄 [전체 로그 파일 내용 출력]") # 디버깅 용도 출력
-        for line in lines:
-            print(line.strip()) 
+        # 디버깅 용도 출력 (-vv 일 때만, 큰 로그에서는 출력이 처리보다 오래 걸림)
+        diag.dump('전체 로그 파일 내용', ''.join(lines))
         # strip() 불필요한 공백이나 특정 문자를 제거할 때 사용
         # lstrip() 문자열에 왼쪽에 있는 불필요한 공백이나 특정 문자 제거
         # rstrip() 문자열에 오른쪽에 있는 불필요한 공백이나 특정 문자 제거
@@ -83,7 +290,8 @@ def read_and_process_log(file_path):
         중간 문자 제거하기 위해서는 "replace()" 변환함수를 사용하여 처리
         '''
 
-        # 날짜와 메시지 분리
+        # 날짜와 메시지 분리 (split + timestamp 검사)
+        profiler.begin('parse', records_in=len(lines))
         for i, line in enumerate(lines, start=1):
             '''
             enumerate()는 반복 가능한 객체(iterable)를 받아서,
@@ -97,14 +305,18 @@ def read_and_process_log(file_path):
 
             그러나 enumarate()를 사용하면 휠씬 직관적이고 안전함.
             '''
+            diag.read()
             line = line.strip()
             if not line:
-                print(f"[line {i}] 빈 줄 건너뜀")
+                diag.skip('빈 줄', i)
                 continue
             if ',' not in line:
-                print(f"[line {i}] 쉼표 없음 → 무시됨: {line}")
+                diag.skip('쉼표 없음', i, line)
                 continue
             parts = line.split(',', 2)
+            if len(parts) < 3:
+                diag.skip('필드 부족', i, line)
+                continue
             '''
             line.split(',', 1)는 ,를 기준으로 
             2조각(1로 지정된 부분에 숫자에 따라 나누는 수가 정해짐)으로 
@@ -131,31 +343,40 @@ def read_and_process_log(file_path):
             단순성 + 안전성 때문에 대부분 split(',', 1)을 사용합니다.
             '''
             timestamp = parts[0].strip()
+            event = parts[1].strip()
             message = parts[2].strip()
 
-            try:
-                datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
-                '''
-                strptime() = string parse time
-                문자열을 datetime 형식으로 변환
-                형식이 맞아야만 변환됨. 틀리면 ValueError 예외 발생
-                '''
-            except ValueError:
+            epoch = timestamp_to_epoch(timestamp)
+            '''
+            timestamp_to_epoch() = log_timestamp 모듈의 고정 형식 변환기
+            "%Y-%m-%d %H:%M:%S" 형식을 슬라이싱과 정수 연산으로 검사하고 epoch 초(int)로 변환
+            형식이 틀리면 None 반환 (datetime.strptime 보다 훨씬 빠름)
+            변환한 값은 레코드에 함께 저장해서 정렬할 때 다시 파싱하지 않음
+            '''
+            if epoch is None:
+                diag.skip('날짜 형식 오류', i, line)
                 continue  # 날짜 형식이 맞지 않으면 건너뜀
             
-            log_list.append((timestamp, message))
+            diag.accept()
+            log_store.append(epoch, message, event)
+            '''
+            (timestamp, message) 튜플 리스트 대신 열별 저장소(log_records.LogRecordStore)에 추가
+            epoch 는 array('q'), event 는 종류 번호로 저장해서 메모리를 적게 씀
+            timestamp 를 키로 쓰지 않으므로 같은 초에 여러 이벤트가 있어도 모두 남음
+            '''
 
-        print("\n📄 [리스트 객체 출력]")
-        print(log_list)
+        profiler.end(records_out=len(log_store))
+        print(diag.summary())
+        diag.dump('리스트 객체', log_store)
 
         # 시간 역순 정렬
+        profiler.begin('sort', records_in=len(log_store))
         try:
-            sorted_list = sorted(
-                log_list,
-                key=lambda x: datetime.strptime(x[0], "%Y-%m-%d %H:%M:%S"),
-                reverse=True
-            )
+            sorted_list = log_store.sorted_by_time(reverse=True)
             '''
+            sorted_by_time() 은 저장해 둔 epoch 정수로 정렬 (줄마다 strptime 을 다시 호출하지 않음)
+            안정 정렬이므로 같은 초의 이벤트는 원래 줄 순서가 유지됨
+
             reverse=True
             기본 정렬은 오름차순 (과거 → 미래)
             reverse=True를 주면 내림차순 (미래 → 과거)
@@ -167,35 +388,31 @@ def read_and_process_log(file_path):
             작성하는 것이 휠씬 깔끔합니다
             lambda 매개변수: 리턴값 형태
 
-            lambda를 사용하지 않고 처리 방법
-            def get_datetime(log_entry):
-                return datetime.strptime(log_entry[0], "%Y-%m-%d %H:%M:%S")
-            sorted_list = sorted(log_list, key=get_datetime, reverse=True)
+            lambda를 사용하지 않고 처리 방법 (튜플 리스트를 정렬하는 경우)
+            def get_epoch(log_entry):
+                return log_entry[0]
+            sorted_list = sorted(log_list, key=get_epoch, reverse=True)
             위 형식으로 처리도 가능 
 
             lambda는 작고 일회성인 함수를 짧게 작성할 때 매우 유용
             정렬할 때 key=lambda ...는 거의 표준처럼 쓰이는 패턴
-            datetime.strptime(...)은 문자열 → 날짜로 바꿔서 정확한 
+            epoch 정수는 문자열 → 시간으로 바꾼 값이라 정확한 
             시간 비교를 가능하게 함
             reverse=True로 최신 로그가 먼저 오도록 정렬
             '''
         except ValueError as ve:
             return f"❌ 시간 파싱 오류: {ve}"
+        profiler.end(records_out=len(sorted_list))
 
-        print("\n📄 [시간 역순 정렬된 리스트 출력]")
-        print(sorted_list)
-
-        # 리스트 → 딕셔너리 변환
-        #log_dict = {timestamp: message for timestamp, message in sorted_list}
-        log_dict = dict(sorted_list)
-        # log_dict = {timestamp: message for timestamp, message in sorted_list if "에러" in message}
-        # 메세지에 "에러"가 포함된 딕셔너리에 추가
-
-        print(f"\n✅ [딕셔너리 데이터 출력]")
-        print(log_dict)
+        diag.dump('시간 역순 정렬된 리스트', sorted_list)
 
-        print('-------------')
-        print(log_dict)
+        # 저장소 → 딕셔너리 변환 (예전 JSON 출력 형식, 디버깅 출력용)
+        # timestamp 가 키라서 같은 초의 이벤트는 마지막 것만 남음 → 모든 이벤트는 JSONL 로 따로 저장
+        if verbose >= 2:
+            log_dict = sorted_list.to_dict()
+            # log_dict = {timestamp: message for timestamp, message in sorted_list if "에러" in message}
+            # 메세지에 "에러"가 포함된 딕셔너리에 추가
+            diag.dump('딕셔너리 데이터', log_dict)
         #return log_dict
     
         '''
@@ -238,52 +455,44 @@ def read_and_process_log(file_path):
         그러나 데이터에는 key마다 value값이 다르면 사용하지 않는다
 
         '''
-        # 딕셔너리 → JSON 파일 저장
-        with open(OUTPUT_JSON_FILE, 'w', encoding='utf-8') as json_file:
-            json.dump(log_dict, json_file, ensure_ascii=False, indent=4)
-
-        print(f"\n✅ JSON 파일 저장 완료: {OUTPUT_JSON_FILE}")
+        # 정렬된 레코드 → JSON 파일 저장
+        # json.dump(log_dict, ...) 처럼 dict 전체를 한 번에 쓰지 않고 한 항목씩 저장 (내용은 같음)
+        profiler.begin('json', records_in=len(sorted_list))
+        if output_format != 'ndjson':
+            json_path = _output_path(OUTPUT_JSON_FILE, compress)
+            with open_record_writer(json_path, output_format) as writer:
+                for record in sorted_list:
+                    writer.write(record)
+            print(f"\n✅ JSON 파일 저장 완료: {json_path}")
         #return log_dict
 
-        # 위험 로그 키워드 검색
-        danger_log = [
-            (timestamp, message)
-            for timestamp, message in log_dict.items()
-            if any(k.lower() in message.lower() for k in danger_keyword)
-        ]
-
-        # Markdown 저장
-        with open(LOG_MD_FILE, 'w', encoding='utf-8') as d:
-            d.write("# ⚠️ 위험 로그 보고서\n\n")
-            d.write("다음은 위험 키워드가 포함된 로그 목록입니다.\n\n")
-            d.write("| Timestamp | Message |\n")
-            d.write("|-----------|---------|\n")
-            for log in danger_log:
-                d.write(f'| {log[0]} | {log[1]} |\n')
-
-        # 저장된 내용 출력
-        with open('log_analysis.md', 'r', encoding='utf-8') as danger:
-            for line in danger:
-                print(line.strip())
+        # 모든 이벤트를 한 줄에 하나씩 JSON Lines 로 저장
+        sorted_list.write_ndjson(OUTPUT_JSONL_FILE)
+        save_ndjson_segments(OUTPUT_JSONL_FILE, [0])    # 증분 처리로 이어 붙였던 구간 기록은 지움
+        print(f"✅ JSONL 파일 저장 완료: {OUTPUT_JSONL_FILE} ({len(sorted_list)}건)")
+        if compress:
+            sorted_list.write_ndjson(_output_path(OUTPUT_JSONL_FILE, compress))
+        profiler.end(records_out=len(sorted_list))
 
-        # 🔍 검색 기능
-        search_term = input("\n🔍 검색할 키워드를 입력하세요: ").lower()
+        # 검색용 역색인과 시간 구간 색인을 만들어 JSONL 옆에 저장
+        # (mission_computer_main.index.json, mission_computer_main.times.bin)
+        profiler.begin('index', records_in=len(sorted_list))
+        build_log_index(OUTPUT_JSONL_FILE).close()
+        build_time_index(OUTPUT_JSONL_FILE).close()
+        profiler.end()
 
-        try:
-            with open(OUTPUT_JSON_FILE, 'r', encoding='utf-8') as f:
-                search_data = json.load(f)
-                print(f"\n🔎 '{search_term}'이(가) 포함된 로그:")
-                print("-" * 50)
-                for timestamp, message in search_data.items():
-                    if search_term in message.lower():
-                        print(f"{timestamp} | {message}")
-        except FileNotFoundError:
-            print("❌ 검색용 JSON 파일을 찾을 수 없습니다.")
-        except json.JSONDecodeError:
-            print("❌ JSON 파일 파싱 오류.")
+        # 위험 로그 보고서 + 시간대별 집계 저장 및 출력 (같은 초의 이벤트도 모두 검사)
+        profiler.begin('report', records_in=len(sorted_list))
+        write_danger_report(sorted_list)
+        print(f"✅ 집계 저장 완료: {OUTPUT_STATS_FILE}")
+        print_danger_report()
+        profiler.end()
 
+        # 🔍 검색 기능 (wall 에는 검색어 입력 대기 시간도 포함됨)
+        profiler.begin('search')
+        search_log_json()
+        profiler.end()
 
-        
     except FileNotFoundError:
         return "❌ 오류: 파일이 존재하지 않습니다."
     except UnicodeDecodeError:
@@ -293,9 +502,523 @@ def read_and_process_log(file_path):
     except Exception as e:
         return f"❌ 알 수 없는 오류 발생: {e}"
 
+def _write_outputs(records, hits_of, output_format='json', cache_writer=None, compress=None):
+    '''
+    시간 역순으로 정렬된 레코드를 한 번 훑으면서 JSON, JSONL, 위험 로그 보고서, 검색 색인, 집계를 함께 저장합니다.
+    결과 파일은 임시 파일에 쓴 뒤 교체하므로 기존 JSONL 을 읽으면서 병합하는 레코드도 받을 수 있음
+    compress 를 주면 JSON 은 압축해서 저장하고 JSONL 압축본도 같은 훑기에서 함께 저장
+    검색 색인과 시간 색인은 디스크에 청크로 내보내면서 만들므로 레코드 수와 관계없이 메모리 사용량이 일정함
+    '''
+    keyword_counts = Counter()
+    stats = LogStats()
+    index_writer = LogIndexWriter(OUTPUT_JSONL_FILE)   # JSONL 을 쓰면서 검색용 역색인과 시간 구간 색인도 함께 만듦
+    time_writer = TimeIndexWriter(OUTPUT_JSONL_FILE)
+    json_path = _output_path(OUTPUT_JSON_FILE, compress)
+    jsonl_copy_path = _output_path(OUTPUT_JSONL_FILE, compress) if compress else None
+    tmp_json = _tmp_path(json_path)
+    tmp_jsonl = _tmp_path(OUTPUT_JSONL_FILE)
+    try:
+        # ndjson 형식이면 JSONL 이 곧 결과 파일이므로 {timestamp: message} JSON 은 만들지 않음
+        json_output = open_record_writer(tmp_json, output_format) if output_format != 'ndjson' else nullcontext()
+        jsonl_copy = NdjsonWriter(_tmp_path(jsonl_copy_path)) if compress else nullcontext()
+        with open(LOG_MD_FILE, 'w', encoding='utf-8') as d, json_output as json_writer, \
+                NdjsonWriter(tmp_jsonl) as jsonl_writer, jsonl_copy as jsonl_copy_writer:
+            _write_danger_header(d)
+            for record in records:
+                if json_writer is not None:
+                    json_writer.write(record)
+                offset = jsonl_writer.write(record)
+                if jsonl_copy_writer is not None:
+                    jsonl_copy_writer.write(record)
+                if cache_writer is not None:
+                    cache_writer.add_record(record)
+                index_writer.add_record(offset, record)
+                time_writer.add_record(offset, record)
+                hits = hits_of(record)
+                stats.add_record(record, hits)
+                if hits:
+                    keyword_counts.update(hits)
+                    d.write(f'| {record[1]} | {record[2]} |\n')
+            _write_keyword_counts(d, keyword_counts)
+            _write_stats(d, stats)
+            count = jsonl_writer.count
+        if json_writer is not None:
+            os.replace(tmp_json, json_path)
+        os.replace(tmp_jsonl, OUTPUT_JSONL_FILE)
+        save_ndjson_segments(OUTPUT_JSONL_FILE, [0])    # 다시 쓴 JSONL 은 시간 역순 구간 하나
+        if jsonl_copy_writer is not None:
+            os.replace(_tmp_path(jsonl_copy_path), jsonl_copy_path)
+        index_writer.commit()
+        time_writer.commit()
+    except BaseException:
+        index_writer.discard()
+        time_writer.discard()
+        raise
+    return count
+
+def stream_and_process_log(file_path, workers=None, output_format='json', use_cache=False, profiler=None,
+                           compress=None, pipeline=False):
+    '''
+    read_and_process_log 의 스트리밍 버전
+    - 파일을 한 줄씩 읽으면서 (epoch, timestamp, message, event) 레코드를 생성 (log_stream.iter_log_records)
+    - 외부 병합 정렬로 시간 역순 정렬 (log_stream.sort_records_external)
+    - JSON 과 위험 로그 보고서를 한 항목씩 저장
+    전체 로그를 메모리에 올리지 않으므로 MAX_MB 용량 제한을 적용하지 않음
+
+    workers 를 지정하면 파일을 바이트 구간으로 나누어 워커 프로세스들이 병렬로 파싱하고
+    (log_parallel.parallel_sorted_records) 부모 프로세스는 정렬된 청크만 병합
+
+    use_cache 이면 로그 파일이 바뀌지 않은 경우 파싱/정렬 없이 캐시(log_cache)에서 레코드를 읽고,
+    바뀐 경우에는 처리하면서 캐시를 새로 만듦
+    캐시로 저장한 결과 파일들이 그 뒤로 바뀌지 않았고 출력 옵션도 같으면 결과를 다시 쓰지 않음
+
+    읽기/파싱/정렬/저장은 제너레이터로 이어져 있어서 profiler 에는 한 단계(process)로 기록됨
+
+    압축된 로그는 바이트 구간으로 나눌 수 없으므로 workers 를 주어도 한 줄씩 풀면서 외부 병합 정렬로 처리
+
+    pipeline 이면 읽기 / 파싱·정렬 / 저장을 스레드로 나누어 겹쳐서 실행 (log_pipeline)
+    이때 workers 는 파싱 프로세스 수이고 압축된 로그도 그대로 사용
+    '''
+    cache_writer = None
+    profiler = profiler or StageProfiler()
+    try:
+        if not is_log_path(file_path):
+            return "❌ 지원하지 않는 파일 확장자입니다."
+        if use_cache and load_log_cache is None:
+            return "❌ 캐시를 사용하려면 numpy 가 필요합니다."
+        if workers and not pipeline and compression_of(file_path):
+            print("ℹ️ 압축된 로그는 병렬 파싱 대신 스트리밍으로 처리합니다.")
+            workers = None
+
+        cache = load_log_cache(file_path) if use_cache else None
+        outputs = [OUTPUT_JSONL_FILE, *_related_outputs(output_format, compress)]
+        options = {'format': output_format, 'compress': compress}
+        if cache is not None and outputs_up_to_date(file_path, outputs, options):
+            print(f"⚡ 캐시 사용: 결과 파일이 최신입니다 ({len(cache)}건, 다시 쓰지 않음)")
+            records = None
+        elif cache is not None:
+            print(f"⚡ 캐시 사용: {cache.cache_dir} ({len(cache)}건, 파싱 생략)")
+            records = iter(cache)
+            hits_of = lambda record: DANGER_MATCHER.find_all(record[2])
+        elif pipeline:
+            records = pipelined_sorted_records(file_path, workers)
+            hits_of = lambda record: DANGER_MATCHER.find_all(record[2])
+        elif workers:
+            # 레코드: (epoch, timestamp, message, event, None, 위험 키워드 번호들) - 위험 키워드 검사도 워커에서 처리
+            records = parallel_sorted_records(file_path, workers, DANGER_KEYWORD)
+            hits_of = lambda record: [DANGER_KEYWORD[i] for i in record[5]]
+        else:
+            records = sort_records_external(iter_log_records(file_path))
+            hits_of = lambda record: DANGER_MATCHER.find_all(record[2])
+        if use_cache and cache is None:
+            cache_writer = LogCacheWriter(file_path)
+
+        if records is not None:
+            profiler.begin('process')
+            count = _write_outputs(records, hits_of, output_format, cache_writer, compress)
+            print(f"\n✅ JSON 파일 저장 완료: {_saved_files(output_format, compress)} ({count}건)")
+            if cache_writer is not None:
+                print(f"✅ 캐시 저장 완료: {cache_writer.commit()}")
+                cache_writer = None
+            if use_cache:
+                save_output_stamps(file_path, outputs, options)
+            profiler.end(records_out=count)
+
+        profiler.begin('report')
+        print_danger_report()
+        profiler.end()
+        profiler.begin('search')
+        search_log_json()
+        profiler.end()
+
+    except FileNotFoundError:
+        return "❌ 오류: 파일이 존재하지 않습니다."
+    except UnicodeDecodeError:
+        return "❌ 오류: 디코딩 실패 (UTF-8 인코딩 확인)"
+    except UnicodeEncodeError:
+        return "❌ 오류: 인코딩 실패 (UTF-8 저장 중 오류 발생)"
+    except Exception as e:
+        return f"❌ 알 수 없는 오류 발생: {e}"
+    finally:
+        if cache_writer is not None:
+            cache_writer.discard()     # 처리 중 오류가 나면 만들던 캐시는 버림
+
+def merge_and_process_logs(source, workers=None, output_format='json', profiler=None, compress=None):
+    '''
+    여러 미션 컴퓨터의 로그 파일(디렉터리 또는 glob 패턴)을 시간 순서 하나로 병합해서 처리합니다.
+    - 파일마다 따로 정렬하고 (workers 를 주면 파일들을 동시에) heapq 로 k-way 병합 (log_merge)
+    - JSONL 레코드에는 원본 파일(source)을 함께 저장
+    '''
+    profiler = profiler or StageProfiler()
+    try:
+        file_paths = expand_log_sources(source)
+        if not file_paths:
+            return f"❌ 오류: '{source}' 에 해당하는 .log(.gz/.xz/.zst) 파일이 없습니다."
+        print(f"📂 로그 파일 {len(file_paths)}개 병합: {', '.join(file_paths)}")
+
+        profiler.begin('process')
+        records = merged_sorted_records(file_paths, workers)
+        count = _write_outputs(records, lambda record: DANGER_MATCHER.find_all(record[2]), output_format,
+                               compress=compress)
+        print(f"\n✅ JSON 파일 저장 완료: {_saved_files(output_format, compress)} ({count}건)")
+        profiler.end(records_out=count)
+
+        profiler.begin('report')
+        print_danger_report()
+        profiler.end()
+        profiler.begin('search')
+        search_log_json()
+        profiler.end()
+
+    except FileNotFoundError:
+        return "❌ 오류: 파일이 존재하지 않습니다."
+    except UnicodeDecodeError:
+        return "❌ 오류: 디코딩 실패 (UTF-8 인코딩 확인)"
+    except UnicodeEncodeError:
+        return "❌ 오류: 인코딩 실패 (UTF-8 저장 중 오류 발생)"
+    except Exception as e:
+        return f"❌ 알 수 없는 오류 발생: {e}"
+
+def _is_multi_source(source):
+    # 디렉터리나 glob 패턴이면 여러 파일 병합 모드
+    return os.path.isdir(source) or glob.has_magic(source)
+
+def _output_path(path, compress=None):
+    # --compress gz → mission_computer_main.json.gz (open_output 이 확장자를 보고 압축)
+    return f"{path}.{compress}" if compress else path
+
+def _tmp_path(path):
+    # 압축 확장자가 끝에 남도록 이름 앞에 붙임 (mission_computer_main.json.gz → .tmp.mission_computer_main.json.gz)
+    head, name = os.path.split(path)
+    return os.path.join(head, '.tmp.' + name)
+
+def _saved_files(output_format, compress=None):
+    files = [] if output_format == 'ndjson' else [_output_path(OUTPUT_JSON_FILE, compress)]
+    files.append(OUTPUT_JSONL_FILE)
+    if compress:
+        files.append(_output_path(OUTPUT_JSONL_FILE, compress))
+    files.append(OUTPUT_STATS_FILE)
+    return ', '.join(files)
+
+def _existing_records():
+    # 이미 저장된 JSONL 을 (epoch, timestamp, message, event) 레코드로 다시 읽음 (이어 붙인 구간들도 병합해서 시간 역순)
+    for _, record in iter_ndjson_by_time(OUTPUT_JSONL_FILE):
+        yield record
+
+def _related_outputs(output_format, compress=None):
+    # JSONL 과 함께 저장하는 결과 파일 (증분 처리 체크포인트와 캐시에 크기/수정 시간을 기록)
+    files = [OUTPUT_STATS_FILE, LOG_MD_FILE]
+    if output_format != 'ndjson':
+        files.append(_output_path(OUTPUT_JSON_FILE, compress))
+    if compress:
+        files.append(_output_path(OUTPUT_JSONL_FILE, compress))
+    return files
+
+def _prepend_danger_rows(records, hits_of, stats, boundary):
+    '''
+    보고서 표 맨 앞에 새 위험 로그를 넣고 기존 행은 바이트 그대로 복사한 뒤 건수/집계 표만 새로 씁니다.
+    records: 시간 역순 새 레코드 (모두 boundary 이후거나 같은 시간)
+    boundary: 기존 레코드의 가장 늦은 epoch, 같은 시간의 새 행은 기존 행 뒤에 넣음 (로그 줄 순서)
+    보고서와 집계는 임시 파일(_tmp_path)에만 쓰고 교체는 _append_outputs 가 마지막에 함
+    '''
+    header = io.StringIO()
+    _write_danger_header(header)
+    header = header.getvalue().encode('utf-8')
+    rows = [record for record in records if hits_of(record)]
+    later = [record for record in rows if record[0] != boundary]
+    ties = [record for record in rows if record[0] == boundary]
+    keyword_counts = Counter({keyword: o.count for keyword, o in stats.keywords.items()})
+
+    tmp_path = _tmp_path(LOG_MD_FILE)
+    with open(LOG_MD_FILE, 'rb') as old, open(tmp_path, 'w', encoding='utf-8') as d:
+        if old.read(len(header)) != header:
+            raise ValueError(f"{LOG_MD_FILE} 형식이 올바르지 않습니다.")
+        with mmap.mmap(old.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            rows_end = mm.find('\n## 키워드별 건수\n'.encode('utf-8'), len(header))
+            if rows_end < 0:
+                raise ValueError(f"{LOG_MD_FILE} 형식이 올바르지 않습니다.")
+            tie_end = len(header)
+            if ties:
+                prefix = f'| {ties[0][1]} |'.encode('utf-8')
+                while tie_end < rows_end and mm[tie_end:tie_end + len(prefix)] == prefix:
+                    tie_end = mm.find(b'\n', tie_end) + 1
+
+            d.write(header.decode('utf-8'))
+            for record in later:
+                d.write(f'| {record[1]} | {record[2]} |\n')
+            d.flush()
+            d.buffer.write(mm[len(header):tie_end])
+            for record in ties:
+                d.write(f'| {record[1]} | {record[2]} |\n')
+            d.flush()
+            for pos in range(tie_end, rows_end, COPY_BLOCK):
+                d.buffer.write(mm[pos:min(pos + COPY_BLOCK, rows_end)])
+        _write_keyword_counts(d, keyword_counts)
+        _write_stats(d, stats, _tmp_path(OUTPUT_STATS_FILE))
+
+def _append_outputs(new_records, hits_of, output_format='json', compress=None):
+    '''
+    증분 처리: 새 레코드를 기존 결과에 이어 씁니다. (기존 레코드는 다시 파싱하거나 정렬하지 않음)
+    - JSONL: 파일 끝에 새 구간으로 추가 (구간 위치는 .segments.json 에 기록, 읽을 때 heapq.merge 로 병합)
+    - 검색 색인 / 시간 색인: 새 항목만 추가
+    - 집계: stats.json 을 읽어서 새 레코드만 더함
+    - JSON / 위험 로그 보고서: 새 항목을 앞에 쓰고 기존 내용은 그대로 복사
+    - 중간에 실패하면 모든 결과 파일이 호출 전과 같은 내용으로 남음 (예외는 그대로 전달)
+
+    Args:
+        new_records (list): 시간 역순으로 정렬된 새 레코드
+
+    Returns:
+        int: 추가한 레코드 수
+        None: 새 레코드가 기존 마지막 시간보다 이르거나 기존 결과에 이어 쓸 수 없음 (전체를 다시 써야 함)
+    '''
+    try:
+        stats = LogStats.load(OUTPUT_STATS_FILE)
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+    boundary = stats.last_epoch()
+    if not new_records:
+        return 0
+    if boundary is not None and new_records[-1][0] < boundary:
+        return None     # 기존 레코드 사이에 들어가는 레코드
+    starts = ndjson_segment_starts(OUTPUT_JSONL_FILE)
+    if len(starts) >= MAX_JSONL_SEGMENTS:
+        return None
+    index_writer = None
+    try:
+        # 색인 writer 는 JSONL 에 추가하기 전에 열어야 기존 색인이 JSONL 과 맞는지 확인할 수 있음
+        index_writer = LogIndexWriter(OUTPUT_JSONL_FILE, append=True)
+        time_writer = TimeIndexWriter(OUTPUT_JSONL_FILE, append=True)
+    except ValueError:
+        if index_writer is not None:
+            index_writer.discard()
+        return None
+
+    for record in reversed(new_records):    # 공백 구간은 기존 마지막 레코드부터 시간 순서로 이어서 검사
+        stats.add_record(record, hits_of(record))
+
+    # JSON / 보고서 / 집계는 임시 파일에 먼저 쓰고 JSONL 과 색인까지 끝난 뒤에 한꺼번에 교체
+    # 중간에 실패하면 JSONL 을 원래 크기와 수정 시간으로 되돌리므로 기존 결과와 체크포인트가 그대로 맞음
+    # (체크포인트는 이 함수가 끝난 뒤 incremental_process_log 가 저장)
+    staged = {}     # 임시 파일 → 교체할 결과 파일
+    if output_format != 'ndjson':
+        json_path = _output_path(OUTPUT_JSON_FILE, compress)
+        staged[_tmp_path(json_path)] = json_path
+    staged[_tmp_path(LOG_MD_FILE)] = LOG_MD_FILE
+    staged[_tmp_path(OUTPUT_STATS_FILE)] = OUTPUT_STATS_FILE
+    jsonl_paths = [OUTPUT_JSONL_FILE, _output_path(OUTPUT_JSONL_FILE, compress)] if compress else [OUTPUT_JSONL_FILE]
+    jsonl_stats = [(path, os.stat(path)) for path in jsonl_paths]
+    try:
+        if output_format != 'ndjson':
+            prepend_json_records(json_path, new_records, output_format, _tmp_path(json_path))
+        _prepend_danger_rows(new_records, hits_of, stats, boundary)
+
+        jsonl_copy = NdjsonWriter(jsonl_paths[1], append=True) if compress else nullcontext()
+        with NdjsonWriter(OUTPUT_JSONL_FILE, append=True) as jsonl_writer, jsonl_copy as jsonl_copy_writer:
+            for record in new_records:
+                offset = jsonl_writer.write(record)
+                if jsonl_copy_writer is not None:
+                    jsonl_copy_writer.write(record)
+                index_writer.add_record(offset, record)
+                time_writer.add_record(offset, record)
+        save_ndjson_segments(OUTPUT_JSONL_FILE, starts + [jsonl_stats[0][1].st_size])
+        index_writer.commit()
+        time_writer.commit()
+    except BaseException:
+        index_writer.discard()
+        time_writer.discard()
+        for path, st in jsonl_stats:
+            os.truncate(path, st.st_size)
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        save_ndjson_segments(OUTPUT_JSONL_FILE, starts)
+        for tmp_path in staged:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        raise
+
+    for tmp_path, path in staged.items():
+        os.replace(tmp_path, path)
+    return len(new_records)
+
+def incremental_process_log(file_path, interactive=True, output_format='json', compress=None):
+    '''
+    증분 처리: 체크포인트 이후에 추가된 줄만 파싱해서 기존 JSON / JSONL / 위험 로그 보고서에 병합합니다.
+    - 체크포인트(mission_computer_main.checkpoint.json)에 마지막으로 처리한 바이트 위치와
+      파일 식별 정보(inode, 앞부분 해시)를 저장
+    - 로그가 교체/절단되었거나 결과 파일이 다른 방법으로 다시 만들어졌으면 처음부터 처리
+    - 새 레코드는 메모리에서 정렬해서 기존 결과에 이어 씀 (_append_outputs, 추가한 줄 수에 비례하는 시간)
+    - 새 레코드가 기존 마지막 시간보다 이르면 기존 JSONL 을 한 줄씩 읽으면서 heapq.merge 로 병합해 전체를 다시 씀
+      (기존 레코드는 JSONL 에서 읽으므로 로그 파일을 다시 파싱하지 않음)
+    '''
+    try:
+        if not is_log_path(file_path):
+            return "❌ 지원하지 않는 파일 확장자입니다."
+        if compression_of(file_path):
+            # 체크포인트는 로그 파일의 바이트 위치라서 압축 파일에서는 이어 읽을 수 없음
+            return "❌ 압축된 로그는 증분 처리할 수 없습니다. (--stream 으로 전체 처리)"
+
+        checkpoint_file = checkpoint_path_for(OUTPUT_JSON_FILE)
+        related = _related_outputs(output_format, compress)
+        options = {'format': output_format, 'compress': compress}
+        start = load_checkpoint_offset(checkpoint_file, file_path, OUTPUT_JSONL_FILE, related, options)
+        end = complete_lines_end(file_path)
+
+        hits_of = lambda record: DANGER_MATCHER.find_all(record[2])
+        if start == 0:
+            new_records = None
+            records = sort_records_external(iter_records_between(file_path, 0, end))
+            count = _write_outputs(records, hits_of, output_format, compress=compress)
+        elif start == end:
+            new_records = []
+            count = None    # 새로 추가된 줄이 없으면 다시 쓰지 않음
+        else:
+            # 같은 시간 안에서는 줄 순서를 유지 (sorted 는 안정 정렬)
+            new_records = sorted(iter_records_between(file_path, start, end),
+                                 key=lambda record: record[0], reverse=True)
+            count = _append_outputs(new_records, hits_of, output_format, compress)
+            if count is None:
+                print("ℹ️ 새 레코드를 기존 결과에 이어 쓸 수 없어서 전체 결과를 다시 씁니다.")
+                # 기존 항목을 먼저 넘기므로 같은 timestamp 면 새 줄이 뒤에 옴 (파일 순서와 같음)
+                records = heapq.merge(_existing_records(), new_records,
+                                      key=lambda record: record[0], reverse=True)
+                count = _write_outputs(records, hits_of, output_format, compress=compress)
+        if count is not None:
+            save_checkpoint(checkpoint_file, file_path, end, OUTPUT_JSONL_FILE, related, options)
+
+        if not interactive and new_records == []:
+            return      # --follow 모드: 새 줄이 없으면 조용히 다음 확인까지 대기
+        if new_records is None:
+            print(f"\n✅ 전체 처리 완료: {_saved_files(output_format, compress)} ({count}건, {end} 바이트까지)")
+        else:
+            print(f"\n✅ 증분 처리 완료: 새 레코드 {len(new_records)}건 ({start} → {end} 바이트)")
+            for record in reversed(new_records):
+                if hits_of(record):
+                    print(f"⚠️ {record[1]} | {record[2]}")
+
+        if interactive:
+            print_danger_report()
+            search_log_json()
+
+    except FileNotFoundError:
+        return "❌ 오류: 파일이 존재하지 않습니다."
+    except UnicodeDecodeError:
+        return "❌ 오류: 디코딩 실패 (UTF-8 인코딩 확인)"
+    except UnicodeEncodeError:
+        return "❌ 오류: 인코딩 실패 (UTF-8 저장 중 오류 발생)"
+    except Exception as e:
+        return f"❌ 알 수 없는 오류 발생: {e}"
+
+def follow_log(file_path, interval=FOLLOW_INTERVAL, output_format='json', compress=None):
+    '''
+    tail -f 처럼 로그 파일을 계속 지켜보면서 interval 초마다 새로 추가된 줄을 증분 처리합니다.
+    줄이 써진 뒤 보고서에 반영될 때까지의 지연은 최대 interval + 한 번 처리 시간
+    '''
+    print(f"👀 '{file_path}' 추적 시작 ({interval}초 간격, Ctrl+C 로 종료)")
+    try:
+        while True:
+            result = incremental_process_log(file_path, interactive=False, output_format=output_format,
+                                             compress=compress)
+            if result:
+                print(result)   # 로그 교체 중 잠깐 파일이 없을 수 있으므로 계속 진행
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\n⏹ 추적 종료")
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="mission_computer_main.log 분석")
+    parser.add_argument('log_file', nargs='?', default=LOG_FILE,
+                        help="분석할 로그 파일 경로, 또는 여러 파일을 병합할 디렉터리/glob 패턴 (예: 'logs/*.log')")
+    parser.add_argument('--stream', action='store_true',
+                        help="한 줄씩 읽고 외부 병합 정렬로 처리 (용량 제한 없음, 메모리 사용량 일정)")
+    parser.add_argument('--workers', type=int, metavar='N',
+                        help="N개의 프로세스로 나누어 병렬 파싱 (용량 제한 없음)")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="읽기/파싱/저장을 스레드로 겹쳐서 처리 (--workers N 이면 파싱은 N개 프로세스)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="지난 실행 이후 추가된 줄만 처리하여 기존 결과에 병합")
+    parser.add_argument('--follow', action='store_true',
+                        help="로그 파일을 계속 지켜보면서 추가된 줄을 증분 처리 (tail -f)")
+    parser.add_argument('--interval', type=float, default=FOLLOW_INTERVAL, metavar='SEC',
+                        help=f"--follow 확인 간격(초), 기본값 {FOLLOW_INTERVAL}")
+    parser.add_argument('-v', '--verbose', action='count', default=0,
+                        help="진단 출력: -v 건너뛴 줄 일부, -vv 전체 리스트/딕셔너리까지 (기본값: 요약만)")
+    parser.add_argument('--profile', action='store_true',
+                        help="단계별 wall/CPU 시간, 레코드 수, 최대 메모리(tracemalloc)를 표로 출력")
+    parser.add_argument('--profile-json', metavar='PATH',
+                        help="단계별 측정 결과를 JSON 파일로 저장 (--profile 포함)")
+    parser.add_argument('--cprofile', metavar='PATH',
+                        help="cProfile 결과를 PATH 에 저장 (python -m pstats PATH 로 확인)")
+    parser.add_argument('--cache', action='store_true',
+                        help="파싱 결과를 캐시해 두고 로그가 바뀌지 않았으면 다시 파싱하지 않음 (--stream 방식으로 처리)")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='json', dest='output_format',
+                        help="JSON 출력 형식: json(들여쓰기), compact(공백 없음), ndjson(한 줄에 레코드 하나)")
+    parser.add_argument('--compress', choices=COMPRESSIONS,
+                        help="JSON 과 JSONL 압축본을 gz/xz/zst 로 압축해서 저장 (예: mission_computer_main.json.gz)")
+    parser.add_argument('--latest', type=int, metavar='N',
+                        help="전체를 정렬하지 않고 최신 N건만 출력 (결과 파일은 만들지 않음)")
+    parser.add_argument('--search-file', metavar='PATH',
+                        help="검색어 파일(한 줄에 하나, 're:' 로 시작하면 정규식)로 처리된 JSONL 을 한 번에 일괄 검색")
+    parser.add_argument('--search-output', metavar='PATH',
+                        help="--search-file 결과를 JSON Lines 로 저장 (없으면 화면에 출력)")
+    parser.add_argument('--search-limit', type=int, metavar='N',
+                        help="--search-file 검색어마다 보여줄/저장할 최대 결과 수 (건수는 모두 셈)")
+    parser.add_argument('--range', nargs=2, metavar=('START', 'END'),
+                        help="처리된 JSON 에서 시간 구간 조회 (예: --range '2023-08-27 10:02:00' '2023-08-27 10:07:00')")
+    args = parser.parse_args()
+
     #print(Hello())
-    result = read_and_process_log(LOG_FILE)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers 는 1 이상이어야 합니다.")
+
+    if args.latest is not None and args.latest < 1:
+        parser.error("--latest 는 1 이상이어야 합니다.")
+
+    if _is_multi_source(args.log_file) and (args.follow or args.incremental or args.cache):
+        parser.error("디렉터리/glob 병합은 --follow, --incremental, --cache 와 함께 쓸 수 없습니다.")
+
+    if _is_multi_source(args.log_file) and (args.stream or args.pipeline):
+        # 병합은 항상 파일별 외부 정렬 + k-way 병합(log_merge)으로 처리하므로 다른 처리 방식을 고를 수 없음
+        parser.error("디렉터리/glob 병합은 --stream, --pipeline 과 함께 쓸 수 없습니다. (병합은 항상 스트리밍으로 처리)")
+
+    if args.range:
+        result = query_time_range(*args.range)
+    elif args.search_file:
+        # 로그 파일을 직접 지정했으면 그 파일을, 아니면 처리된 JSONL 을 검색
+        source = args.log_file if args.log_file != LOG_FILE else OUTPUT_JSONL_FILE
+        result = batch_search_log(args.search_file, source, args.search_limit, args.search_output)
+    elif args.latest:
+        result = print_latest_logs(args.log_file, args.latest)
+    elif args.follow:
+        result = follow_log(args.log_file, args.interval, output_format=args.output_format, compress=args.compress)
+    elif args.incremental:
+        result = incremental_process_log(args.log_file, output_format=args.output_format, compress=args.compress)
+    else:
+        profiler = StageProfiler(enabled=args.profile or bool(args.profile_json))
+        if _is_multi_source(args.log_file):
+            process = merge_and_process_logs
+            options = dict(workers=args.workers, output_format=args.output_format, profiler=profiler)
+        elif args.stream or args.workers or args.cache or args.pipeline:
+            process = stream_and_process_log
+            options = dict(workers=args.workers, output_format=args.output_format, use_cache=args.cache,
+                           profiler=profiler, pipeline=args.pipeline)
+        else:
+            process = read_and_process_log
+            options = dict(output_format=args.output_format, verbose=args.verbose, profiler=profiler)
+        options['compress'] = args.compress
+
+        if args.cprofile:
+            result = run_with_cprofile(process, args.cprofile, args.log_file, **options)
+            print(f"✅ cProfile 저장 완료: {args.cprofile}")
+        else:
+            result = process(args.log_file, **options)
+        profiler.stop()
+
+        if profiler.enabled:
+            print("\n⏱ 단계별 측정 결과")
+            print(profiler.format_table())
+            if args.profile_json:
+                profiler.save_json(args.profile_json)
+                print(f"✅ 측정 결과 저장 완료: {args.profile_json}")
 
-    #print("\n📦 [최종 결과]")
-    #print(result)
+    if result:
+        print(result)
@@ -0,0 +1,151 @@
+import os
+import csv
+from collections import namedtuple
+'''
+돔 재질 / 밀도 레지스트리
+
+재질 표가 파일마다 딕셔너리로 들어 있던 것(4.py 의 dem, test_exam2 의 DENSITY_MAP)을
+데이터 파일(materials.csv) 하나로 옮기고, 한 번만 읽어서 모든 계산 경로가 같이 씁니다.
+
+- 재질마다 정수 번호(code)가 있고 densities[code] 로 밀도를 찾음
+  → 배치 계산(dome_batch)은 번호 배열로 밀도 배열에서 한 번에 모음 (행마다 사전을 찾지 않음)
+- 대표 이름과 별칭(한국어/영어) 모두 사전 하나로 O(1) 검색
+  (앞뒤 공백, 연속 공백, 영문 대소문자는 구분하지 않음: 'Carbon  Steel' == 'carbon steel')
+- 밀도는 파일에 적힌 단위(g/cm3, kg/m3 ...)에서 g/cm³ 로 바꿔서 저장하고 원래 단위도 보관
+
+materials.csv 형식
+    code,name,density,unit,aliases
+    0,유리,2.4,g/cm3,glass|판유리
+    3,스테인리스강,8000,kg/m3,stainless steel|SUS304
+    - code 는 0 부터 빈 번호 없이 (순서는 상관없음), 별칭은 '|' 로 구분
+'''
+
+MATERIALS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'materials.csv')
+INVALID_MATERIAL = -1
+MARS_GRAVITY_RATIO = 0.38   # 화성 중력 / 지구 중력 (sphere_area, sphere_area_batch 공통)
+ALIAS_SEP = '|'
+
+# 밀도 단위 → g/cm³ 로 바꾸는 배율
+DENSITY_UNITS = {
+    'g/cm3': 1.0,
+    'g/ml': 1.0,
+    'kg/l': 1.0,
+    't/m3': 1.0,
+    'kg/m3': 0.001,
+    'lb/ft3': 0.01601846337396014,
+}
+
+Material = namedtuple('Material', ['code', 'name', 'density', 'unit', 'unit_density', 'aliases'])
+Material.__doc__ = '재질 하나 (density 는 g/cm³, unit_density 는 파일에 적힌 unit 단위의 값)'
+
+_registries = {}    # 파일 경로 → 읽어 둔 레지스트리 (load_registry 캐시)
+
+
+def normalize_name(name):
+    '''검색용 키: 앞뒤/연속 공백 정리 + 영문 대소문자 무시'''
+    return ' '.join(str(name).split()).casefold()
+
+
+class MaterialRegistry:
+    def __init__(self, materials):
+        '''
+        Args:
+            materials (iterable): Material 목록 (code 가 0 부터 빈 번호 없이 있어야 함)
+
+        Raises:
+            ValueError: code 가 중복되거나 비어 있음, 이름/별칭이 다른 재질과 겹침
+        '''
+        materials = sorted(materials, key=lambda m: m.code)
+        if [m.code for m in materials] != list(range(len(materials))):
+            raise ValueError("재질 번호(code)는 0 부터 중복/빈 번호 없이 있어야 합니다.")
+        self.materials = tuple(materials)
+        self.names = tuple(m.name for m in materials)           # 번호 → 대표 이름
+        self.densities = tuple(m.density for m in materials)    # 번호 → 밀도(g/cm³)
+        self._codes = {}
+        for m in materials:
+            for key in (m.name, *m.aliases):
+                key = normalize_name(key)
+                other = self._codes.setdefault(key, m.code)
+                if other != m.code:
+                    raise ValueError(f"재질 이름/별칭이 겹칩니다: {key!r} ({self.names[other]}, {m.name})")
+
+    @classmethod
+    def from_csv(cls, path):
+        '''
+        materials.csv 형식의 파일을 읽어 레지스트리를 만듭니다.
+
+        Raises:
+            ValueError: 필요한 열이 없거나 값(번호, 밀도, 단위)이 잘못됨
+        '''
+        materials = []
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f)
+            missing = {'code', 'name', 'density', 'unit'} - set(reader.fieldnames or ())
+            if missing:
+                raise ValueError(f"재질 파일에 {', '.join(sorted(missing))} 열이 없습니다: {path}")
+            for row in reader:
+                try:
+                    code = int(row['code'])
+                    unit_density = float(row['density'])
+                except (TypeError, ValueError):
+                    raise ValueError(f"재질 파일 {reader.line_num}번째 줄의 번호/밀도가 잘못되었습니다: {path}")
+                unit = row['unit'].strip().lower()
+                if unit not in DENSITY_UNITS:
+                    raise ValueError(f"지원하지 않는 밀도 단위입니다: {row['unit']!r} ({', '.join(DENSITY_UNITS)})")
+                if not unit_density > 0:
+                    raise ValueError(f"밀도는 0 보다 커야 합니다: {row['name']} ({unit_density})")
+                aliases = tuple(a.strip() for a in (row.get('aliases') or '').split(ALIAS_SEP) if a.strip())
+                materials.append(Material(code, row['name'].strip(), unit_density * DENSITY_UNITS[unit],
+                                          unit, unit_density, aliases))
+        return cls(materials)
+
+    def __len__(self):
+        return len(self.materials)
+
+    def __iter__(self):
+        return iter(self.materials)
+
+    def __contains__(self, name):
+        return normalize_name(name) in self._codes
+
+    def code(self, name, default=INVALID_MATERIAL):
+        '''이름 또는 별칭의 재질 번호, 없으면 default'''
+        return self._codes.get(normalize_name(name), default)
+
+    def get(self, name):
+        '''이름 또는 별칭의 Material, 없으면 None'''
+        code = self.code(name)
+        return None if code == INVALID_MATERIAL else self.materials[code]
+
+    def density(self, name):
+        '''
+        이름 또는 별칭의 밀도(g/cm³)를 돌려줍니다.
+
+        Raises:
+            ValueError: 없는 재질
+        '''
+        code = self.code(name)
+        if code == INVALID_MATERIAL:
+            raise ValueError(f"지원하지 않는 재질입니다: {name}")
+        return self.densities[code]
+
+    def density_map(self):
+        '''대표 이름 → 밀도(g/cm³) 사전 (예전 DENSITY_MAP 과 같은 모양)'''
+        return dict(zip(self.names, self.densities))
+
+
+def load_registry(path=MATERIALS_FILE):
+    '''
+    재질 파일을 읽어 레지스트리를 돌려줍니다. 같은 파일은 한 번만 읽고 이후에는 같은 객체를 돌려줌
+
+    Args:
+        path (str, optional): 재질 파일 경로 (기본값: 이 모듈 옆의 materials.csv)
+
+    Returns:
+        MaterialRegistry
+    '''
+    key = os.path.abspath(path)
+    registry = _registries.get(key)
+    if registry is None:
+        registry = _registries[key] = MaterialRegistry.from_csv(key)
+    return registry
@@ -1,6 +1,8 @@
-import os
 import json
-from datetime import datetime
+from log_timestamp import timestamp_to_epoch
+from log_records import LogRecordStore
+from log_diag import LineDiagnostics
+from log_compress import LogSizeError, is_log_path, read_log_lines
 '''
 시험 1번 문제 정답 
 새로운 브랜치 생성하고 해당 브랜치로 전환
@@ -25,56 +27,55 @@ def main():
     result = read_log()
     print(result)
 
-def read_log(path: str = "mission_computer_main.log")->str:
+def read_log(path: str = "mission_computer_main.log", verbose: int = 0)->str:
 #def read_log(path_file):
-    log_list = []
+    log_store = LogRecordStore()
+    diag = LineDiagnostics('test_exam', verbose)    # verbose=0 이면 요약 한 줄만 출력
     try :
-        if not path.endswith(".log"):
+        if not is_log_path(path):   # .log, .log.gz, .log.xz, .log.zst
             return "파일 확장가 다릅니다."
         
-        size_mb = os.path.getsize(path) / (1024 *1024)
-
-        if size_mb > MAX_MB:
+        # 압축 파일은 풀린 내용 기준으로 용량 검사
+        try:
+            lines = read_log_lines(path, max_bytes=MAX_MB * 1024 * 1024)
+        except LogSizeError:
             return "10메가를 넘어씁니다"
-        
-        with open(path, 'r', encoding='utf8') as f:
-            lines = f.readlines()
-        print('로그 리스트')
-        for line in lines:
-            print(line.strip())
+        diag.dump('로그 리스트', ''.join(lines))
         
         for i, line in enumerate(lines, start=1):
+            diag.read()
             line = line.strip()
 
             if not line:
+                diag.skip('빈 줄', i)
                 continue
             if ',' not in line:
+                diag.skip('쉼표 없음', i, line)
                 continue
             parts =line.split(',', 2)
+            if len(parts) < 3:
+                diag.skip('필드 부족', i, line)
+                continue
             timestamp = parts[0].strip()
+            event = parts[1].strip()
             message = parts[2].strip()
 
-            try:
-                datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S')
-            except ValueError:
-                print('타입 오류')
+            epoch = timestamp_to_epoch(timestamp)
+            if epoch is None:
+                diag.skip('타입 오류', i, line)
                 continue
-            log_list.append((timestamp, message))
-        print('로그 리스트 timestamp, message')
-        print(log_list)
+            diag.accept()
+            log_store.append(epoch, message, event)
+        print(diag.summary())
+        diag.dump('로그 리스트 timestamp, event, message', log_store)
 
         try:
-            sorted_list = sorted(
-                log_list,
-                key=lambda x: datetime.strptime(x[0], '%Y-%m-%d %H:%M:%S'),
-                reverse=True
-            )
+            # 안정 정렬이라 같은 초의 로그도 모두 원래 순서대로 남음 (dict 로 바꾸면 마지막 하나만 남음)
+            sorted_list = log_store.sorted_by_time(reverse=True)
         except ValueError as ve:
             print(f"{ve}")
-        print('역순 정렬 리스트')
-        print(sorted_list)
-        dict_result = dict(sorted_list)
-        return dict_result
+        diag.dump('역순 정렬 리스트', sorted_list)
+        return sorted_list
 
     except FileNotFoundError:
         print("파일이 존재하지 않습니다.")
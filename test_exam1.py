@@ -18,7 +18,8 @@ git merge --abort
  3번 시험 문제 정답
 '''
 
-from datetime import datetime
+from log_timestamp import timestamp_to_epoch
+from log_records import LogRecordStore
 
 def read_log(path: str = "mission_computer_main.log")->str:
     try :
@@ -56,14 +57,15 @@ def main():
                 # parts 데이터가 3조각여부 확인
                 if len(parts) == 3:
                     # parts[0] 첫번째 값에 데이터 타입 확인 조건문
-                    if datetime.strptime(parts[0], '%Y-%m-%d %H:%M:%S'):
-                        try:
-                            # 오류가 존재하지 않으면 log_list 배열에 조건에 맞는 값을 넣음
-                            log_list.append((parts[0].strip(), parts[2].strip()))
-                        except RuntimeError:
-                            raise RuntimeError
-                    else:
+                    # strptime 대신 저장할 때 쓰는 timestamp_to_epoch 로 확인해서
+                    # 변환할 수 없는 날짜면 예전 strptime 과 같이 ValueError
+                    if timestamp_to_epoch(parts[0].strip()) is None:
                         raise ValueError
+                    try:
+                        # 오류가 존재하지 않으면 log_list 배열에 조건에 맞는 값을 넣음
+                        log_list.append((parts[0].strip(), parts[2].strip()))
+                    except RuntimeError:
+                        raise RuntimeError
                 else:
                     raise ValueError
             except RuntimeError:
@@ -79,9 +81,12 @@ def main():
             )
             print("============sorted_list=================")
             print(sorted_list)
-            dict_list = dict(sorted_list) # 사전 작업 위한 dict 내장 함수 사용
-            print("============dict_list=================")
-            print(dict_list)
+            # dict(sorted_list) 는 같은 timestamp 의 로그를 마지막 하나만 남기므로
+            # 모든 로그를 순서대로 보존하는 저장소(LogRecordStore)로 변환
+            log_store = LogRecordStore(
+                (timestamp_to_epoch(timestamp), timestamp, message) for timestamp, message in sorted_list)
+            print("============log_store=================")
+            print(log_store)
         except RuntimeError:
             raise RuntimeError
     except (TypeError, ValueError):
@@ -2,16 +2,13 @@
 
 # Step 1: 수학 계산을 위한 math 모듈 가져오기
 import math
+from material_registry import MARS_GRAVITY_RATIO, load_registry
 
 # --- 상수 정의 ---
-# 재질과 밀도 데이터를 딕셔너리로 관리하여 유지보수를 용이하게 합니다.
-DENSITY_MAP = {
-    "유리": 2.4,        # 단위: g/cm³
-    "알루미늄": 2.7,
-    "탄소강": 7.85
-}
-# 화성 중력 비율 상수를 정의하여 코드의 가독성을 높입니다.
-MARS_GRAVITY_RATIO = 0.38
+# 재질과 밀도 데이터는 materials.csv 에서 한 번만 읽어 레지스트리로 관리합니다. (별칭, 단위 포함)
+MATERIAL_REGISTRY = load_registry()
+DENSITY_MAP = MATERIAL_REGISTRY.density_map()   # 대표 이름 → 밀도(g/cm³), 예전 딕셔너리와 같은 모양
+# 화성 중력 비율 상수(MARS_GRAVITY_RATIO)는 배치 계산(dome_batch)과 같이 쓰도록 material_registry 에 있습니다.
 
 # --- 핵심 계산 함수 정의 ---
 def sphere_area(diameter: float, material: str, thickness: float=1) -> tuple[float, float]:
@@ -20,7 +17,7 @@ def sphere_area(diameter: float, material: str, thickness: float=1) -> tuple[flo
 
     Args:
         diameter (float): 돔의 지름 (m 단위)
-        material (str): 돔의 재질 ('유리', '알루미늄', '탄소강')
+        material (str): 돔의 재질 이름 또는 별칭 ('유리', '알루미늄', '탄소강', 'glass' ... materials.csv)
         thickness (float, optional): 돔의 두께 (cm 단위). 기본값은 1cm.
 
     Returns:
@@ -32,7 +29,7 @@ def sphere_area(diameter: float, material: str, thickness: float=1) -> tuple[flo
     
     # --- 보너스 과제: 함수 내에서 인자값 유효성 검사 ---
     # 잘못된 값이 들어오면 계산을 시도하지 않고 즉시 ValueError를 발생(raise)시킵니다.
-    if material not in DENSITY_MAP:
+    if material not in MATERIAL_REGISTRY:
         raise ValueError
     
     if diameter <= 0:
@@ -65,7 +62,7 @@ def sphere_area(diameter: float, material: str, thickness: float=1) -> tuple[flo
         #volume_cm3 = area_cm2 * thickness
         
         # 4. 돔의 질량(kg) 계산
-        density = DENSITY_MAP[material]
+        density = MATERIAL_REGISTRY.density(material)
         mass_kg = density * volume_cm3 / 1000
         #mass_g = volume_cm3 * density
         #mass_kg = mass_g / 1000
@@ -90,8 +87,8 @@ def main():
         except ValueError:
             raise ValueError
 
-        material_input = input("재질을 입력하세요 (유리, 알루미늄, 탄소강): ").strip()
-        if material_input not in DENSITY_MAP:
+        material_input = input("재질을 입력하세요 (유리, 알루미늄, 탄소강, glass ... materials.csv 의 이름/별칭): ").strip()
+        if material_input not in MATERIAL_REGISTRY:
             raise ValueError
            
         try:
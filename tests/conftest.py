@@ -0,0 +1,11 @@
+import pytest
+
+
+@pytest.fixture
+def write_log(tmp_path):
+    '''write_log(lines, name) → 헤더를 붙인 로그 파일 경로'''
+    def write(lines, name='mission_computer_main.log', header='timestamp,event,message'):
+        path = tmp_path / name
+        path.write_text('\n'.join([header, *lines]) + '\n', encoding='utf-8')
+        return str(path)
+    return write
@@ -0,0 +1,22 @@
+import random
+
+EVENTS = ('INFO', 'WARN', 'ERROR')
+MESSAGES = (
+    'Telemetry link established',
+    'Oxygen tank unstable',
+    '산소 누출 감지',
+    'nav system check',
+    '고온 경보, 냉각 시작',
+    '폭발 위험 감지',
+)
+
+
+def make_log_lines(count, seed=0, start=1693094400, max_step=3):
+    '''시간이 뒤섞이고 같은 timestamp 가 여러 번 나오는 테스트용 로그 줄 (헤더 제외)'''
+    from log_timestamp import epoch_to_timestamp
+    rng = random.Random(seed)
+    lines = []
+    for i in range(count):
+        epoch = start + rng.randrange(0, count * max_step + 1)
+        lines.append(f'{epoch_to_timestamp(epoch)},{rng.choice(EVENTS)},{rng.choice(MESSAGES)} #{i}')
+    return lines
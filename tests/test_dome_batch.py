@@ -0,0 +1,39 @@
+import math
+import numpy as np
+import pytest
+import test_exam2
+from dome_batch import MATERIALS, material_codes, sphere_area_batch
+
+
+def test_batch_matches_scalar_sphere_area():
+    rng = np.random.default_rng(1)
+    diameters = rng.uniform(0.01, 500, 300)
+    thicknesses = rng.uniform(0.1, 20, 300)
+    materials = rng.choice(['유리', 'glass', '알루미늄', 'Carbon  Steel', '탄소강'], 300)
+    area, weight, valid = sphere_area_batch(diameters, materials, thicknesses)
+    assert valid.all()
+    for i in range(300):
+        expected = test_exam2.sphere_area(float(diameters[i]), str(materials[i]), float(thicknesses[i]))
+        assert area[i] == pytest.approx(expected[0], rel=1e-15)
+        assert weight[i] == pytest.approx(expected[1], rel=1e-15)
+
+
+def test_batch_broadcasts_grid():
+    d = np.array([1.0, 2.0, 3.0])[:, None]
+    t = np.array([0.5, 1.0])[None, :]
+    area, weight, valid = sphere_area_batch(d, '알루미늄', t)
+    assert area.shape == weight.shape == valid.shape == (3, 2)
+    assert weight[2, 1] == pytest.approx(test_exam2.sphere_area(3.0, '알루미늄', 1.0)[1])
+
+
+def test_invalid_cells_are_masked():
+    area, weight, valid = sphere_area_batch([1, 0, -1, 'x', 1, 1, math.inf],
+                                            ['유리', '유리', '유리', '유리', '종이', '유리', '유리'],
+                                            [1, 1, 1, 1, 1, 0, 1])
+    assert valid.tolist() == [True, False, False, False, False, False, False]
+    assert np.isnan(area[1:]).all() and np.isnan(weight[1:]).all()
+
+
+def test_material_codes_names_and_integers():
+    assert material_codes(['유리', ' GLASS ', '없음']).tolist() == [0, 0, -1]
+    assert material_codes(np.array([0, len(MATERIALS), -3])).tolist() == [0, -1, -1]
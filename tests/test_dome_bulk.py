@@ -0,0 +1,64 @@
+import io
+import csv
+import pytest
+import test_exam2
+import dome_bulk
+
+
+def _run(text, **options):
+    out = io.StringIO()
+    counts = dome_bulk.run_batch(io.StringIO(text), out, **options)
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    return rows, counts
+
+
+def test_error_codes():
+    rows, counts = _run('diameter,material,thickness\n'
+                        '10,유리,1\n'
+                        '0,유리,1\n'
+                        'abc,유리,1\n'
+                        '5,종이,1\n'
+                        '5,유리,-2\n'
+                        '5,유리,x\n'
+                        '\n'
+                        '5,유리,1,9\n'
+                        '5\n')
+    assert [row['error'] for row in rows] == [
+        'ok', 'invalid_diameter', 'invalid_diameter', 'unknown_material',
+        'invalid_thickness', 'invalid_thickness', 'bad_row', 'bad_row', 'bad_row']
+    assert [row['row'] for row in rows] == [str(i) for i in range(1, 10)]
+    assert counts['bad_row'] == 3 and counts['ok'] == 1
+    assert all(row['area_m2'] == row['weight_kg'] == '' for row in rows[1:])
+
+
+def test_quoted_values_and_defaults_match_sphere_area():
+    rows, _ = _run('diameter,material,thickness\n'
+                   '"3",glass,2\n'
+                   '4," Carbon  Steel ",\n'
+                   '"5","탄소강, 압연",1\n')
+    assert [row['error'] for row in rows] == ['ok', 'ok', 'unknown_material']
+    assert rows[1]['thickness'] == '1'      # 두께가 비어 있으면 기본값 1cm
+    assert rows[2]['material'] == '탄소강, 압연'
+    for row, args in ((rows[0], (3.0, 'glass', 2.0)), (rows[1], (4.0, 'Carbon  Steel', 1.0))):
+        area, weight = test_exam2.sphere_area(*args)
+        assert float(row['area_m2']) == pytest.approx(area, rel=1e-15)
+        assert float(row['weight_kg']) == pytest.approx(weight, rel=1e-15)
+
+
+def test_header_order_and_missing_thickness_column():
+    rows, _ = _run('id,material,diameter\nA,유리,2\nB,알루미늄,3\n')
+    assert [row['thickness'] for row in rows] == ['1', '1']
+    assert [row['error'] for row in rows] == ['ok', 'ok']
+    with pytest.raises(ValueError):
+        _run('material,thickness\n유리,1\n')
+    with pytest.raises(ValueError):
+        _run('')
+
+
+def test_no_header_and_chunk_boundaries():
+    lines = [f'{i % 7},유리' + (',2' if i % 2 else '') for i in range(1, 51)] + ['', '3,유리,1,1']
+    text = '\n'.join(lines) + '\n'
+    expected, _ = _run(text, header=False)
+    assert [row['error'] for row in expected[-2:]] == ['bad_row', 'bad_row']
+    for chunk_rows in (1, 3, 50):
+        assert _run(text, header=False, chunk_rows=chunk_rows)[0] == expected
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from dome_batch import material_codes, sphere_area_batch
+from dome_sweep import pareto_front, sweep
+
+
+def _brute_force_front(area, weight):
+    # 다른 점보다 면적이 작거나 같고 무게가 크거나 같으면(완전히 같은 점은 처음 것만 남김) 지배당한 점
+    keep = []
+    for i in range(len(area)):
+        dominated = False
+        for j in range(len(area)):
+            if j == i:
+                continue
+            if area[j] >= area[i] and weight[j] <= weight[i]:
+                if area[j] > area[i] or weight[j] < weight[i] or j < i:
+                    dominated = True
+                    break
+        if not dominated:
+            keep.append(i)
+    return set(keep)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_pareto_front_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n = 300
+    area = rng.integers(0, 30, n).astype(np.float64)      # 같은 면적/무게가 많도록 정수 값
+    weight = rng.integers(0, 30, n).astype(np.float64)
+    rows = (np.arange(n, dtype=np.float64), np.zeros(n), np.zeros(n, dtype=np.int64), area, weight)
+    front = pareto_front(rows)
+    assert set(front[0].astype(int).tolist()) == _brute_force_front(area, weight)
+    assert (np.diff(front[3]) < 0).all()    # 면적이 큰 순서
+
+
+def test_sweep_chunks_and_constraints_match_full_grid():
+    diameters = np.linspace(1, 30, 40)
+    thicknesses = np.linspace(0.5, 5, 10)
+    materials = ['유리', 'aluminum', '탄소강', '티타늄']
+    one_chunk = sweep(diameters, thicknesses, materials, min_area=100, max_weight=2e5)
+    chunked = sweep(diameters, thicknesses, materials, min_area=100, max_weight=2e5, chunk_size=37)
+    assert chunked == one_chunk
+
+    d, t, m = np.meshgrid(diameters, thicknesses, material_codes(materials), indexing='ij')
+    area, weight, _ = sphere_area_batch(d.ravel(), m.ravel(), t.ravel())
+    feasible = (area >= 100) & (weight <= 2e5)
+    assert one_chunk['evaluated'] == d.size and one_chunk['feasible'] == int(feasible.sum())
+    assert one_chunk['best']['weight_kg'] == pytest.approx(weight[feasible].min())
+
+
+def test_sweep_rejects_unknown_material():
+    with pytest.raises(ValueError):
+        sweep([1.0], [1.0], ['유리', '종이'])
@@ -0,0 +1,25 @@
+import os
+import sys
+import subprocess
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(script, cwd):
+    result = subprocess.run([sys.executable, os.path.join(ROOT, script)], cwd=cwd, capture_output=True, text=True)
+    return result.stdout.strip().splitlines()[-1]
+
+
+@pytest.mark.parametrize('script', ['3.py', 'test_exam1.py'])
+@pytest.mark.parametrize('timestamp', ['2023-8-27 10:00:01', '2023-02-30 10:00:01', 'yesterday'])
+def test_bad_timestamp_is_invalid_log_format(tmp_path, write_log, script, timestamp):
+    write_log(['2023-08-27 10:00:00,INFO,ok', f'{timestamp},INFO,bad'])
+    assert _run(script, tmp_path) == 'Invalid log format.'
+
+
+@pytest.mark.parametrize('script', ['3.py', 'test_exam1.py'])
+def test_valid_log_keeps_duplicate_timestamps(tmp_path, write_log, script):
+    write_log(['2023-08-27 10:00:00,INFO,a', '2023-08-27 10:00:01,WARN,b', '2023-08-27 10:00:01,INFO,c'])
+    last = _run(script, tmp_path)
+    assert last.count('2023-08-27 10:00:01') == 2 and 'a' in last
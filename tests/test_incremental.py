@@ -0,0 +1,222 @@
+import os
+import json
+import pytest
+import main_v02
+from log_compress import open_log
+from log_index import load_log_index
+from log_records import iter_ndjson_by_time, segments_path_for
+from log_time_index import load_time_index
+from log_timestamp import epoch_to_timestamp, timestamp_to_epoch
+from samples import make_log_lines
+
+HEADER = 'timestamp,event,message'
+QUERIES = ['Oxygen', '누출', 'nav system', '#3']
+
+
+def _write(path, lines, mode='w'):
+    with open(path, mode, encoding='utf-8') as f:
+        f.write(''.join(line + '\n' for line in lines))
+
+
+def _run(directory, log_name='mission_computer_main.log', **options):
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        assert main_v02.incremental_process_log(log_name, interactive=False, **options) is None
+    finally:
+        os.chdir(cwd)
+
+
+def _outputs(directory, output_format='json', compress=None):
+    # 결과 파일 내용 (JSONL 은 이어 붙인 구간을 병합한 순서, 색인은 검색/구간 조회 결과로 비교)
+    def path(name):
+        return os.path.join(directory, name)
+
+    jsonl = path(main_v02.OUTPUT_JSONL_FILE)
+    result = {'jsonl': [record for _, record in iter_ndjson_by_time(jsonl)]}
+    if output_format != 'ndjson':
+        with open_log(path(main_v02._output_path(main_v02.OUTPUT_JSON_FILE, compress)), 'rt') as f:
+            result['json'] = f.read()
+    if compress:
+        with open_log(path(main_v02._output_path(main_v02.OUTPUT_JSONL_FILE, compress)), 'rb') as f:
+            assert f.read() == open(jsonl, 'rb').read()
+    with open(path(main_v02.LOG_MD_FILE), encoding='utf-8') as f:
+        result['report'] = f.read()
+    with open(path(main_v02.OUTPUT_STATS_FILE), encoding='utf-8') as f:
+        result['stats'] = json.load(f)
+    with load_log_index(jsonl) as index:
+        result['search'] = [index.search(jsonl, query) for query in QUERIES]
+    with load_time_index(jsonl) as time_index:
+        first, last = time_index.time_span()
+        middle = epoch_to_timestamp((timestamp_to_epoch(first) + timestamp_to_epoch(last)) // 2)
+        result['range'] = [time_index.query_range(first, last), time_index.query_range(middle, last)]
+    return result
+
+
+def _full_run(tmp_path, log_path, **options):
+    # 같은 로그를 새 디렉터리에서 처음부터 처리한 결과
+    fresh = tmp_path / 'fresh'
+    fresh.mkdir(exist_ok=True)
+    for name in os.listdir(fresh):
+        os.remove(fresh / name)
+    with open(log_path, 'rb') as src, open(fresh / 'mission_computer_main.log', 'wb') as dst:
+        dst.write(src.read())
+    _run(fresh, **options)
+    return _outputs(fresh, options.get('output_format', 'json'), options.get('compress'))
+
+
+def _later_lines(lines, count, seed, tie=True):
+    # 기존 마지막 시간 이후의 새 줄 (tie 이면 첫 줄은 기존 마지막 시간과 같은 위험 로그)
+    newest = max(timestamp_to_epoch(line[:19]) for line in lines)
+    new = make_log_lines(count, seed=seed, start=newest + 1)
+    if tie:
+        new.insert(0, f'{epoch_to_timestamp(newest)},WARN,Oxygen 누출 재확인')
+    return new
+
+
+@pytest.mark.parametrize('options', [{}, {'output_format': 'compact', 'compress': 'gz'},
+                                     {'output_format': 'ndjson', 'compress': 'xz'}])
+def test_append_matches_full_run(tmp_path, options):
+    work = tmp_path / 'work'
+    work.mkdir()
+    log_path = work / 'mission_computer_main.log'
+    lines = make_log_lines(400, seed=1)
+    _write(log_path, [HEADER, *lines])
+    _run(work, **options)
+
+    for seed in (2, 3):
+        new = _later_lines(lines, 30, seed)
+        _write(log_path, new, 'a')
+        lines += new
+        _run(work, **options)
+        assert _outputs(work, **options) == _full_run(tmp_path, log_path, **options)
+    # 새 줄은 JSONL 끝에 이어 붙이므로 구간이 세 개
+    with open(segments_path_for(str(work / main_v02.OUTPUT_JSONL_FILE)), encoding='utf-8') as f:
+        assert len(json.load(f)['starts']) == 3
+
+
+def test_partial_line_waits_for_newline(tmp_path):
+    log_path = tmp_path / 'mission_computer_main.log'
+    lines = make_log_lines(50, seed=4)
+    _write(log_path, [HEADER, *lines])
+    _run(tmp_path)
+    new = _later_lines(lines, 5, seed=5, tie=False)
+    with open(log_path, 'a', encoding='utf-8') as f:
+        f.write('\n'.join(new))     # 마지막 줄은 아직 줄바꿈 없음
+    _run(tmp_path)
+    assert len(_outputs(tmp_path)['jsonl']) == 50 + 4
+    _write(log_path, [''], 'a')
+    _run(tmp_path)
+    assert len(_outputs(tmp_path)['jsonl']) == 55
+
+
+def test_out_of_order_append_rewrites_everything(tmp_path):
+    work = tmp_path / 'work'
+    work.mkdir()
+    log_path = work / 'mission_computer_main.log'
+    lines = make_log_lines(200, seed=6)
+    _write(log_path, [HEADER, *lines])
+    _run(work)
+    _write(log_path, _later_lines(lines, 10, seed=7), 'a')
+    _run(work)
+    # 기존 레코드 사이에 들어가는 줄 → 전체를 다시 써서 구간 기록이 없어짐
+    _write(log_path, make_log_lines(10, seed=8), 'a')
+    _run(work)
+    assert not os.path.exists(segments_path_for(str(work / main_v02.OUTPUT_JSONL_FILE)))
+    assert _outputs(work) == _full_run(tmp_path, log_path)
+
+
+def test_too_many_segments_are_compacted(tmp_path, monkeypatch):
+    monkeypatch.setattr(main_v02, 'MAX_JSONL_SEGMENTS', 2)
+    work = tmp_path / 'work'
+    work.mkdir()
+    log_path = work / 'mission_computer_main.log'
+    lines = make_log_lines(100, seed=9)
+    _write(log_path, [HEADER, *lines])
+    _run(work)
+    segments = segments_path_for(str(work / main_v02.OUTPUT_JSONL_FILE))
+    for seed, compacted in ((10, False), (11, True)):
+        new = _later_lines(lines, 10, seed)
+        _write(log_path, new, 'a')
+        lines += new
+        _run(work)
+        assert os.path.exists(segments) is not compacted
+    assert _outputs(work) == _full_run(tmp_path, log_path)
+
+
+def _snapshot(directory):
+    # 로그를 뺀 모든 결과 파일의 내용
+    snapshot = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            if name != 'mission_computer_main.log':
+                snapshot[os.path.relpath(path, directory)] = open(path, 'rb').read()
+    return snapshot
+
+
+@pytest.mark.parametrize('fail_at', ['json', 'report', 'index'])
+@pytest.mark.parametrize('options', [{}, {'output_format': 'compact', 'compress': 'gz'}])
+def test_failed_append_leaves_outputs_unchanged(tmp_path, monkeypatch, capsys, fail_at, options):
+    work = tmp_path / 'work'
+    work.mkdir()
+    log_path = work / 'mission_computer_main.log'
+    lines = make_log_lines(200, seed=15)
+    _write(log_path, [HEADER, *lines])
+    _run(work, **options)
+    new = _later_lines(lines, 10, seed=16)
+    _write(log_path, new, 'a')
+    lines += new
+    _run(work, **options)     # 구간이 이미 두 개인 상태에서 실패
+    before = _snapshot(work)
+
+    def fail(*args, **kwargs):
+        raise OSError('disk full')
+
+    # JSON / 보고서는 JSONL 에 추가하기 전, 색인 저장은 JSONL 에 추가한 뒤
+    target = {'json': (main_v02, 'prepend_json_records'), 'report': (main_v02, '_prepend_danger_rows'),
+              'index': (main_v02.LogIndexWriter, 'commit')}[fail_at]
+    _write(log_path, _later_lines(lines, 10, seed=17), 'a')
+    with monkeypatch.context() as patch:
+        patch.setattr(*target, fail)
+        cwd = os.getcwd()
+        os.chdir(work)
+        try:
+            result = main_v02.incremental_process_log('mission_computer_main.log', interactive=False, **options)
+        finally:
+            os.chdir(cwd)
+    assert 'disk full' in result
+    assert _snapshot(work) == before
+
+    # 체크포인트가 그대로 맞으므로 다음 실행은 새 줄만 이어 씀
+    capsys.readouterr()
+    _run(work, **options)
+    assert '증분 처리 완료: 새 레코드 11건' in capsys.readouterr().out
+    assert _outputs(work, **options) == _full_run(tmp_path, log_path, **options)
+
+
+@pytest.mark.parametrize('change', ['truncate', 'rotate', 'edit_head', 'outputs_changed'])
+def test_checkpoint_reset_reprocesses_from_start(tmp_path, change):
+    work = tmp_path / 'work'
+    work.mkdir()
+    log_path = work / 'mission_computer_main.log'
+    lines = make_log_lines(150, seed=12)
+    _write(log_path, [HEADER, *lines])
+    _run(work)
+    _write(log_path, _later_lines(lines, 10, seed=13), 'a')
+    _run(work)
+
+    if change == 'truncate':
+        _write(log_path, [HEADER, *lines[:40]])
+    elif change == 'rotate':
+        os.rename(log_path, work / 'mission_computer_main.log.1')
+        _write(log_path, [HEADER, *make_log_lines(60, seed=14)])
+    elif change == 'edit_head':
+        # 크기는 그대로 두고 앞부분만 바꿈
+        data = open(log_path, 'rb').read()
+        open(log_path, 'wb').write(data.replace(b'INFO', b'IFNO', 1))
+    else:
+        os.remove(work / main_v02.OUTPUT_STATS_FILE)
+    _run(work)
+    assert not os.path.exists(segments_path_for(str(work / main_v02.OUTPUT_JSONL_FILE)))
+    assert _outputs(work) == _full_run(tmp_path, log_path)
@@ -0,0 +1,34 @@
+import random
+from keyword_matcher import KeywordMatcher
+
+DANGER = ['폭발', '누출', '고온', 'Oxygen', '산소', '위험']
+
+
+def _naive(keywords, text):
+    lowered = text.lower()
+    return [k for k in keywords if k and k.lower() in lowered]
+
+
+def test_matches_naive_search_on_random_text():
+    rng = random.Random(1)
+    keywords = ['he', 'she', 'his', 'hers', 'Ab', 'bab', 'abab', '가나', '나다', '가나다라']
+    alphabet = 'abhers가나다라 '
+    matcher = KeywordMatcher(keywords)
+    for _ in range(2000):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randrange(0, 20)))
+        expected = _naive(keywords, text)
+        assert matcher.find_all(text) == expected
+        assert matcher.search(text) is bool(expected)
+
+
+def test_case_insensitive_and_keyword_order():
+    matcher = KeywordMatcher(DANGER)
+    assert matcher.find_all('OXYGEN 누출, 폭발 위험') == ['폭발', '누출', 'Oxygen', '위험']
+    assert matcher.find_indices('산소 탱크 고온') == [2, 4]
+    assert not matcher.search('정상 작동')
+
+
+def test_empty_and_duplicate_keywords():
+    matcher = KeywordMatcher(['', 'ab', 'AB'])
+    assert matcher.find_all('xaby') == ['ab', 'AB']
+    assert KeywordMatcher([]).find_all('anything') == []
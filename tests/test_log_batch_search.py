@@ -0,0 +1,61 @@
+import re
+import json
+import pytest
+from log_batch_search import BatchSearcher, batch_search, parse_queries, save_results
+from log_records import NdjsonWriter
+from log_stream import iter_log_records, sort_records_external
+from samples import make_log_lines
+
+QUERY_LINES = [
+    '# 주석', '', 'oxygen', '누출', '  nav system  ', 'CHECK',
+    're:tank\\s+unstable', 're:^고온', 're:(위험|누출) 감지', 're:(?i)TELEMETRY', 're:#\\d0$',
+]
+
+
+def _naive(queries, records, limit=None):
+    # 검색어마다 따로 전체를 훑는 방식 (대화형 검색과 같은 규칙)
+    results = []
+    for text, is_regex in queries:
+        if is_regex:
+            hits = [r for r in records if re.search(text, r[2])]
+        else:
+            hits = [r for r in records if text.lower() in r[2].lower()]
+        results.append({'query': text, 'regex': is_regex, 'count': len(hits),
+                        'hits': [(r[1], r[3], r[2]) for r in hits][:limit]})
+    return results
+
+
+def test_parse_queries():
+    assert parse_queries(QUERY_LINES[:7]) == [('oxygen', False), ('누출', False), ('nav system', False),
+                                              ('CHECK', False), ('tank\\s+unstable', True)]
+    with pytest.raises(ValueError):
+        parse_queries(['re:(unclosed'])
+
+
+@pytest.mark.parametrize('limit', [None, 3])
+def test_batch_matches_one_query_at_a_time(write_log, limit):
+    records = list(iter_log_records(write_log(make_log_lines(500, seed=1))))
+    queries = parse_queries(QUERY_LINES)
+    assert BatchSearcher(queries).run(records, limit) == _naive(queries, records, limit)
+    # (?i) 가 없으면 그룹 없는 정규식들을 하나로 묶어서 먼저 검사하는 경로
+    combined = [query for query in queries if not query[0].startswith('(?i)')]
+    assert BatchSearcher(combined)._combined is not None
+    assert BatchSearcher(combined).run(records, limit) == _naive(combined, records, limit)
+
+
+def test_batch_search_reads_log_and_jsonl(write_log, tmp_path):
+    log_path = write_log(make_log_lines(200, seed=2))
+    records = list(sort_records_external(iter_log_records(log_path)))
+    jsonl = str(tmp_path / 'out.jsonl')
+    with NdjsonWriter(jsonl) as writer:
+        for record in records:
+            writer.write(record)
+    queries = parse_queries(QUERY_LINES)
+    expected = _naive(queries, records)
+    assert batch_search(jsonl, queries) == expected
+    assert [r['count'] for r in batch_search(log_path, queries)] == [r['count'] for r in expected]
+
+    saved = str(tmp_path / 'results.jsonl')
+    save_results(expected, saved)
+    with open(saved, encoding='utf-8') as f:
+        assert [json.loads(line)['query'] for line in f] == [text for text, _ in queries]
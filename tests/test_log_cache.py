@@ -0,0 +1,78 @@
+import os
+import main_v02
+import log_cache
+from log_cache import LogCacheWriter, load_log_cache
+from log_stream import iter_log_records
+from samples import make_log_lines
+
+
+def _build(log_path):
+    records = sorted(iter_log_records(log_path), key=lambda record: record[0], reverse=True)
+    writer = LogCacheWriter(log_path)
+    for record in records:
+        writer.add_record(record)
+    writer.commit()
+    return records
+
+
+def test_iter_matches_records_across_blocks(write_log, monkeypatch):
+    monkeypatch.setattr(log_cache, 'ITER_BLOCK', 7)
+    log_path = write_log(make_log_lines(100, seed=1))
+    records = _build(log_path)
+    cache = load_log_cache(log_path)
+    assert list(cache) == records
+    assert cache.message(5) == records[5][2]
+
+
+def test_empty_log_cache(write_log):
+    log_path = write_log([])
+    _build(log_path)
+    assert list(load_log_cache(log_path)) == []
+
+
+def test_cache_invalidated_by_changes(write_log, tmp_path):
+    log_path = write_log(make_log_lines(50, seed=2))
+    _build(log_path)
+    assert load_log_cache(log_path) is not None
+
+    # 같은 크기로 끝부분만 바꾸고 수정 시간을 되돌려도 뒷부분 해시로 알아냄
+    stat = os.stat(log_path)
+    data = open(log_path, 'rb').read()
+    open(log_path, 'wb').write(data[:-3] + b'XYZ')
+    os.utime(log_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert load_log_cache(log_path) is None
+
+    _build(log_path)
+    os.utime(log_path)      # touch
+    assert load_log_cache(log_path) is None
+
+    _build(log_path)
+    os.rename(log_path, str(tmp_path / 'old.log'))     # 같은 내용의 다른 파일 (교체된 로그)
+    with open(str(tmp_path / 'old.log'), 'rb') as src, open(log_path, 'wb') as dst:
+        dst.write(src.read())
+    os.utime(log_path, ns=(stat.st_atime_ns, os.stat(str(tmp_path / 'old.log')).st_mtime_ns))
+    assert load_log_cache(log_path) is None
+
+
+def test_outputs_not_rewritten_when_up_to_date(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main_v02, 'search_log_json', lambda: None)
+    monkeypatch.setattr(main_v02, 'print_danger_report', lambda: None)
+    with open('mission_computer_main.log', 'w', encoding='utf-8') as f:
+        f.write('\n'.join(['timestamp,event,message', *make_log_lines(80, seed=3)]) + '\n')
+
+    def run(**options):
+        assert main_v02.stream_and_process_log('mission_computer_main.log', use_cache=True, **options) is None
+        return {name: os.stat(name).st_mtime_ns for name in (main_v02.OUTPUT_JSON_FILE, main_v02.OUTPUT_JSONL_FILE)}
+
+    first = run()
+    assert run() == first       # 캐시와 결과가 그대로면 다시 쓰지 않음
+    expected = open(main_v02.OUTPUT_JSON_FILE, 'rb').read()
+
+    os.remove(main_v02.OUTPUT_STATS_FILE)
+    assert run() != first       # 결과 파일이 없어지면 캐시로 다시 씀
+    assert open(main_v02.OUTPUT_JSON_FILE, 'rb').read() == expected
+    assert os.path.exists(main_v02.OUTPUT_STATS_FILE)
+
+    second = run()
+    assert run(output_format='compact') != second      # 출력 옵션이 다르면 다시 씀
@@ -0,0 +1,50 @@
+import gzip
+import pytest
+import main
+from log_compress import LogSizeError, open_log, open_output, read_log_lines
+from samples import make_log_lines
+
+
+@pytest.mark.parametrize('suffix', ['', '.gz', '.xz'])
+def test_open_log_max_bytes_counts_decompressed_bytes(tmp_path, suffix):
+    path = str(tmp_path / f'a.log{suffix}')
+    data = ('x' * 99 + '\n') * 100     # 10000 바이트 (압축하면 훨씬 작음)
+    with open_output(path, 'w') as f:
+        f.write(data)
+    with open_log(path, 'rt', max_bytes=10000) as f:
+        assert f.read() == data
+    with pytest.raises(LogSizeError):
+        with open_log(path, 'rb', max_bytes=9999) as f:
+            f.read()
+    with pytest.raises(LogSizeError):
+        read_log_lines(path, max_bytes=9999)
+
+
+@pytest.mark.parametrize('suffix', ['', '.gz', '.xz'])
+def test_open_output_append_adds_member(tmp_path, suffix):
+    path = str(tmp_path / f'a.jsonl{suffix}')
+    with open_output(path, 'wb') as f:
+        f.write(b'first\n')
+    with open_output(path, 'ab') as f:
+        f.write(b'second\n')
+    with open_log(path, 'rb') as f:
+        assert f.read() == b'first\nsecond\n'
+
+
+def test_file_read_same_result_for_compressed_log(write_log):
+    path = write_log(make_log_lines(300, seed=1))
+    with open(path, 'rb') as src, gzip.open(path + '.gz', 'wb') as dst:
+        dst.write(src.read())
+    plain = main.file_read(path)
+    assert isinstance(plain, dict)
+    assert main.file_read(path + '.gz') == plain
+
+
+def test_file_read_size_limit_uses_decompressed_size(tmp_path):
+    # 압축하면 수십 KB 지만 풀면 MAX_MB(10MB) 를 넘는 로그
+    path = str(tmp_path / 'big.log.gz')
+    line = '2023-08-27 10:00:00,INFO,' + 'x' * 200 + '\n'
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        f.write('timestamp,event,message\n')
+        f.write(line * (11 * 1024 * 1024 // len(line)))
+    assert main.file_read(path) == "파일 용량이 너무 큽니다."
@@ -0,0 +1,69 @@
+import os
+import sys
+import logging
+import subprocess
+import pytest
+from log_diag import LineDiagnostics
+from main_v01 import parse_log_lines
+
+MAIN_V01 = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main_v01.py')
+LINES = ['2023-08-27 10:00:00,INFO,ok\n', 'no comma here\n', '2023-08-27 10:00:01,WARN,a\n', 'still no comma\n']
+
+
+@pytest.fixture
+def diag_records(caplog):
+    # get_logger 는 propagate=False 라서 caplog 핸들러를 logger 에 직접 붙임
+    attached = []
+
+    def make(name, verbose, **kwargs):
+        diag = LineDiagnostics(name, verbose, **kwargs)
+        diag.logger.addHandler(caplog.handler)
+        attached.append(diag.logger)
+        return diag
+
+    yield make
+    for logger in attached:
+        logger.removeHandler(caplog.handler)
+
+
+def test_skipped_lines_are_counted_and_logged(caplog, diag_records):
+    diag = diag_records('test_diag_v1', verbose=1)
+    parsed = parse_log_lines(LINES, diag)
+    assert len(parsed) == 2
+    assert (diag.lines_read, diag.accepted, diag.skipped) == (4, 2, {'쉼표 없음': 2})
+    assert [(r.levelno, r.getMessage()) for r in caplog.records] == [
+        (logging.INFO, "skip reason=쉼표 없음 line=2 text='no comma here'"),
+        (logging.INFO, "skip reason=쉼표 없음 line=4 text='still no comma'"),
+    ]
+    assert diag.summary() == '📊 읽은 줄 4 | 통과 2 | 건너뜀 2 (쉼표 없음 2)'
+
+
+def test_verbosity_levels(caplog, diag_records):
+    quiet = diag_records('test_diag_v0', verbose=0)
+    quiet.skip('빈 줄', 1)
+    quiet.dump('리스트', [1, 2])
+    assert quiet.skipped == {'빈 줄': 1} and caplog.records == []
+
+    limited = diag_records('test_diag_limit', verbose=1, sample_limit=2)
+    for i in range(1, 6):
+        limited.skip('필드 부족', i, 'x')
+    limited.dump('리스트', [1, 2])     # verbose=1 에서는 덤프하지 않음
+    messages = [r.getMessage() for r in caplog.records]
+    assert messages[:2] == ["skip reason=필드 부족 line=1 text='x'", "skip reason=필드 부족 line=2 text='x'"]
+    assert len(messages) == 3 and '출력 생략' in messages[2]
+    assert limited.skipped == {'필드 부족': 5}
+
+    caplog.clear()
+    loud = diag_records('test_diag_v2', verbose=2)
+    loud.dump('리스트', [1, 2])
+    assert [(r.levelno, r.getMessage()) for r in caplog.records] == [(logging.DEBUG, 'dump 리스트\n[1, 2]')]
+
+
+@pytest.mark.parametrize('flags', [[], ['-v']])
+def test_cli_verbose_flag(tmp_path, write_log, flags):
+    write_log([line.strip() for line in LINES])
+    result = subprocess.run([sys.executable, MAIN_V01, *flags], cwd=tmp_path, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert '통과 3 | 건너뜀 2 (쉼표 없음 2)' in result.stdout     # 헤더 줄도 쉼표가 있어서 통과
+    logged = 'skip reason=쉼표 없음 line=3' in result.stderr and 'line=5' in result.stderr
+    assert logged == bool(flags)
@@ -0,0 +1,110 @@
+import os
+import re
+import pytest
+import log_index
+from log_index import LogIndexWriter, build_log_index, load_log_index, tokenize
+from log_records import ndjson_line, iter_ndjson_records
+from log_stream import iter_log_records
+from log_timestamp import epoch_to_timestamp
+from samples import make_log_lines
+
+QUERIES = ['Oxygen', 'oxy', 'OXYGEN tank', '산소 누출', 'tank OR 고온', '누', '감지 AND 폭발',
+           'nav system', 'xyz', 'telemetry link established', '연', '#1', '']
+# 단어 중간 조각, 한글과 붙은 조각, 기호만 있는 검색어 (색인 토큰과 경계가 맞지 않음)
+FRAGMENTS = ['ygen', 'YGEN', 'elemetr', 'k unst', 'ank', 'ystem chec', '소누', '소 누', '감지 #1', '#', ', ',
+             'n #12', '12', 'gen tank OR 출 감', 'system,']
+
+
+def _write_jsonl(path, records, mode='w'):
+    with open(path, mode, encoding='utf-8') as f:
+        for record in records:
+            f.write(ndjson_line(record))
+
+
+def _sorted_records(log_path):
+    return sorted(iter_log_records(log_path), key=lambda record: record[0], reverse=True)
+
+
+def _naive_search(jsonl_path, text):
+    # 색인 없이 항목마다 예전 검색과 같은 부분 문자열 비교 (공백 = AND, OR)
+    records = [record for _, record in iter_ndjson_records(jsonl_path)]
+    clauses = [[t.lower() for t in clause.split() if t != 'AND'] for clause in re.split(r'\s+OR\s+', text.strip())]
+    clauses = [terms for terms in clauses if terms] or [['']]
+    matched = []
+    for doc_id, record in enumerate(records):
+        message = record[2].lower()
+        if any(all(term in message for term in terms) for terms in clauses):
+            matched.append((-record[0], doc_id, record))
+    return [(record[1], record[2]) for _, _, record in sorted(matched)]
+
+
+@pytest.fixture
+def jsonl(tmp_path, write_log):
+    path = str(tmp_path / 'mission_computer_main.jsonl')
+    _write_jsonl(path, _sorted_records(write_log(make_log_lines(2000, seed=3))))
+    return path
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_index_matches_naive_search(jsonl, query):
+    with build_log_index(jsonl) as index:
+        assert index.search(jsonl, query) == _naive_search(jsonl, query)
+
+
+@pytest.mark.parametrize('query', FRAGMENTS)
+def test_index_matches_substring_scan_for_fragments(jsonl, query):
+    with build_log_index(jsonl) as index:
+        rows = index.search(jsonl, query)
+        assert rows == _naive_search(jsonl, query)
+        assert [index.fetch(jsonl, [doc_id])[0] for doc_id in index.query(query)] == rows
+    if query == 'ygen':
+        assert rows     # 예전 검색('ygen' in message)에서 찾던 로그를 그대로 찾음
+
+
+def test_spilled_runs_match_single_run(jsonl, monkeypatch):
+    with build_log_index(jsonl) as index:
+        expected = {query: index.query(query) for query in QUERIES}
+    # run 을 여러 개 내보내고, 병합도 여러 단계로 나누어지도록
+    monkeypatch.setattr(log_index, 'RUN_POSTINGS', 50)
+    monkeypatch.setattr(log_index, 'MERGE_FAN_IN', 3)
+    with build_log_index(jsonl) as index:
+        assert {query: index.query(query) for query in QUERIES} == expected
+    # 지난 세그먼트는 지워지고 세그먼트 하나만 남음
+    assert len([name for name in os.listdir(os.path.dirname(jsonl)) if name.endswith('.seg')]) == 1
+
+
+def test_load_rejects_changed_jsonl(jsonl):
+    build_log_index(jsonl).close()
+    assert load_log_index(jsonl) is not None
+    with open(jsonl, 'a', encoding='utf-8') as f:
+        f.write(ndjson_line((1693094400, '2023-08-27 00:00:00', 'late', 'INFO')))
+    assert load_log_index(jsonl) is None
+
+
+def test_append_segments_match_naive_search(jsonl):
+    build_log_index(jsonl).close()
+    last_epoch = next(iter_ndjson_records(jsonl))[1][0]
+    # 새 항목을 JSONL 끝에 추가하면서 세그먼트를 덧붙임 (새 세그먼트가 커지면 병합됨)
+    for batch in range(6):
+        epoch = last_epoch + batch
+        records = [(epoch, epoch_to_timestamp(epoch), f'산소 누출 batch{batch} #{i}', 'WARN')
+                   for i in range(batch * 40 + 1)]
+        writer = LogIndexWriter(jsonl, append=True)
+        offset = os.path.getsize(jsonl)
+        with open(jsonl, 'a', encoding='utf-8') as f:
+            for record in records:
+                writer.add_record(offset, record)
+                line = ndjson_line(record)
+                f.write(line)
+                offset += len(line.encode('utf-8'))
+        writer.commit()
+    with load_log_index(jsonl) as index:
+        assert len(index.segments) < 6
+        appended = {query: index.search(jsonl, query) for query in QUERIES + ['batch3']}
+    assert appended == {query: _naive_search(jsonl, query) for query in QUERIES + ['batch3']}
+
+
+def test_append_requires_matching_index(jsonl):
+    with pytest.raises(ValueError):
+        LogIndexWriter(jsonl, append=True)
+
@@ -0,0 +1,52 @@
+import os
+from log_merge import expand_log_sources, merged_sorted_records
+from log_stream import iter_log_records
+from samples import make_log_lines
+
+
+def _write_sources(write_log, count=3):
+    # 시간이 겹치고 같은 timestamp 가 파일 사이에도 나오는 로그들
+    return [write_log(make_log_lines(150, seed=seed, max_step=1), name=f'logs/m{seed}.log')
+            for seed in range(1, count + 1)]
+
+
+def _expected(paths):
+    # 파일 순서대로 이어 붙인 뒤 안정 정렬 = 같은 시간이면 파일 순서, 파일 안에서는 줄 순서
+    records = [(*record, path) for path in paths for record in iter_log_records(path)]
+    return sorted(records, key=lambda record: record[0], reverse=True)
+
+
+def test_k_way_merge_matches_sorted_concatenation(tmp_path, write_log):
+    (tmp_path / 'logs').mkdir()
+    paths = _write_sources(write_log)
+    assert list(merged_sorted_records(paths)) == _expected(paths)
+    assert list(merged_sorted_records(paths[::-1])) == _expected(paths[::-1])
+
+
+def test_parallel_merge_matches_serial(tmp_path, write_log):
+    (tmp_path / 'logs').mkdir()
+    paths = _write_sources(write_log)
+    run_dir = tmp_path / 'runs'
+    run_dir.mkdir()
+    assert list(merged_sorted_records(paths, workers=2, tmp_dir=str(run_dir))) == _expected(paths)
+    assert os.listdir(run_dir) == []
+
+
+def test_merge_single_and_empty_files(tmp_path, write_log):
+    (tmp_path / 'logs').mkdir()
+    only = write_log(make_log_lines(20, seed=9), name='logs/only.log')
+    empty = write_log([], name='logs/empty.log')
+    assert list(merged_sorted_records([empty, only])) == _expected([only])
+    assert list(merged_sorted_records([])) == []
+
+
+def test_expand_log_sources(tmp_path, write_log):
+    (tmp_path / 'logs').mkdir()
+    paths = _write_sources(write_log, 2)
+    (tmp_path / 'logs' / 'notes.txt').write_text('x', encoding='utf-8')
+    (tmp_path / 'logs' / 'old.log.gz').write_bytes(b'')
+    logs = str(tmp_path / 'logs')
+    assert expand_log_sources(logs) == sorted(paths + [os.path.join(logs, 'old.log.gz')])
+    assert expand_log_sources(os.path.join(logs, 'm*.log')) == paths
+    assert expand_log_sources(paths[0]) == [paths[0]]
+    assert expand_log_sources(os.path.join(logs, 'missing.log')) == []
@@ -0,0 +1,50 @@
+import pytest
+import log_mmap
+from log_mmap import iter_mmap_records
+from log_timestamp import timestamp_to_epoch
+from samples import make_log_lines
+
+EDGE_LINES = [
+    '  2023-08-27 10:00:00 , INFO,  hi there  \r',
+    '2023-08-27 10:00:0x,INFO,bad second',
+    '',
+    '2023-08-27 10:00:01,WARN',
+    '2023-08-27 10:00:02,WARN,a,b,c',
+    'no comma',
+    '2023-02-30 10:00:00,INFO,no such day',
+    '2023-8-27 10:00:03,INFO,not padded',
+    '2023-08-27 10:00:04,INFO,가 나',
+]
+
+
+def _expected(path, skip_event):
+    # str 로 읽어서 나눈 결과 (split(',', 1) 또는 split(',', 2))
+    records = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            parts = line.strip().split(',', 2 if skip_event else 1)
+            epoch = timestamp_to_epoch(parts[0].strip())
+            if epoch is None or len(parts) < (3 if skip_event else 2):
+                continue
+            records.append((epoch, parts[0].strip(), parts[-1].strip()))
+    return records
+
+
+@pytest.mark.parametrize('skip_event', [False, True])
+def test_mmap_matches_str_parse(write_log, skip_event):
+    path = write_log(EDGE_LINES + make_log_lines(2000))
+    assert list(iter_mmap_records(path, skip_event)) == _expected(path, skip_event)
+
+
+def test_mmap_small_blocks(write_log, monkeypatch):
+    # 블록 경계가 줄 중간에 오도록 작은 블록으로 나누어도 결과가 같아야 함
+    path = write_log(EDGE_LINES + make_log_lines(300))
+    expected = list(iter_mmap_records(path))
+    monkeypatch.setattr(log_mmap, 'BLOCK_SIZE', 37)
+    assert list(iter_mmap_records(path)) == expected
+
+
+def test_mmap_empty_file(tmp_path):
+    path = tmp_path / 'empty.log'
+    path.write_bytes(b'')
+    assert list(iter_mmap_records(str(path))) == []
@@ -0,0 +1,32 @@
+from log_parallel import parallel_sorted_records, split_byte_ranges
+from log_stream import iter_log_records
+from keyword_matcher import KeywordMatcher
+from samples import make_log_lines
+
+KEYWORDS = ['폭발', '누출', '고온', 'Oxygen']
+
+
+def _serial(path):
+    # 시간 역순 안정 정렬 → 같은 시간 안에서는 원래 줄 순서
+    matcher = KeywordMatcher(KEYWORDS)
+    records = sorted(iter_log_records(path), key=lambda record: record[0], reverse=True)
+    return [(*record, None, tuple(matcher.find_indices(record[2]))) for record in records]
+
+
+def test_split_byte_ranges_cover_file_on_line_boundaries(write_log):
+    path = write_log(make_log_lines(500))
+    data = open(path, 'rb').read()
+    ranges = split_byte_ranges(path, 7)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start and data[start - 1:start] == b'\n'
+
+
+def test_parallel_matches_serial(write_log):
+    path = write_log(make_log_lines(3000, seed=1) + ['garbage line', '', '2023-8-27 10:00:00,INFO,bad date'])
+    assert list(parallel_sorted_records(path, 2, KEYWORDS)) == _serial(path)
+
+
+def test_parallel_small_file(write_log):
+    path = write_log(make_log_lines(3, seed=2))
+    assert list(parallel_sorted_records(path, 4, KEYWORDS)) == _serial(path)
@@ -0,0 +1,96 @@
+import gzip
+import threading
+import time
+import pytest
+from log_pipeline import iter_line_blocks, pipelined_records, pipelined_sorted_records, threaded_batches, threaded_iter
+from log_stream import iter_log_records, sort_records_external
+from samples import make_log_lines
+
+
+def _alive(name):
+    return [thread for thread in threading.enumerate() if thread.name == name]
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_pipelined_matches_external_sort(write_log, workers):
+    path = write_log(make_log_lines(3000, seed=1, max_step=1))
+    expected = list(sort_records_external(iter_log_records(path)))
+    assert list(pipelined_sorted_records(path, workers=workers)) == expected
+    assert not _alive('log-reader') and not _alive('log-sorter')
+
+
+def test_pipelined_reads_compressed_and_crlf(tmp_path, write_log):
+    path = write_log(make_log_lines(500, seed=2))
+    with open(path, 'rb') as src, gzip.open(path + '.gz', 'wb') as dst:
+        dst.write(src.read().replace(b'\n', b'\r\n'))
+    assert list(pipelined_sorted_records(path + '.gz')) == list(sort_records_external(iter_log_records(path)))
+
+
+def test_line_blocks_end_on_newlines(write_log):
+    path = write_log(make_log_lines(200, seed=3))
+    data = open(path, 'rb').read()
+    for block_size in (1, 7, 64, 1 << 20):
+        blocks = list(iter_line_blocks(path, block_size))
+        assert b''.join(blocks) == data
+        assert all(block.endswith(b'\n') for block in blocks)
+
+
+def test_reader_error_reaches_consumer(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        list(pipelined_sorted_records(str(tmp_path / 'missing.log')))
+    assert not _alive('log-reader') and not _alive('log-sorter')
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_parser_error_reaches_consumer(tmp_path, workers):
+    path = tmp_path / 'broken.log'
+    path.write_bytes('\n'.join(make_log_lines(50, seed=4)).encode('utf-8') + b'\n\xff\xfe broken\n')
+    with pytest.raises(UnicodeDecodeError):
+        list(pipelined_records(str(path), workers=workers))
+    with pytest.raises(UnicodeDecodeError):
+        list(pipelined_sorted_records(str(path), workers=workers))
+
+
+def test_producer_error_after_items():
+    def produce():
+        yield 1
+        yield 2
+        raise RuntimeError('boom')
+
+    received = []
+    with pytest.raises(RuntimeError, match='boom'):
+        for item in threaded_iter(produce(), batch_size=1, name='test-error'):
+            received.append(item)
+    assert received == [1, 2]
+    assert not _alive('test-error')
+
+
+def test_early_close_stops_blocked_producer():
+    closed = threading.Event()
+
+    def endless():
+        try:
+            i = 0
+            while True:
+                yield i
+                i += 1
+        finally:
+            closed.set()
+
+    batches = threaded_batches(endless(), depth=1, batch_size=3, name='test-endless')
+    assert next(batches) == [0, 1, 2]
+    time.sleep(0.05)    # 생산 스레드가 가득 찬 큐에서 기다리는 상태
+    started = time.perf_counter()
+    batches.close()
+    assert time.perf_counter() - started < 2
+    assert not _alive('test-endless')
+    assert closed.is_set()      # 앞 단계 제너레이터도 닫힘
+
+
+def test_early_close_of_sorted_pipeline(write_log):
+    path = write_log(make_log_lines(2000, seed=5))
+    records = pipelined_sorted_records(path)
+    first = next(records)
+    assert first == next(iter(sort_records_external(iter_log_records(path))))
+    records.close()
+    assert not _alive('log-reader') and not _alive('log-sorter')
@@ -0,0 +1,56 @@
+import os
+import sys
+import json
+import subprocess
+import tracemalloc
+from log_profile import StageProfiler
+from main_v01 import parse_log_lines
+from samples import make_log_lines
+
+MAIN_V01 = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main_v01.py')
+KEYS = ['name', 'wall', 'cpu', 'records_in', 'records_out', 'peak_kb']
+
+
+def test_stage_records_counts_and_json(tmp_path):
+    lines = [line + '\n' for line in make_log_lines(200, seed=1)] + ['no comma\n']
+    profiler = StageProfiler(enabled=True)
+    with profiler.stage('parse', records_in=len(lines)) as stage:
+        stage.records_out = len(parse_log_lines(lines))
+    profiler.stop()
+    assert not tracemalloc.is_tracing()
+
+    path = str(tmp_path / 'profile.json')
+    profiler.save_json(path)
+    with open(path, encoding='utf-8') as f:
+        saved = json.load(f)
+    assert [list(row) for row in saved] == [KEYS]
+    row = saved[0]
+    assert (row['name'], row['records_in'], row['records_out']) == ('parse', 201, 200)
+    assert row['wall'] > 0 and row['cpu'] >= 0 and row['peak_kb'] >= 0
+    assert '| parse |' in profiler.format_table()
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = StageProfiler()
+    with profiler.stage('parse', records_in=3) as stage:
+        stage.records_out = 3
+    assert profiler.stages == [] and not tracemalloc.is_tracing()
+
+
+def test_cli_profile_json(tmp_path, write_log):
+    write_log(make_log_lines(100, seed=2) + ['no comma'])
+    result = subprocess.run([sys.executable, MAIN_V01, '--profile-json', 'profile.json'], cwd=tmp_path,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    with open(tmp_path / 'profile.json', encoding='utf-8') as f:
+        saved = json.load(f)
+    assert all(list(row) == KEYS for row in saved)
+    # 헤더 포함 102줄을 읽고 쉼표 없는 줄 하나를 뺀 101건이 이후 단계를 지남 (JSON 은 같은 초가 하나로 합쳐짐)
+    counts = {row['name']: (row['records_in'], row['records_out']) for row in saved}
+    assert list(counts) == ['read', 'parse', 'sort', 'json', 'jsonl']
+    assert counts['read'] == (None, 102)
+    assert counts['parse'] == (102, 101)
+    assert counts['sort'] == (101, 101)
+    assert counts['json'][0] == 101 and counts['json'][1] <= 101
+    assert counts['jsonl'] == (101, 101)
+    assert all(row['wall'] >= 0 and row['cpu'] >= 0 and row['peak_kb'] >= 0 for row in saved)
@@ -0,0 +1,73 @@
+import json
+from collections import Counter
+from log_stats import LogStats
+from log_timestamp import timestamp_to_epoch
+
+# (시각, event, 위험 키워드) - 10:01:10 → 10:03:00 과 10:04:30 → 11:00:00 사이가 60초 넘는 공백
+# 10:03:30 → 10:04:30 은 정확히 60초라 공백이 아님
+ROWS = [
+    ('2023-08-27 10:00:05', 'INFO', ['위험']),
+    ('2023-08-27 10:00:40', 'INFO', []),
+    ('2023-08-27 10:00:59', 'WARN', []),
+    ('2023-08-27 10:01:10', 'INFO', []),
+    ('2023-08-27 10:03:00', 'ERROR', ['누출']),
+    ('2023-08-27 10:03:30', 'INFO', []),
+    ('2023-08-27 10:04:30', 'INFO', []),
+    ('2023-08-27 11:00:00', 'WARN', ['위험', '누출']),
+    ('2023-08-27 11:00:30', 'INFO', []),
+]
+
+
+def _build(rows, stats=None):
+    stats = stats or LogStats()
+    for timestamp, event, hits in rows:
+        stats.add_record((timestamp_to_epoch(timestamp), timestamp, 'm', event), hits)
+    return stats
+
+
+def test_minute_and_hour_buckets():
+    data = _build(ROWS).to_dict()
+    assert data['records'] == 9
+    assert data['first'] == '2023-08-27 10:00:05' and data['last'] == '2023-08-27 11:00:30'
+    assert [(row['minute'], row['total'], row['events'], row.get('keywords')) for row in data['per_minute']] == [
+        ('2023-08-27 10:00', 3, {'INFO': 2, 'WARN': 1}, {'위험': 1}),
+        ('2023-08-27 10:01', 1, {'INFO': 1}, None),
+        ('2023-08-27 10:03', 2, {'ERROR': 1, 'INFO': 1}, {'누출': 1}),
+        ('2023-08-27 10:04', 1, {'INFO': 1}, None),
+        ('2023-08-27 11:00', 2, {'WARN': 1, 'INFO': 1}, {'위험': 1, '누출': 1}),
+    ]
+    assert [(row['hour'], row['total'], row['events'], row.get('keywords')) for row in data['per_hour']] == [
+        ('2023-08-27 10', 7, {'INFO': 5, 'WARN': 1, 'ERROR': 1}, {'위험': 1, '누출': 1}),
+        ('2023-08-27 11', 2, {'WARN': 1, 'INFO': 1}, {'위험': 1, '누출': 1}),
+    ]
+    assert data['events']['INFO'] == {'count': 6, 'first': '2023-08-27 10:00:05', 'last': '2023-08-27 11:00:30'}
+    assert data['keywords']['누출'] == {'count': 2, 'first': '2023-08-27 10:03:00', 'last': '2023-08-27 11:00:00'}
+
+
+def test_gap_detection_in_either_order():
+    expected = [
+        {'start': '2023-08-27 10:01:10', 'end': '2023-08-27 10:03:00', 'seconds': 110},
+        {'start': '2023-08-27 10:04:30', 'end': '2023-08-27 11:00:00', 'seconds': 3330},
+    ]
+    assert _build(ROWS).to_dict()['gaps'] == expected
+    assert _build(ROWS[::-1]).to_dict()['gaps'] == expected     # 시간 역순으로 넣어도 같음
+    assert _build(ROWS, LogStats(gap_seconds=100)).to_dict()['gaps'] == expected
+    assert len(_build(ROWS, LogStats(gap_seconds=10)).gaps) == 8     # 간격이 모두 10초 초과
+
+
+def test_round_trip_and_continue(tmp_path):
+    stats = _build(ROWS)
+    path = stats.save(str(tmp_path / 'stats.json'))
+    loaded = LogStats.load(path)
+    assert loaded.to_dict() == stats.to_dict()
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f) == stats.to_dict()
+    assert loaded.last_epoch() == timestamp_to_epoch('2023-08-27 11:00:30')
+    assert LogStats().last_epoch() is None
+
+    # 앞부분을 저장했다가 되살려서 나머지를 더 집계해도 한 번에 집계한 결과와 같음
+    head = LogStats.from_dict(_build(ROWS[:6]).to_dict())
+    assert _build(ROWS[6:], head).to_dict() == stats.to_dict()
+    hours = stats.per_hour()
+    assert sum(sum(events.values()) for events, _ in hours.values()) == len(ROWS)
+    assert sum((keywords for _, keywords in hours.values()), Counter()) == Counter({'위험': 2, '누출': 2})
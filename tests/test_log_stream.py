@@ -0,0 +1,37 @@
+import os
+import pytest
+import log_stream
+from log_stream import iter_log_records, sort_records_external
+from samples import make_log_lines
+
+
+def _expected(records):
+    # 시간 역순 + 같은 시간이면 원래 줄 순서 (sorted 는 안정 정렬)
+    return sorted(records, key=lambda record: record[0], reverse=True)
+
+
+@pytest.mark.parametrize('run_size', [1, 7, 100, 1000])
+def test_external_sort_matches_sorted(write_log, run_size):
+    records = list(iter_log_records(write_log(make_log_lines(500, seed=1, max_step=1))))
+    assert list(sort_records_external(iter(records), run_size=run_size)) == _expected(records)
+
+
+def test_external_sort_merges_runs_in_passes(write_log, tmp_path, monkeypatch):
+    # run 이 MERGE_FAN_IN 보다 많으면 여러 번에 나눠 병합해도 결과가 같고 임시 파일은 모두 지워짐
+    monkeypatch.setattr(log_stream, 'MERGE_FAN_IN', 3)
+    records = list(iter_log_records(write_log(make_log_lines(300, seed=2, max_step=1))))
+    work = tmp_path / 'runs'
+    work.mkdir()
+    assert list(sort_records_external(records, run_size=10, tmp_dir=str(work))) == _expected(records)
+    assert os.listdir(work) == []
+
+
+def test_external_sort_empty_input():
+    assert list(sort_records_external([])) == []
+
+
+def test_iter_log_records_skips_invalid_lines(write_log):
+    path = write_log(['2023-08-27 10:00:00,INFO,ok', 'broken line', '2023-02-30 10:00:00,INFO,bad date',
+                      '2023-08-27 10:00:01,WARN,a, b'])
+    assert [(record[1], record[2], record[3]) for record in iter_log_records(path)] == [
+        ('2023-08-27 10:00:00', 'ok', 'INFO'), ('2023-08-27 10:00:01', 'a, b', 'WARN')]
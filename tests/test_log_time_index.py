@@ -0,0 +1,99 @@
+import os
+import random
+import pytest
+import log_time_index
+from log_time_index import TimeIndexWriter, build_time_index, load_time_index
+from log_records import ndjson_line, iter_ndjson_records
+from log_timestamp import epoch_to_timestamp
+
+START = 1693094400
+
+
+def _records(count, seed=0):
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        epoch = START + rng.randrange(0, count)
+        records.append((epoch, epoch_to_timestamp(epoch), f'event #{i}', 'INFO'))
+    return records
+
+
+def _write_jsonl(path, records, mode='w'):
+    with open(path, mode, encoding='utf-8') as f:
+        for record in records:
+            f.write(ndjson_line(record))
+
+
+def _naive_range(path, start, end):
+    # JSONL 전체를 읽어 (epoch, 위치) 순서로 정렬 → 같은 시간은 로그(JSONL) 순서
+    rows = [(record[0], pos, record[1], record[2]) for pos, record in iter_ndjson_records(path)
+            if start <= record[0] <= end]
+    return [(timestamp, message) for _, _, timestamp, message in sorted(rows)]
+
+
+@pytest.fixture(params=['descending', 'shuffled'])
+def jsonl(request, tmp_path, monkeypatch):
+    monkeypatch.setattr(log_time_index, 'CHUNK_PAIRS', 64)
+    monkeypatch.setattr(log_time_index, 'MERGE_BLOCK_PAIRS', 16)
+    records = _records(1000)
+    if request.param == 'descending':
+        records.sort(key=lambda record: record[0], reverse=True)
+    path = str(tmp_path / 'mission_computer_main.jsonl')
+    _write_jsonl(path, records)
+    return path
+
+
+def test_query_range_matches_naive(jsonl):
+    with build_time_index(jsonl) as index:
+        assert len(index) == 1000
+        for start, end in [(START, START + 999), (START + 100, START + 130), (START + 50, START + 50),
+                           (START - 10, START - 1), (START + 2000, START + 3000)]:
+            assert index.query_range(start, end) == _naive_range(jsonl, start, end)
+        assert index.query_range(epoch_to_timestamp(START + 10), epoch_to_timestamp(START + 20)) == \
+            _naive_range(jsonl, START + 10, START + 20)
+        epochs = [record[0] for _, record in iter_ndjson_records(jsonl)]
+        assert index.time_span() == (epoch_to_timestamp(min(epochs)), epoch_to_timestamp(max(epochs)))
+    assert not [name for name in os.listdir(os.path.dirname(jsonl)) if name.startswith('.tmp.')]
+
+
+def test_load_rejects_changed_jsonl(jsonl):
+    build_time_index(jsonl).close()
+    assert load_time_index(jsonl) is not None
+    _write_jsonl(jsonl, _records(1, seed=9), mode='a')
+    assert load_time_index(jsonl) is None
+
+
+def test_append_matches_naive(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_time_index, 'CHUNK_PAIRS', 8)
+    path = str(tmp_path / 'mission_computer_main.jsonl')
+    records = sorted(_records(200), key=lambda record: record[0], reverse=True)
+    _write_jsonl(path, records)
+    build_time_index(path).close()
+    newest = records[0][0]
+    for batch in range(3):
+        epochs = [newest + batch * 3 + i // 10 for i in range(30)]    # 같은 시간이 10건씩
+        new = [(epoch, epoch_to_timestamp(epoch), f'new {batch}-{i}', 'INFO') for i, epoch in enumerate(epochs)]
+        new.sort(key=lambda record: record[0], reverse=True)
+        writer = TimeIndexWriter(path, append=True)
+        offset = os.path.getsize(path)
+        for record in new:
+            writer.add_record(offset, record)
+            offset += len(ndjson_line(record).encode('utf-8'))
+        _write_jsonl(path, new, mode='a')
+        writer.commit()
+    with load_time_index(path) as index:
+        assert len(index) == 290
+        assert index.query_range(START, newest + 100) == _naive_range(path, START, newest + 100)
+
+
+def test_append_rejects_older_records(tmp_path):
+    path = str(tmp_path / 'mission_computer_main.jsonl')
+    records = sorted(_records(20), key=lambda record: record[0], reverse=True)
+    _write_jsonl(path, records)
+    build_time_index(path).close()
+    writer = TimeIndexWriter(path, append=True)
+    writer.add(os.path.getsize(path), START - 1)
+    _write_jsonl(path, [(START - 1, epoch_to_timestamp(START - 1), 'old', 'INFO')], mode='a')
+    with pytest.raises(ValueError):
+        writer.commit()
+    writer.discard()
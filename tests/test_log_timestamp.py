@@ -0,0 +1,55 @@
+import random
+import calendar
+from datetime import datetime
+import pytest
+from log_timestamp import timestamp_to_epoch, timestamp_bytes_to_epoch, epoch_to_timestamp
+
+FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _strptime_epoch(timestamp):
+    # strptime 은 '2023-8-27' 같은 0 없는 숫자도 받으므로 되돌린 문자열과 같을 때만 유효
+    try:
+        parsed = datetime.strptime(timestamp, FORMAT)
+    except ValueError:
+        return None
+    if f'{parsed.year:04d}' + parsed.strftime(FORMAT)[-15:] != timestamp:
+        return None
+    return calendar.timegm(parsed.timetuple())
+
+
+def _random_timestamps(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        text = (f'{rng.randrange(1, 10000):04d}-{rng.randrange(0, 14):02d}-{rng.randrange(0, 33):02d} '
+                f'{rng.randrange(0, 25):02d}:{rng.randrange(0, 61):02d}:{rng.randrange(0, 61):02d}')
+        # 가끔 한 글자를 구분자/숫자로 바꿔서 형식이 깨진 값도 섞음
+        yield ''.join(rng.choice('0123456789-: ') if rng.random() < 0.05 else c for c in text)
+
+
+@pytest.mark.parametrize('timestamp', [
+    '2023-08-27 10:00:00', '2024-02-29 23:59:59', '2023-02-29 00:00:00', '2023-8-27 10:00:00',
+    '2023-08-27 24:00:00', '2023-08-27 10:60:00', '2023-08-27 10:00:60', '0000-01-01 00:00:00',
+    '0001-01-01 00:00:00', '9999-12-31 23:59:59', '2023-08-27T10:00:00', '2023-08-27 10:00:0²',
+    '２023-08-27 10:00:00', '2023-08-27 10-00:00', '2023-08-27 10:00:00 ', '',
+])
+def test_codec_matches_strptime(timestamp):
+    expected = _strptime_epoch(timestamp)
+    assert timestamp_to_epoch(timestamp) == expected
+    assert timestamp_bytes_to_epoch(timestamp.encode('utf-8')) == expected
+
+
+def test_codec_matches_strptime_random():
+    for timestamp in _random_timestamps(20000):
+        expected = _strptime_epoch(timestamp)
+        assert timestamp_to_epoch(timestamp) == expected, timestamp
+        assert timestamp_bytes_to_epoch(timestamp.encode('ascii')) == expected, timestamp
+
+
+def test_bytes_codec_accepts_memoryview():
+    assert timestamp_bytes_to_epoch(memoryview(b'2023-08-27 10:00:00')) == 1693130400
+
+
+def test_epoch_round_trip():
+    for epoch in (0, 951782400, 1693130400, 253402300799):
+        assert timestamp_to_epoch(epoch_to_timestamp(epoch)) == epoch
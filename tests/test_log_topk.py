@@ -0,0 +1,45 @@
+import random
+import pytest
+from log_records import LogRecordStore
+from log_stream import iter_log_records
+from log_topk import IN_ORDER, OPPOSITE, equal_runs, latest_records, presorted_direction
+from samples import make_log_lines
+
+
+def _by_time(records, reverse=True):
+    return sorted(records, key=lambda record: record[0], reverse=reverse)
+
+
+@pytest.mark.parametrize('n', [0, 1, 5, 50, 400, 1000])
+def test_latest_records_matches_sort(write_log, n):
+    records = list(iter_log_records(write_log(make_log_lines(400, seed=1, max_step=1))))
+    assert latest_records(iter(records), n) == _by_time(records)[:n]
+
+
+def test_store_latest_matches_sorted_by_time(write_log):
+    store = LogRecordStore(iter_log_records(write_log(make_log_lines(300, seed=2, max_step=1))))
+    assert list(store.latest(25)) == list(store.sorted_by_time())[:25]
+
+
+@pytest.mark.parametrize('order', ['ascending', 'descending', 'shuffled'])
+def test_sorted_by_time_matches_stable_sort(order):
+    rng = random.Random(3)
+    epochs = sorted(rng.randrange(100, 160) for _ in range(300))    # 같은 시간이 많음
+    if order == 'descending':
+        epochs.reverse()
+    elif order == 'shuffled':
+        rng.shuffle(epochs)
+    records = [(epoch, '', f'm{i}', 'INFO') for i, epoch in enumerate(epochs)]
+    store = LogRecordStore(records)
+    for reverse in (True, False):
+        result = [(epoch, message) for epoch, _, message, _ in store.sorted_by_time(reverse)]
+        assert result == [(record[0], record[2]) for record in _by_time(records, reverse)]
+
+
+def test_presorted_direction_and_equal_runs():
+    assert presorted_direction([5, 5, 3, 1]) == IN_ORDER
+    assert presorted_direction([1, 3, 3, 5]) == OPPOSITE
+    assert presorted_direction([1, 3, 2]) is None
+    assert presorted_direction([1, 2], reverse=False) == IN_ORDER
+    assert list(equal_runs([1, 1, 2, 3, 3, 3, 4, 1, 1])) == [(0, 2), (3, 6), (7, 9)]
+    assert list(equal_runs([1, 2, 3])) == []
@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+from main import file_read
+from samples import make_log_lines
+
+MALFORMED = [
+    '2023-08-27 10:00:00,INFO', '2023-08-27 10:00:00,INFO,a,b', '', '   ',
+    'not a time,INFO,bad timestamp', '2023-08-27 09:59:59,WARN,first',
+]
+
+
+def _old_file_read(path):
+    # 바꾸기 전 방식: 한 줄씩 split 해서 필드 수가 맞는 줄만 쌓음
+    kk = []
+    with open(path, 'r', encoding='utf-8') as f:
+        header = f.readline().strip().split(',')
+        for line in f:
+            tt = line.strip()
+            if not tt:
+                continue
+            values = tt.split(',')
+            if len(values) == len(header):
+                kk.append(values)
+    text = pd.DataFrame(kk, columns=header)
+    text['timestamp'] = pd.to_datetime(text['timestamp'], format='%Y-%m-%d %H:%M:%S', errors='coerce')
+    text = text.sort_values(by='timestamp', kind='stable').reset_index(drop=True)
+    return text.to_dict(orient='list')
+
+
+def _assert_same(result, expected):
+    assert list(result) == list(expected)
+    result, expected = pd.DataFrame(result), pd.DataFrame(expected)
+    for frame in (result, expected):    # 시간 단위(ns/us) 차이는 비교하지 않음
+        frame['timestamp'] = frame['timestamp'].astype('datetime64[ns]')
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize('lines', [
+    make_log_lines(300, seed=1),
+    make_log_lines(50, seed=2)[:25] + MALFORMED + make_log_lines(50, seed=2)[25:],
+    [],
+], ids=['sample', 'malformed', 'header-only'])
+def test_file_read_matches_row_loop(write_log, lines):
+    path = write_log(lines)
+    _assert_same(file_read(path), _old_file_read(path))
+
+
+def test_file_read_empty_log(tmp_path):
+    path = tmp_path / 'mission_computer_main.log'
+    path.write_text('', encoding='utf-8')
+    assert file_read(str(path)) == '필드 수가 맞지 않음'
+    path.write_text('\n\n', encoding='utf-8')
+    assert file_read(str(path)) == '필드 수가 맞지 않음'
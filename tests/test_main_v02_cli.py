@@ -0,0 +1,33 @@
+import os
+import sys
+import subprocess
+import pytest
+from samples import make_log_lines
+
+MAIN_V02 = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main_v02.py')
+
+
+def _run(cwd, *args):
+    return subprocess.run([sys.executable, MAIN_V02, *args], cwd=cwd, input='', capture_output=True, text=True)
+
+
+@pytest.mark.parametrize('option', ['--stream', '--pipeline', '--follow', '--incremental', '--cache'])
+def test_merge_mode_rejects_other_processing_options(tmp_path, write_log, option):
+    logs = tmp_path / 'logs'
+    logs.mkdir()
+    write_log(make_log_lines(10, seed=1), name='logs/a.log')
+    result = _run(tmp_path, 'logs', option)
+    assert result.returncode == 2
+    assert option in result.stderr
+    assert not os.path.exists(tmp_path / 'mission_computer_main.json')
+
+
+def test_merge_mode_writes_outputs(tmp_path, write_log):
+    logs = tmp_path / 'logs'
+    logs.mkdir()
+    write_log(make_log_lines(10, seed=1), name='logs/a.log')
+    write_log(make_log_lines(10, seed=2), name='logs/b.log')
+    result = _run(tmp_path, 'logs')
+    assert result.returncode == 0, result.stderr
+    with open(tmp_path / 'mission_computer_main.jsonl', encoding='utf-8') as f:
+        assert len(f.readlines()) == 20
@@ -0,0 +1,59 @@
+import importlib.util
+import os
+import pytest
+from material_registry import INVALID_MATERIAL, MaterialRegistry, load_registry
+
+
+def _write_csv(tmp_path, body, name='materials.csv'):
+    path = tmp_path / name
+    path.write_text('code,name,density,unit,aliases\n' + body, encoding='utf-8')
+    return str(path)
+
+
+def test_aliases_and_name_normalization():
+    registry = load_registry()
+    assert registry.code('유리') == registry.code('glass') == registry.code('  GLASS ') == 0
+    assert registry.code('carbon   steel') == registry.code('Carbon Steel') == registry.code('탄소강')
+    assert registry.code('종이') == INVALID_MATERIAL
+    assert 'Al' in registry and '없는 재질' not in registry
+    assert registry.get('aluminum').name == '알루미늄'
+    with pytest.raises(ValueError):
+        registry.density('종이')
+
+
+def test_density_units_converted_to_g_per_cm3(tmp_path):
+    registry = MaterialRegistry.from_csv(_write_csv(tmp_path, '0,A,2.4,g/cm3,\n'
+                                                              '1,B,8000,kg/m3,b1|b2\n'
+                                                              '2,C,100,LB/FT3,\n'))
+    assert registry.densities == pytest.approx((2.4, 8.0, 1.601846337396014))
+    assert registry.get('b2').unit_density == 8000 and registry.get('b2').unit == 'kg/m3'
+    assert registry.density_map() == {'A': 2.4, 'B': 8.0, 'C': pytest.approx(1.601846337396014)}
+    assert load_registry().density('SUS304') == pytest.approx(8.0)      # materials.csv 의 kg/m3 값
+
+
+@pytest.mark.parametrize('body', [
+    '0,A,1,g/cm3,\n0,B,1,g/cm3,\n',         # 번호 중복
+    '0,A,1,g/cm3,\n2,B,1,g/cm3,\n',         # 빈 번호
+    '0,A,1,g/cm3,x\n1,B,1,g/cm3,X\n',       # 별칭이 겹침 (대소문자 무시)
+    '0,A,1,oz/in3,\n',                      # 지원하지 않는 단위
+    '0,A,0,g/cm3,\n',                       # 밀도 0
+    '0,A,abc,g/cm3,\n',                     # 숫자가 아닌 밀도
+])
+def test_invalid_material_files(tmp_path, body):
+    with pytest.raises(ValueError):
+        MaterialRegistry.from_csv(_write_csv(tmp_path, body))
+
+
+def test_load_registry_is_cached(tmp_path):
+    path = _write_csv(tmp_path, '0,A,1,g/cm3,\n')
+    assert load_registry(path) is load_registry(os.path.join(str(tmp_path), '.', 'materials.csv'))
+
+
+def test_exam_scripts_keep_density_dict():
+    spec = importlib.util.spec_from_file_location('exam4', os.path.join(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))), '4.py'))
+    exam4 = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(exam4)
+    assert isinstance(exam4.dem, dict) and exam4.dem['유리'] == 2.4
+    area, weight = exam4.sphere_area(3, 'glass', 2)
+    assert weight == pytest.approx(exam4.dem['유리'] * area * 10000 * 2 / 1000 * 0.38)
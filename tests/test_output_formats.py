@@ -0,0 +1,90 @@
+import os
+import sys
+import json
+import subprocess
+import pytest
+from log_compress import open_log
+from log_stream import OUTPUT_FORMATS, iter_json_entries, iter_log_records, open_record_writer, sort_records_external
+from samples import make_log_lines
+
+MAIN_V01 = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main_v01.py')
+
+
+def _old_dict(records):
+    # 예전 출력: 시간 역순 리스트를 dict() 로 바꿔서 json.dump(..., indent=4) (같은 초는 마지막 항목만 남음)
+    return dict((record[1], record[2]) for record in records)
+
+
+def _read_back(path, output_format):
+    with open_log(path, 'rt') as f:
+        if output_format == 'ndjson':
+            return dict((data['timestamp'], data['message']) for data in map(json.loads, f))
+        return json.load(f)
+
+
+@pytest.fixture
+def records(write_log):
+    # max_step=1 → 같은 timestamp 가 많음
+    return list(sort_records_external(iter_log_records(write_log(make_log_lines(400, seed=1, max_step=1)))))
+
+
+@pytest.mark.parametrize('output_format', OUTPUT_FORMATS)
+@pytest.mark.parametrize('suffix', ['', '.gz'])
+def test_format_reads_back_to_old_dict(tmp_path, records, output_format, suffix):
+    path = str(tmp_path / f'out.{output_format}{suffix}')
+    with open_record_writer(path, output_format) as writer:
+        for record in records:
+            writer.write(record)
+    old = _old_dict(records)
+    assert len(old) < len(records)
+    assert _read_back(path, output_format) == old
+    if not suffix:
+        assert dict((timestamp, message) for _, timestamp, message in iter_json_entries(path)) == old
+
+
+def test_json_formats_match_json_dump_text(tmp_path, records):
+    old = _old_dict(records)
+    expected = {'json': json.dumps(old, ensure_ascii=False, indent=4),
+                'compact': json.dumps(old, ensure_ascii=False, separators=(',', ':'))}
+    for output_format, text in expected.items():
+        path = str(tmp_path / f'out.{output_format}')
+        with open_record_writer(path, output_format) as writer:
+            for record in records:
+                writer.write(record)
+        with open(path, encoding='utf-8') as f:
+            assert f.read() == text
+    with open_record_writer(str(tmp_path / 'empty.json'), 'json'):
+        pass
+    with open(tmp_path / 'empty.json', encoding='utf-8') as f:
+        assert f.read() == json.dumps({}, indent=4)
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        open_record_writer(str(tmp_path / 'out.json'), 'yaml')
+
+
+def test_cli_format_option(tmp_path, write_log):
+    # 형식마다 main_v01.py --format 으로 저장한 결과가 json.dump(..., indent=4) 로 저장한 dict 와 같음
+    results = {}
+    for output_format in OUTPUT_FORMATS:
+        cwd = tmp_path / output_format
+        cwd.mkdir()
+        write_log(make_log_lines(300, seed=2, max_step=1), name=f'{output_format}/mission_computer_main.log')
+        result = subprocess.run([sys.executable, MAIN_V01, '--format', output_format], cwd=cwd,
+                                capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        json_path = cwd / 'mission_computer_main.json'
+        assert json_path.exists() == (output_format != 'ndjson')    # ndjson 이면 JSONL 만 저장
+        if output_format == 'ndjson':
+            continue
+        results[output_format] = _read_back(str(json_path), output_format)
+        if output_format == 'json':
+            with open(json_path, encoding='utf-8') as f:
+                assert f.read() == json.dumps(results['json'], ensure_ascii=False, indent=4)
+    assert results['compact'] == results['json']
+    # main_v01 의 JSON 값은 'event,message' 이고 헤더 줄도 항목으로 남음 (예전 main_v01 과 같음)
+    # JSONL 은 event 를 나눠서 저장하고 timestamp 가 아닌 줄은 빼므로 같은 모양으로 맞춰서 비교
+    with open(tmp_path / 'ndjson' / 'mission_computer_main.jsonl', encoding='utf-8') as f:
+        events = dict((data['timestamp'], f"{data['event']},{data['message']}") for data in map(json.loads, f))
+    assert events == {key: value for key, value in results['json'].items() if key != 'timestamp'}